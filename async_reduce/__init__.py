@@ -1,8 +1,23 @@
 from async_reduce.async_reducer import async_reduce, AsyncReducer
-from async_reduce.async_reduceable import async_reduceable
+from async_reduce.async_reduceable import (
+    async_reduceable,
+    async_reduceable_in_executor,
+)
+from async_reduce.async_batch_reducer import AsyncBatchReducer
+from async_reduce.thread_reducer import thread_reduce, ThreadReducer
+from async_reduce.reduceable import reduceable
+from async_reduce.limits import Overloaded
+from async_reduce.retry import RetryPolicy
 
 __all__ = (
     'async_reduce',
     'async_reduceable',
+    'async_reduceable_in_executor',
     'AsyncReducer',
+    'AsyncBatchReducer',
+    'thread_reduce',
+    'ThreadReducer',
+    'reduceable',
+    'Overloaded',
+    'RetryPolicy',
 )
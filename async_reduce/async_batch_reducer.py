@@ -0,0 +1,218 @@
+import asyncio
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Dict,
+    Generic,
+    Hashable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Sized,
+    TypeVar,
+    Union,
+)
+
+from async_reduce.aux import get_coroutine_function_location
+from async_reduce.flight import Flight
+from async_reduce.hooks.base import BaseHooks
+
+T_Key = TypeVar('T_Key', bound=Hashable)
+T_Result = TypeVar('T_Result')
+T_BatchResult = Union[Mapping[T_Key, T_Result], Sequence[T_Result]]
+
+
+class _BatchFlight(Flight):
+    __slots__ = ('coro', 'reduced')
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.coro: Optional[Coroutine[Any, Any, Any]] = None
+        self.reduced = 0
+
+
+class AsyncBatchReducer(Generic[T_Key, T_Result]):
+    """
+    Reducer for simultaneous calls with different keys to single call of
+    batch coroutine function.
+
+    Keys are collected during one loop iteration (or ``window`` seconds) and
+    passed as list of unique keys to ``batch_fn``, which returns mapping of
+    keys to results or sequence of results in same order as keys.
+
+    :param batch_fn: coroutine function to fetch results for list of keys
+    :param window: seconds to collect keys before calling of ``batch_fn``
+    :param max_batch_size: call ``batch_fn`` as soon as this count of keys
+        is collected
+    :param hooks: hooks to trigger on reducer events
+
+    Example:
+
+        async def fetch_users(user_ids):
+            return await http.get('/users', params={'ids': user_ids}).json()
+
+        users_loader = AsyncBatchReducer(fetch_users, max_batch_size=100)
+
+        user = await users_loader(user_id)
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[
+            [List[T_Key]],
+            Coroutine[Any, Any, T_BatchResult[T_Key, T_Result]],
+        ],
+        *,
+        window: float = 0,
+        max_batch_size: Optional[int] = None,
+        hooks: Optional[BaseHooks] = None
+    ) -> None:
+        if max_batch_size is not None and max_batch_size < 1:
+            raise ValueError('max_batch_size must be positive')
+
+        self._batch_fn = batch_fn
+        self._window = window
+        self._max_batch_size = max_batch_size
+        self._hooks = hooks
+
+        self._running: Dict[T_Key, _BatchFlight] = {}
+        self._batch: List[T_Key] = []
+        self._timer: Optional[asyncio.Handle] = None
+
+    def __call__(self, key: T_Key) -> Awaitable[T_Result]:
+        flight = self._running.get(key, None)
+
+        if flight is None:
+            flight = self._running[key] = _BatchFlight()
+            self._batch.append(key)
+
+            if (
+                self._max_batch_size is not None
+                and len(self._batch) >= self._max_batch_size
+            ):
+                self.dispatch()
+            elif self._timer is None:
+                loop = asyncio.get_running_loop()
+                if self._window > 0:
+                    self._timer = loop.call_later(self._window, self.dispatch)
+                else:
+                    self._timer = loop.call_soon(self.dispatch)
+        elif flight.coro is None:
+            flight.reduced += 1
+        elif self._hooks:
+            ident = self._ident(flight.coro, key)
+            self._hooks.on_apply_for(flight.coro, ident)
+            self._hooks.on_reducing_for(flight.coro, ident)
+
+        return flight.add_waiter()
+
+    def dispatch(self) -> None:
+        """
+        Call batch function for collected keys right now.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self._batch:
+            return
+
+        keys, self._batch = self._batch, []
+        try:
+            coro = self._batch_fn(keys)
+        except Exception as e:
+            # waiters must not hang and next calls must not join failed batch
+            for key in keys:
+                self._running.pop(key).set_exception(e)
+            return
+
+        for key in keys:
+            flight = self._running[key]
+            flight.coro = coro
+
+            if self._hooks:
+                ident = self._ident(coro, key)
+                self._hooks.on_apply_for(coro, ident)
+                self._hooks.on_executing_for(coro, ident)
+
+                for _ in range(flight.reduced):
+                    self._hooks.on_apply_for(coro, ident)
+                    self._hooks.on_reducing_for(coro, ident)
+
+        asyncio.create_task(self._runner(keys, coro))
+
+    @staticmethod
+    def _ident(coro: Coroutine[Any, Any, Any], key: T_Key) -> str:
+        return '{}[{!r}]'.format(get_coroutine_function_location(coro), key)
+
+    async def _runner(
+        self,
+        keys: List[T_Key],
+        coro: Coroutine[Any, Any, T_BatchResult[T_Key, T_Result]],
+    ) -> None:
+        try:
+            results = await coro
+            self._check_results(results, len(keys))
+        except (Exception, asyncio.CancelledError) as e:
+            for key in keys:
+                self._set_exception(coro, key, e)
+        else:
+            if isinstance(results, Mapping):
+                for key in keys:
+                    if key in results:
+                        self._set_result(coro, key, results[key])
+                    else:
+                        self._set_exception(coro, key, KeyError(key))
+            else:
+                for key, result in zip(keys, results):
+                    self._set_result(coro, key, result)
+        finally:
+            for key in keys:
+                flight = self._running.pop(key)
+                if not flight.done:
+                    # waiters must not hang if settling of them failed
+                    flight.set_exception(
+                        RuntimeError('Batch result is not settled')
+                    )
+
+    @staticmethod
+    def _check_results(results: Any, count: int) -> None:
+        if isinstance(results, Mapping):
+            return
+
+        if not isinstance(results, Sized):
+            raise TypeError(
+                'Batch function returned {!r} instead of mapping or sequence'
+                ' of results'.format(type(results).__name__)
+            )
+
+        if len(results) != count:
+            raise ValueError(
+                'Batch function returned {} results for {} keys'.format(
+                    len(results), count
+                )
+            )
+
+    def _set_result(
+        self, coro: Coroutine[Any, Any, Any], key: T_Key, result: T_Result
+    ) -> None:
+        self._running[key].set_result(result)
+
+        if self._hooks:
+            self._hooks.on_result_for(coro, self._ident(coro, key), result)
+
+    def _set_exception(
+        self,
+        coro: Coroutine[Any, Any, Any],
+        key: T_Key,
+        exception: Union[Exception, asyncio.CancelledError],
+    ) -> None:
+        self._running[key].set_exception(exception)
+
+        if self._hooks:
+            self._hooks.on_exception_for(
+                coro, self._ident(coro, key), exception
+            )
@@ -1,18 +1,45 @@
-from functools import wraps
-from typing import Callable, TypeVar
+import sys
+from concurrent.futures import Executor
+from functools import partial, wraps
+from types import CodeType
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 
 from async_reduce import async_reduce, AsyncReducer
+from async_reduce.aux import ArgumentsBinder, hash_args
+from async_reduce.retry import RetryPolicy
 
 T_AsyncFunc = TypeVar('T_AsyncFunc')
+T_Result = TypeVar('T_Result')
 
 
 def async_reduceable(
     reducer: AsyncReducer = async_reduce,
+    *,
+    key: Optional[Callable[..., Hashable]] = None,
+    self_ident: Optional[Callable[[Any], Hashable]] = None,
+    retry: Optional[RetryPolicy] = None
 ) -> Callable[[T_AsyncFunc], T_AsyncFunc]:
     """
     Decorator to apply ``async_reduce(...)`` automatically for each coroutine
     function call.
 
+    Identity of call is calculated from the function and its arguments (or
+    from result of ``key`` called with same arguments), so the coroutine is
+    created only when it is executed. For methods ``self_ident`` replaces
+    the instance (the first argument) by its identity, see
+    :mod:`async_reduce.idents`. Failed calls are retried by ``retry`` policy
+    (or policy of reducer) once for all waiters. Without ``self_ident`` the
+    policy of reducer is used for methods.
+
     Example:
 
         # simple usage
@@ -24,18 +51,192 @@ def async_reduceable(
         @async_reduceable(MyAsyncReducer)
         async def bar(arg):
             pass
+
+        # with custom key of call
+        @async_reduceable(key=lambda request, user_id: user_id)
+        async def baz(request, user_id):
+            pass
+
+        # with retries of connection errors
+        @async_reduceable(retry=RetryPolicy((ConnectionError,)))
+        async def fetch(url):
+            pass
+
+        # method reduced for all instances
+        class Client:
+            @async_reduceable(self_ident=ignore_self)
+            async def fetch(self, url):
+                pass
     """
 
     def wrapper(fn):
+        code = getattr(fn, '__code__', None)
+        if code is None:
+            # e.g. partial of coroutine function, so identity of call is
+            # calculated from its coroutine
+
+            @wraps(fn)
+            async def wrap_coro(*args, **kwargs):
+                return await _reduce_coroutine(
+                    reducer, fn, args, kwargs, retry
+                )
+
+            return wrap_coro
+
+        qualname, filename = fn.__qualname__, code.co_filename
+        binder = ArgumentsBinder(fn)
+        ident_self = _get_self_ident(reducer, code, self_ident)
+
         @wraps(fn)
         async def wrap(*args, **kwargs):
-            return await reducer(fn(*args, **kwargs))
+            if key is not None:
+                hsh = reducer.hash(key(*args, **kwargs))
+            else:
+                try:
+                    hsh = hash_args(
+                        reducer.hash, binder, args, kwargs, ident_self
+                    )
+                except TypeError:
+                    # fallback to identity of coroutine with detailed error
+                    return await _reduce_coroutine(
+                        reducer, fn, args, kwargs, retry
+                    )
+
+            return await reducer.apply(
+                partial(fn, *args, **kwargs),
+                ident=('args_hash', code, filename, qualname, hsh),
+                retry=retry,
+            )
 
         return wrap
 
     return wrapper
 
 
+def _get_self_ident(
+    reducer: AsyncReducer,
+    code: CodeType,
+    self_ident: Optional[Callable[[Any], Hashable]],
+) -> Optional[Callable[[Any], Hashable]]:
+    """
+    Policy of identity of the first argument: ``self_ident`` of decorator or
+    policy of reducer for methods (the first argument is ``self``), like for
+    coroutines passed to reducer directly.
+    """
+    if self_ident is not None:
+        return self_ident
+
+    if code.co_argcount and code.co_varnames[0] == 'self':
+        return reducer._self_ident
+
+    return None
+
+
+async def _reduce_coroutine(
+    reducer: AsyncReducer,
+    fn: Callable[..., Any],
+    args: Tuple[Any, ...],
+    kwargs: Dict[str, Any],
+    retry: Optional[RetryPolicy],
+) -> Any:
+    coro = fn(*args, **kwargs)
+    try:
+        waiter = reducer.future(
+            coro, factory=partial(fn, *args, **kwargs), retry=retry
+        )
+    except TypeError:
+        coro.close()
+        raise
+
+    return await waiter
+
+
+def async_reduceable_in_executor(
+    reducer: AsyncReducer = async_reduce,
+    *,
+    executor: Optional[Executor] = None,
+    key: Optional[Callable[..., Hashable]] = None,
+    self_ident: Optional[Callable[[Any], Hashable]] = None
+) -> Callable[[Callable[..., T_Result]], Callable[..., Awaitable[T_Result]]]:
+    """
+    Decorator to make coroutine function from blocking function, similar
+    calls of which are executed once in executor (see
+    :meth:`AsyncReducer.run_in_executor`).
+
+    Arguments of calls must be hashable, otherwise use ``key``, see
+    :func:`async_reduceable`. Function decorated at module level can be
+    executed in ``ProcessPoolExecutor`` too.
+
+    Example:
+
+        @async_reduceable_in_executor(executor=ThreadPoolExecutor(8))
+        def load_user(user_id):
+            return db.query(...)
+
+        user = await load_user(42)
+    """
+
+    def wrapper(fn):
+        code, qualname = fn.__code__, fn.__qualname__
+        filename = code.co_filename
+        binder = ArgumentsBinder(fn)
+        ident_self = _get_self_ident(reducer, code, self_ident)
+
+        @wraps(fn)
+        async def wrap(*args, **kwargs):
+            if key is not None:
+                hsh = reducer.hash(key(*args, **kwargs))
+            else:
+                hsh = hash_args(
+                    reducer.hash, binder, args, kwargs, ident_self
+                )
+
+            return await reducer.run_in_executor(
+                partial(original, *args, **kwargs),
+                ident=('args_hash', code, filename, qualname, hsh),
+                executor=executor,
+            )
+
+        original = _Original(fn, wrap)
+
+        return wrap
+
+    return wrapper
+
+
+class _Original:
+    """
+    Original of function decorated by :func:`async_reduceable_in_executor`.
+
+    When the wrapper replaces the function in its module (so pickle can not
+    find the function by name), the original is pickled by reference to the
+    wrapper for ``ProcessPoolExecutor``.
+    """
+
+    __slots__ = ('__wrapped__', 'wrapper')
+
+    def __init__(
+        self, fn: Callable[..., Any], wrapper: Optional[Callable[..., Any]]
+    ) -> None:
+        self.__wrapped__ = fn
+        self.wrapper = wrapper
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.__wrapped__(*args, **kwargs)
+
+    def __reduce__(self) -> Tuple[Any, Tuple[Any, ...]]:
+        fn = self.__wrapped__
+
+        found: Any = sys.modules.get(fn.__module__)
+        for name in fn.__qualname__.split('.'):
+            found = getattr(found, name, None)
+
+        if found is not None and found is self.wrapper:
+            return getattr, (self.wrapper, '__wrapped__')
+
+        return _Original, (fn, None)
+
+
 # ---
 #
 # @async_reduceable()
@@ -1,58 +1,497 @@
 import asyncio
 import inspect
+import threading
+from collections.abc import Coroutine as CoroutineABC
+from concurrent.futures import Executor
+from contextlib import suppress
 from functools import partial
-from typing import Coroutine, Tuple, Any, TypeVar, Awaitable, Optional, Dict
+from typing import (
+    Coroutine,
+    Tuple,
+    Any,
+    TypeVar,
+    Awaitable,
+    Optional,
+    Dict,
+    Callable,
+    Generator,
+    Hashable,
+    List,
+    NoReturn,
+    Type,
+    Union,
+)
 
-from async_reduce.aux import get_coroutine_function_location
+from async_reduce.aux import (
+    T_Ident,
+    get_call_ident,
+    get_coroutine_code,
+    render_ident,
+)
+from async_reduce.backends.base import BaseBackend, Outcome
+from async_reduce.cache import CacheEntry, ResultCache
+from async_reduce.flight import Flight
 from async_reduce.hooks.base import BaseHooks
+from async_reduce.latency import LatencyWindow
+from async_reduce.limits import ConcurrencyLimiter, Overloaded, RateLimiter
+from async_reduce.retry import RetryPolicy
 
 T_Result = TypeVar('T_Result')
+T_CoroFactory = Callable[[], Coroutine[Any, Any, Any]]
 
 
 class AsyncReducer:
-    def __init__(self, hooks: Optional[BaseHooks] = None) -> None:
-        self._running: Dict[str, asyncio.Future] = {}
+    """
+    Reducer for similar simultaneous coroutines.
+
+    Reducer is thread-safe, so it can be shared between event loops of
+    several threads: coroutine is executed in the loop of the first caller
+    and its waiters in other loops are resolved in their own loops. Backend
+    of reducer is bound to single event loop.
+
+    :param hooks: hooks to trigger on reducer events
+    :param ttl: keep result of coroutine for reuse during ``ttl`` seconds
+        after its completion (by default result is not kept)
+    :param cache_size: max count of kept results, the least recently used
+        results are evicted first
+    :param stale_ttl: after ``ttl`` is expired return kept result during
+        ``stale_ttl`` seconds more while single refreshing of it is running in
+        background
+    :param refresh_ahead: part of ``ttl`` (between 0 and 1) before its
+        expiration when kept result is refreshed in background, works only
+        for coroutines applied with ``factory``
+    :param refresh_ahead_hits: min count of reuses of kept result to refresh
+        it ahead
+    :param negative_ttl: keep exception of coroutine for reuse during
+        ``negative_ttl`` seconds (by default exceptions are not kept)
+    :param negative_exceptions: types of exceptions to keep
+    :param backend: backend to share execution of coroutine with reducers of
+        other processes or nodes
+    :param fingerprint: function to hash arguments for automatically
+        calculated idents instead of built-in ``hash()``, e.g.
+        :data:`async_reduce.fingerprint.fingerprint` for idents which are the
+        same in all processes
+    :param self_ident: function to get identity of ``self`` of coroutine
+        methods for automatically calculated idents, e.g. policies
+        :func:`async_reduce.idents.ignore_self` and
+        :func:`async_reduce.idents.by_identity` (by default ``self`` is
+        hashed as other arguments)
+    :param executor: executor for blocking functions applied via
+        :meth:`run_in_executor` (default executor of event loop by default)
+    :param abandoned: what to do with coroutine when all its waiters are
+        cancelled (or timed out) before its completion: ``'cancel'`` it or
+        ``'keep'``
+        executing to keep its result for ``ttl``, both trigger hook
+        ``on_abandoned_for`` (by default waiters are not tracked and
+        coroutine is kept executing)
+    :param leader_timeout: limit of execution time of coroutine in seconds,
+        when it is exceeded coroutine is cancelled and its waiters get
+        ``asyncio.TimeoutError``
+    :param leader_restarts: count of restarts of coroutine timed out by
+        ``leader_timeout`` before its waiters get the error, works only for
+        coroutines applied with ``factory``
+    :param max_concurrency: max count of simultaneously executed coroutines,
+        others wait in queue in order of their ``priority``
+    :param max_concurrency_per_function: max count of simultaneously
+        executed coroutines of the same coroutine function
+    :param rate_limit: max count of executions of coroutines per second,
+        others wait for their turn (in token bucket)
+    :param rate_limit_per_function: max count of executions of coroutines of
+        the same coroutine function per second
+    :param rate_limit_burst: max count of executions at once after idle time
+        (size of token bucket)
+    :param max_in_flight: max count of simultaneously running unique
+        coroutines, new ones are rejected with :class:`Overloaded`
+    :param max_waiters: max count of waiters of running coroutine, new ones
+        are rejected with :class:`Overloaded`
+    :param max_queued_age: max time in seconds of waiting of coroutine for
+        its turn by concurrency and rate limits, then it is rejected and its
+        waiters get :class:`Overloaded`
+    :param hedge_delay: start second attempt of coroutine (created by
+        ``factory``) when it is executed longer than ``hedge_delay`` seconds,
+        the first result wins and other attempt is cancelled
+    :param hedge_percentile: start second attempt when coroutine is executed
+        longer than this percentile (between 0 and 1) of durations of the
+        latest executions of its coroutine function, ``hedge_delay`` is used
+        until there are enough of them
+    :param retry: policy of retries of failed coroutines (created by
+        ``factory``), waiters keep waiting for the result of retries
+    """
+
+    def __init__(
+        self,
+        hooks: Optional[BaseHooks] = None,
+        *,
+        ttl: Optional[float] = None,
+        cache_size: int = 1024,
+        stale_ttl: Optional[float] = None,
+        refresh_ahead: Optional[float] = None,
+        refresh_ahead_hits: int = 2,
+        negative_ttl: Optional[float] = None,
+        negative_exceptions: Tuple[Type[BaseException], ...] = (Exception,),
+        backend: Optional[BaseBackend] = None,
+        fingerprint: Optional[Callable[[Any], str]] = None,
+        self_ident: Optional[Callable[[Any], Hashable]] = None,
+        executor: Optional[Executor] = None,
+        abandoned: Optional[str] = None,
+        leader_timeout: Optional[float] = None,
+        leader_restarts: int = 0,
+        max_concurrency: Optional[int] = None,
+        max_concurrency_per_function: Optional[int] = None,
+        rate_limit: Optional[float] = None,
+        rate_limit_per_function: Optional[float] = None,
+        rate_limit_burst: int = 1,
+        max_in_flight: Optional[int] = None,
+        max_waiters: Optional[int] = None,
+        max_queued_age: Optional[float] = None,
+        hedge_delay: Optional[float] = None,
+        hedge_percentile: Optional[float] = None,
+        retry: Optional[RetryPolicy] = None
+    ) -> None:
+        if refresh_ahead is not None and not 0 < refresh_ahead < 1:
+            raise ValueError('refresh_ahead must be between 0 and 1')
+
+        if abandoned not in (None, 'cancel', 'keep'):
+            raise ValueError("abandoned must be 'cancel' or 'keep'")
+
+        if any(
+            value is not None and value < 1
+            for value in (max_in_flight, max_waiters)
+        ):
+            raise ValueError('max_in_flight and max_waiters must be positive')
+
+        if hedge_percentile is not None and not 0 < hedge_percentile < 1:
+            raise ValueError('hedge_percentile must be between 0 and 1')
+
+        self._running: Dict[T_Ident, Flight] = {}
+        # guards running coroutines, kept results and their waiters
+        self._lock = threading.Lock()
         self._hooks = hooks
+        self._ttl = ttl
+        self._stale_ttl = stale_ttl or 0
+        self._refresh_ahead = refresh_ahead
+        self._refresh_ahead_hits = refresh_ahead_hits
+        self._negative_ttl = negative_ttl
+        self._negative_exceptions = negative_exceptions
+        self._backend = backend
+        self._fingerprint = fingerprint
+        self._self_ident = self_ident
+        self._executor = executor
+        self._abandoned = abandoned
+        self._leader_timeout = leader_timeout
+        self._leader_restarts = leader_restarts
+        self._limiter = (
+            ConcurrencyLimiter(max_concurrency, max_concurrency_per_function)
+            if max_concurrency or max_concurrency_per_function
+            else None
+        )
+        self._rate_limiter = (
+            RateLimiter(rate_limit, rate_limit_per_function, rate_limit_burst)
+            if rate_limit or rate_limit_per_function
+            else None
+        )
+        self._max_in_flight = max_in_flight
+        self._max_waiters = max_waiters
+        self._max_queued_age = max_queued_age
+        # count live waiters of running coroutines
+        self._track_waiters = abandoned is not None or max_waiters is not None
+        self._hedge_delay = hedge_delay
+        self._hedge_percentile = hedge_percentile
+        self._latencies = (
+            LatencyWindow() if hedge_percentile is not None else None
+        )
+        self._retry = retry
+        self._cache = ResultCache(cache_size)
 
     def __call__(
         self,
         coro: Coroutine[Any, Any, T_Result],
         *,
-        ident: Optional[str] = None
+        ident: Optional[str] = None,
+        ttl: Optional[float] = None,
+        factory: Optional[T_CoroFactory] = None,
+        timeout: Optional[float] = None,
+        priority: float = 0,
+        retry: Optional[RetryPolicy] = None
     ) -> Awaitable[T_Result]:
+        """
+        Apply reducer to coroutine.
+
+        :param coro: coroutine to reduce
+        :param ident: identity of coroutine (calculated automatically by
+            default)
+        :param ttl: override reducer ``ttl`` for result of this coroutine
+            when it will be executed
+        :param factory: function to create same coroutine again, it is used
+            to refresh kept result ahead (and to restart it)
+        :param timeout: max time to wait for result in seconds, then
+            ``asyncio.TimeoutError`` is raised for this caller only, while
+            coroutine keeps executing for others
+        :param priority: priority of execution in queue of reducer with
+            ``max_concurrency`` (lower value first), only priority of the
+            call starting execution is used
+        :param retry: override reducer ``retry`` policy for this coroutine
+            when it will be executed
+
+        Raises :class:`Overloaded` at once when ``max_in_flight`` or
+        ``max_waiters`` of reducer is exceeded.
+        """
+        return _wait(
+            self.future(
+                coro,
+                ident=ident,
+                ttl=ttl,
+                factory=factory,
+                timeout=timeout,
+                priority=priority,
+                retry=retry,
+            )
+        )
+
+    def future(
+        self,
+        coro: Coroutine[Any, Any, T_Result],
+        *,
+        ident: Optional[str] = None,
+        ttl: Optional[float] = None,
+        factory: Optional[T_CoroFactory] = None,
+        timeout: Optional[float] = None,
+        priority: float = 0,
+        retry: Optional[RetryPolicy] = None
+    ) -> 'asyncio.Future[T_Result]':
+        """
+        Apply reducer to coroutine like ``async_reduce(coro)``, but return
+        future of result instead of coroutine, which is cheaper for many
+        waiters. Cancelling of the future cancels waiting of this caller
+        only.
+        """
         # assert inspect.getcoroutinestate(coro) == inspect.CORO_CREATED
 
+        return self._apply(
+            ident or self._auto_ident(coro),
+            coro,
+            factory,
+            ttl,
+            timeout,
+            priority,
+            retry,
+        )
+
+    def apply(
+        self,
+        factory: Callable[[], Coroutine[Any, Any, T_Result]],
+        *,
+        ident: T_Ident,
+        ttl: Optional[float] = None,
+        timeout: Optional[float] = None,
+        priority: float = 0,
+        retry: Optional[RetryPolicy] = None
+    ) -> Awaitable[T_Result]:
+        """
+        Apply reducer to coroutine which will be created by ``factory`` only
+        if it has to be executed.
+
+        Note: hooks get coroutine for each call, so with hooks the coroutine
+        is created anyway.
+
+        :param factory: function to create coroutine
+        :param ident: identity of coroutine
+        :param ttl: override reducer ``ttl`` for result of this coroutine
+            when it will be executed
+        :param timeout: max time to wait for result in seconds
+        :param priority: priority of execution in queue
+        :param retry: override reducer ``retry`` policy for this coroutine
+        """
+        return self._apply(
+            ident,
+            factory() if self._hooks else None,
+            factory,
+            ttl,
+            timeout,
+            priority,
+            retry,
+        )
+
+    def run_in_executor(
+        self,
+        func: Callable[..., T_Result],
+        *args: Any,
+        ident: Optional[T_Ident] = None,
+        ttl: Optional[float] = None,
+        executor: Optional[Executor] = None
+    ) -> Awaitable[T_Result]:
+        """
+        Apply reducer to call of blocking ``func(*args)``, only single similar
+        call is executed in executor and occupies its worker.
+
+        Use ``functools.partial()`` to pass keyword arguments. For
+        ``ProcessPoolExecutor`` function, arguments and result must be
+        picklable.
+
+        :param func: blocking function
+        :param args: arguments of function
+        :param ident: identity of call (calculated automatically from the
+            function and its arguments by default)
+        :param ttl: override reducer ``ttl`` for result of this call
+        :param executor: override executor of reducer for this call
+        """
         if not ident:
-            ident = self._auto_ident(coro)
+            ident = get_call_ident(func, args, self.hash)
 
-        if self._hooks:
-            self._hooks.on_apply_for(coro, ident)
+        return self.apply(
+            partial(
+                _ExecutorCall,
+                partial(func, *args),
+                executor or self._executor,
+            ),
+            ident=ident,
+            ttl=ttl,
+        )
 
-        future, created = self._get_or_create_future(ident)
+    def _apply(
+        self,
+        ident: T_Ident,
+        coro: Optional[Coroutine[Any, Any, T_Result]],
+        factory: Optional[T_CoroFactory],
+        ttl: Optional[float],
+        timeout: Optional[float] = None,
+        priority: float = 0,
+        retry: Optional[RetryPolicy] = None,
+    ) -> 'asyncio.Future[T_Result]':
+        if self._hooks and coro is not None:
+            self._hooks.on_apply_for(coro, render_ident(ident))
 
-        if created:
-            self._running[ident] = future
-            coro_runner = self._runner(ident, coro, future)
+        if ttl is None:
+            ttl = self._ttl
 
-            if self._hooks:
-                self._hooks.on_executing_for(coro, ident)
+        try:
+            with self._lock:
+                cached, stale = self._cache.lookup(ident)
+                if cached is None:
+                    self._admit(ident)
+                    flight, execute = self._get_or_create_flight(ident)
+                    waiter = flight.add_waiter()
+
+                    if self._track_waiters:
+                        flight.waiting += 1
+                        waiter.add_done_callback(
+                            partial(self._leave, ident, flight, coro)
+                        )
+                else:
+                    waiter = cached.add_waiter()
+
+                    # refresh stale result in background
+                    execute = (
+                        stale
+                        and ident not in self._running
+                        and self._has_room()
+                    )
+                    if execute:
+                        flight, _ = self._get_or_create_flight(ident)
+        except Overloaded as e:
+            self._reject(ident, coro, e)
+            raise
 
-            asyncio.create_task(coro_runner)
+        if execute:
+            self._start(ident, coro, flight, ttl, factory, priority, retry)
         else:
-            if self._hooks:
-                self._hooks.on_reducing_for(coro, ident)
+            self._reduce(ident, coro)
 
-            coro.close()
-            del coro
+        if timeout is not None and not waiter.done():
+            handle = waiter.get_loop().call_later(timeout, _expire, waiter)
+            waiter.add_done_callback(partial(_cancel_timer, handle))
+
+        return waiter
+
+    def _admit(self, ident: T_Ident) -> None:
+        """
+        Raise :class:`Overloaded` if new waiter of ``ident`` exceeds load
+        limits, must be called under the lock.
+        """
+        flight = self._running.get(ident)
+
+        if flight is None:
+            if not self._has_room():
+                raise Overloaded(
+                    'Too many coroutines in flight ({})'.format(
+                        len(self._running)
+                    )
+                )
+        elif (
+            self._max_waiters is not None
+            and flight.waiting >= self._max_waiters
+        ):
+            raise Overloaded(
+                'Too many waiters of coroutine ({})'.format(flight.waiting)
+            )
+
+    def _has_room(self) -> bool:
+        return (
+            self._max_in_flight is None
+            or len(self._running) < self._max_in_flight
+        )
+
+    def _reject(
+        self,
+        ident: T_Ident,
+        coro: Optional[Coroutine[Any, Any, T_Result]],
+        exception: Overloaded,
+    ) -> None:
+        if coro is None:
+            return
 
-        return self._waiter(future)
+        if self._hooks:
+            self._hooks.on_rejected_for(coro, render_ident(ident), exception)
+
+        coro.close()
+
+    def _reduce(
+        self, ident: T_Ident, coro: Optional[Coroutine[Any, Any, T_Result]]
+    ) -> None:
+        if coro is None:
+            return
+
+        if self._hooks:
+            self._hooks.on_reducing_for(coro, render_ident(ident))
+
+        coro.close()
+
+    def _start(
+        self,
+        ident: T_Ident,
+        coro: Optional[Coroutine[Any, Any, T_Result]],
+        flight: Flight,
+        ttl: Optional[float],
+        factory: Optional[T_CoroFactory] = None,
+        priority: float = 0,
+        retry: Optional[RetryPolicy] = None,
+    ) -> None:
+        if coro is None:
+            assert factory is not None
+            coro = factory()
+
+        coro_runner = self._runner(
+            ident, coro, flight, ttl, factory, priority, retry
+        )
+
+        # with backend coroutine is executed only by the leader
+        if self._hooks and self._backend is None:
+            self._hooks.on_executing_for(coro, render_ident(ident))
 
-    @staticmethod
-    def _auto_ident(coro: Coroutine[Any, Any, T_Result]) -> str:
-        func_loc = get_coroutine_function_location(coro)
+        flight.task = asyncio.create_task(coro_runner)
 
+    def hash(self, obj: Any) -> Union[int, str]:
+        """
+        Hash of arguments for automatically calculated idents.
+        """
+        if self._fingerprint is None:
+            return hash(obj)
+
+        return self._fingerprint(obj)
+
+    def _auto_ident(self, coro: Coroutine[Any, Any, T_Result]) -> T_Ident:
         try:
-            hsh = hash(tuple(inspect.getcoroutinelocals(coro).items()))
+            hsh = self.hash(self._coroutine_state(coro))
         except TypeError:
             raise TypeError(
                 'Unable to auto calculate identity for coroutine because using'
@@ -61,63 +500,600 @@ class AsyncReducer:
                 ''.format(getattr(coro, '__name__'))
             )
 
-        return '{}(<state_hash:{}>)'.format(func_loc, hsh)
+        # compact key, it is rendered to string only when it is needed
+        code = get_coroutine_code(coro)
+        return (
+            'state_hash',
+            code,
+            code.co_filename,
+            getattr(coro, '__qualname__'),
+            hsh,
+        )
+
+    def _coroutine_state(
+        self, coro: Coroutine[Any, Any, T_Result]
+    ) -> Tuple[Tuple[str, Any], ...]:
+        local_vars = inspect.getcoroutinelocals(coro)
+
+        if self._self_ident is None or 'self' not in local_vars:
+            return tuple(local_vars.items())
+
+        return tuple(
+            (name, self._self_ident(value) if name == 'self' else value)
+            for name, value in local_vars.items()
+        )
 
-    def _get_or_create_future(self, ident: str) -> Tuple[asyncio.Future, bool]:
+    def _get_or_create_flight(self, ident: T_Ident) -> Tuple[Flight, bool]:
         f = self._running.get(ident, None)
         if f is not None:
             return f, False
         else:
-            f = asyncio.Future()
+            f = Flight()
             self._running[ident] = f
             return f, True
 
     async def _runner(
         self,
-        ident: str,
+        ident: T_Ident,
         coro: Coroutine[Any, Any, T_Result],
-        future: asyncio.Future,
+        flight: Flight,
+        ttl: Optional[float] = None,
+        factory: Optional[T_CoroFactory] = None,
+        priority: float = 0,
+        retry: Optional[RetryPolicy] = None,
     ) -> None:
+        # coroutine is executed by this reducer, not by other via backend
+        executed = True
         try:
-            result = await coro
+            if self._backend is None:
+                result = await self._execute_coro(
+                    ident, coro, factory, priority, retry
+                )
+            else:
+                outcome, executed = await self._shared(
+                    self._backend,
+                    render_ident(ident),
+                    coro,
+                    factory,
+                    priority,
+                    retry,
+                )
+                result = outcome.unwrap()
         except (Exception, asyncio.CancelledError) as e:
-            future.set_exception(e)
+            with self._lock:
+                flight.set_exception(e)
 
-            if self._hooks:
-                self._hooks.on_exception_for(coro, ident, e)
+                negative_ttl = self._negative_ttl
+                if (
+                    negative_ttl is not None
+                    and negative_ttl > 0
+                    and self._is_negative_cacheable(ident, e)
+                ):
+                    self._cache.set(ident, flight, negative_ttl)
+
+            if self._hooks and executed:
+                self._hooks.on_exception_for(coro, render_ident(ident), e)
         else:
-            future.set_result(result)
+            with self._lock:
+                flight.set_result(result)
 
-            if self._hooks:
-                self._hooks.on_result_for(coro, ident, result)
+                if ttl is not None and ttl > 0:
+                    self._keep(ident, flight, ttl, factory)
+
+            if self._hooks and executed:
+                self._hooks.on_result_for(coro, render_ident(ident), result)
         finally:
-            del self._running[ident]
+            with self._lock:
+                # abandoned execution may be replaced by new one already
+                if self._running.get(ident) is flight:
+                    del self._running[ident]
 
-    @classmethod
-    async def _waiter(cls, future: asyncio.Future) -> T_Result:
-        wait_future: asyncio.Future = asyncio.Future()
+            flight.task = None
 
-        future.add_done_callback(
-            partial(cls._set_wait_future_result, wait_future=wait_future)
-        )
+    async def _execute_coro(
+        self,
+        ident: T_Ident,
+        coro: Coroutine[Any, Any, T_Result],
+        factory: Optional[T_CoroFactory],
+        priority: float = 0,
+        retry: Optional[RetryPolicy] = None,
+    ) -> T_Result:
+        """
+        Execute coroutine and retry it by ``retry`` policy while all its
+        waiters are waiting.
+        """
+        retry = retry or self._retry
+        if retry is None or factory is None:
+            return await self._execute_limited(ident, coro, factory, priority)
+
+        attempt = 1
+        while True:
+            try:
+                return await self._execute_limited(
+                    ident, coro, factory, priority
+                )
+            except Overloaded:
+                raise
+            except Exception as e:
+                if not retry.retries(e, attempt):
+                    raise
+
+                delay = retry.delay(attempt)
+                if self._hooks:
+                    self._hooks.on_retry_for(
+                        coro, render_ident(ident), attempt, e, delay
+                    )
+
+            await asyncio.sleep(delay)
+            attempt += 1
+            coro = factory()
+
+    async def _execute_limited(
+        self,
+        ident: T_Ident,
+        coro: Coroutine[Any, Any, T_Result],
+        factory: Optional[T_CoroFactory],
+        priority: float = 0,
+    ) -> T_Result:
+        """
+        Execute coroutine when it is allowed by concurrency limits.
+        """
+        code = get_coroutine_code(coro)
+        key = (code, code.co_filename)
+
+        deadline = None
+        if self._max_queued_age is not None:
+            deadline = asyncio.get_running_loop().time() + self._max_queued_age
+
+        if self._limiter is None:
+            return await self._execute_timed(
+                ident, coro, factory, key, deadline
+            )
+
+        try:
+            await self._limiter.acquire(key, priority, self._max_queued_age)
+        except asyncio.TimeoutError:
+            self._shed(ident, coro)
+        except BaseException:
+            coro.close()
+            raise
+
+        try:
+            return await self._execute_timed(
+                ident, coro, factory, key, deadline
+            )
+        finally:
+            self._limiter.release(key)
+
+    async def _execute_timed(
+        self,
+        ident: T_Ident,
+        coro: Coroutine[Any, Any, T_Result],
+        factory: Optional[T_CoroFactory],
+        key: Hashable,
+        deadline: Optional[float] = None,
+    ) -> T_Result:
+        """
+        Execute coroutine within ``leader_timeout`` and restart it on timeout
+        while ``leader_restarts`` are left, each start is rate limited and
+        may be hedged.
+        """
+        restarts = self._leader_restarts if factory is not None else 0
+        while True:
+            if self._rate_limiter is not None:
+                await self._throttle(
+                    self._rate_limiter, ident, coro, key, deadline
+                )
+                # restarts are not shed
+                deadline = None
+
+            attempt: Awaitable[T_Result] = coro
+            if self._hedge_delay is not None or self._latencies is not None:
+                attempt = self._hedged(ident, coro, factory, key)
+
+            if self._leader_timeout is None:
+                return await attempt
+
+            try:
+                return await asyncio.wait_for(attempt, self._leader_timeout)
+            except asyncio.TimeoutError:
+                if not restarts:
+                    raise
+
+            assert factory is not None
+            restarts -= 1
+            coro = factory()
+
+    async def _hedged(
+        self,
+        ident: T_Ident,
+        coro: Coroutine[Any, Any, T_Result],
+        factory: Optional[T_CoroFactory],
+        key: Hashable,
+    ) -> T_Result:
+        """
+        Execute coroutine and start second attempt of it when the first one
+        is late, the first successful result wins.
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+
+        delay = self._hedge_delay
+        if self._latencies is not None:
+            assert self._hedge_percentile is not None
+            estimated = self._latencies.percentile(key, self._hedge_percentile)
+            if estimated is not None:
+                delay = estimated
+
+        if factory is None or delay is None:
+            result = await coro
+        else:
+            result = await self._race(ident, coro, factory, key, delay)
+
+        if self._latencies is not None:
+            self._latencies.add(key, loop.time() - started)
+
+        return result
+
+    async def _race(
+        self,
+        ident: T_Ident,
+        coro: Coroutine[Any, Any, T_Result],
+        factory: T_CoroFactory,
+        key: Hashable,
+        delay: float,
+    ) -> T_Result:
+        first = asyncio.ensure_future(coro)
+        attempts: List[asyncio.Future] = [first]
+        try:
+            done, _ = await asyncio.wait(attempts, timeout=delay)
+            if done:
+                return first.result()
+
+            started = self._start_hedge(ident, factory, key, delay)
+            if started is None:
+                return await first
+
+            hedge, hedged = started
+            attempts.append(hedged)
+
+            pending = set(attempts)
+            while True:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for attempt in done:
+                    if attempt.exception() is None:
+                        if self._hooks:
+                            winner, loser = (
+                                (coro, hedge)
+                                if attempt is first
+                                else (hedge, coro)
+                            )
+                            self._hooks.on_hedge_settled_for(
+                                winner, render_ident(ident), loser
+                            )
+
+                        return attempt.result()
+
+                if not pending:
+                    # both attempts failed, raise error of the first one
+                    return first.result()
+        finally:
+            # loser (or both on cancelling) is cancelled
+            for attempt in attempts:
+                attempt.cancel()
+
+    def _start_hedge(
+        self,
+        ident: T_Ident,
+        factory: T_CoroFactory,
+        key: Hashable,
+        delay: float,
+    ) -> Optional[Tuple[Coroutine[Any, Any, Any], asyncio.Future]]:
+        """
+        Start second attempt of coroutine if limits allow it at once, its
+        place by concurrency limits is released when it is done.
+        """
+        if not self._reserve_hedge(key):
+            return None
+
+        try:
+            hedge = factory()
+        except BaseException:
+            self._release_hedge(key)
+            raise
+
+        if self._hooks:
+            self._hooks.on_hedged_for(hedge, render_ident(ident), delay)
+
+        hedged = asyncio.ensure_future(hedge)
+        hedged.add_done_callback(lambda _: self._release_hedge(key))
+
+        return hedge, hedged
+
+    def _reserve_hedge(self, key: Hashable) -> bool:
+        """
+        Take place by concurrency limits and token by rate limits for second
+        attempt of coroutine only if they are available at once.
+        """
+        if self._limiter is not None and not self._limiter.try_acquire(key):
+            return False
 
-        return await wait_future
+        if self._rate_limiter is not None and self._rate_limiter.reserve(key):
+            self._rate_limiter.refund(key)
+            self._release_hedge(key)
+            return False
 
-    @staticmethod
-    def _set_wait_future_result(
-        result_future: asyncio.Future, wait_future: asyncio.Future
+        return True
+
+    def _release_hedge(self, key: Hashable) -> None:
+        if self._limiter is not None:
+            self._limiter.release(key)
+
+    async def _throttle(
+        self,
+        rate_limiter: RateLimiter,
+        ident: T_Ident,
+        coro: Coroutine[Any, Any, T_Result],
+        key: Hashable,
+        deadline: Optional[float] = None,
     ) -> None:
-        if wait_future.cancelled():
+        """
+        Wait for turn of coroutine to start by rate limits, coroutine is shed
+        at once if its turn is after ``deadline``.
+        """
+        delay = rate_limiter.reserve(key)
+        if not delay:
             return
 
+        loop = asyncio.get_running_loop()
+        if deadline is not None and loop.time() + delay > deadline:
+            rate_limiter.refund(key)
+            self._shed(ident, coro)
+
+        if self._hooks:
+            self._hooks.on_throttled_for(coro, render_ident(ident), delay)
+
         try:
-            result = result_future.result()
-            set_func = wait_future.set_result
-        except (Exception, asyncio.CancelledError) as e:
-            result = e
-            set_func = wait_future.set_exception
+            await asyncio.sleep(delay)
+        except BaseException:
+            rate_limiter.refund(key)
+            coro.close()
+            raise
+
+    def _shed(
+        self, ident: T_Ident, coro: Coroutine[Any, Any, T_Result]
+    ) -> NoReturn:
+        """
+        Reject coroutine waited for its turn longer than ``max_queued_age``.
+        """
+        exception = Overloaded(
+            'Coroutine waits for its turn longer than {}s'.format(
+                self._max_queued_age
+            )
+        )
+        self._reject(ident, coro, exception)
+
+        raise exception
+
+    def _leave(
+        self,
+        ident: T_Ident,
+        flight: Flight,
+        coro: Optional[Coroutine[Any, Any, T_Result]],
+        waiter: asyncio.Future,
+    ) -> None:
+        """
+        Count waiter which is done, execution is abandoned when the last
+        live waiter is cancelled (or timed out) before its completion.
+        """
+        with self._lock:
+            flight.waiting -= 1
+            if self._abandoned is None or flight.waiting or flight.done:
+                return
+
+            task = flight.task
+            if self._abandoned == 'cancel':
+                # next similar coroutines are executed again
+                del self._running[ident]
+
+        if self._hooks and coro is not None:
+            self._hooks.on_abandoned_for(coro, render_ident(ident))
+
+        if self._abandoned == 'cancel' and task is not None:
+            task.get_loop().call_soon_threadsafe(task.cancel)
+
+    def _keep(
+        self,
+        ident: T_Ident,
+        flight: Flight,
+        ttl: float,
+        factory: Optional[T_CoroFactory],
+    ) -> None:
+        entry = self._cache.set(ident, flight, ttl, self._stale_ttl)
+
+        if factory is not None and self._refresh_ahead:
+            entry.timer = asyncio.get_running_loop().call_later(
+                ttl * (1 - self._refresh_ahead),
+                self._refresh,
+                ident,
+                entry,
+                ttl,
+                factory,
+            )
+
+    async def _shared(
+        self,
+        backend: BaseBackend,
+        ident: str,
+        coro: Coroutine[Any, Any, T_Result],
+        factory: Optional[T_CoroFactory] = None,
+        priority: float = 0,
+        retry: Optional[RetryPolicy] = None,
+    ) -> Tuple[Outcome, bool]:
+        """
+        Execute coroutine if the reducer becomes leader for ``ident`` or get
+        outcome of the leader from other process.
+
+        Returns outcome and flag whether coroutine was executed.
+        """
+        try:
+            outcome = await backend.join(ident)
+        except OSError:
+            # backend is unavailable, so execute coroutine locally
+            outcome = await self._lead(
+                None, ident, coro, factory, priority, retry
+            )
+            return outcome, True
+        except BaseException:
+            coro.close()
+            raise
+
+        if outcome is not None:
+            if self._hooks:
+                self._hooks.on_reducing_for(coro, ident)
+
+            coro.close()
+            return outcome, False
+
+        outcome = await self._lead(
+            backend, ident, coro, factory, priority, retry
+        )
+        return outcome, True
+
+    async def _lead(
+        self,
+        backend: Optional[BaseBackend],
+        ident: str,
+        coro: Coroutine[Any, Any, T_Result],
+        factory: Optional[T_CoroFactory] = None,
+        priority: float = 0,
+        retry: Optional[RetryPolicy] = None,
+    ) -> Outcome:
+        """
+        Execute coroutine and publish its outcome via ``backend``.
+        """
+        if self._hooks:
+            self._hooks.on_executing_for(coro, ident)
+
+        try:
+            result = await self._execute_coro(
+                ident, coro, factory, priority, retry
+            )
+        except asyncio.CancelledError:
+            if backend is not None:
+                with suppress(OSError):
+                    await asyncio.shield(backend.release(ident))
+            raise
+        except Exception as e:
+            outcome = Outcome(exception=e)
+        else:
+            outcome = Outcome(result=result)
+
+        if backend is not None:
+            with suppress(OSError):
+                await backend.publish(ident, outcome)
+
+        return outcome
+
+    def _is_negative_cacheable(
+        self, ident: T_Ident, exception: BaseException
+    ) -> bool:
+        return (
+            isinstance(exception, self._negative_exceptions)
+            and not isinstance(exception, (asyncio.CancelledError, Overloaded))
+            # do not replace kept result which is being refreshed
+            and self._cache.peek(ident) is None
+        )
+
+    def _refresh(
+        self,
+        ident: T_Ident,
+        entry: CacheEntry,
+        ttl: float,
+        factory: T_CoroFactory,
+    ) -> None:
+        entry.timer = None
+
+        if entry.hits < self._refresh_ahead_hits:
+            return
+
+        with self._lock:
+            # refreshing is optional, so it is skipped without room in
+            # flight and kept result expires as usual
+            if ident in self._running or not self._has_room():
+                return
+
+            flight, _ = self._get_or_create_flight(ident)
+
+        self._start(ident, factory(), flight, ttl, factory)
+
+
+class _ExecutorCall(CoroutineABC):
+    """
+    Coroutine of blocking call executed in executor, which looks like
+    coroutine of the called function for hooks and limits.
+    """
+
+    __slots__ = ('call', 'cr_code', '_qualname', '_coro')
+
+    def __init__(
+        self, call: 'partial[Any]', executor: Optional[Executor]
+    ) -> None:
+        self.call = call
+        self._coro = _execute(executor, call)
+
+        func: Any = inspect.unwrap(call.func)
+        code = getattr(func, '__code__', None)
+        if code is None:
+            # e.g. builtin function
+            code, func = get_coroutine_code(self._coro), self._coro
+
+        self.cr_code = code
+        self._qualname = getattr(func, '__qualname__')
+
+    def __getattr__(self, name: str) -> Any:
+        # instances of classes have no ``__qualname__``
+        if name == '__qualname__':
+            return self._qualname
+
+        raise AttributeError(name)
+
+    def __repr__(self) -> str:
+        return '<executor call {!r}>'.format(self.call)
+
+    def send(self, value: Any) -> Any:
+        return self._coro.send(value)
+
+    def throw(self, *args: Any) -> Any:
+        return self._coro.throw(*args)
+
+    def close(self) -> None:
+        self._coro.close()
+
+    def __await__(self) -> Generator[Any, None, Any]:
+        return self._coro.__await__()
+
+
+async def _execute(
+    executor: Optional[Executor], func: Callable[[], T_Result]
+) -> T_Result:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, func)
+
+
+async def _wait(waiter: Awaitable[T_Result]) -> T_Result:
+    return await waiter
+
+
+def _expire(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_exception(asyncio.TimeoutError())
+
 
-        set_func(result)
+def _cancel_timer(handle: asyncio.TimerHandle, waiter: asyncio.Future) -> None:
+    handle.cancel()
 
 
 async_reduce = AsyncReducer()
@@ -1,19 +1,204 @@
 import sys
-from typing import Coroutine, Any
-
-_cached_sys_path = sorted(
-    set(path for path in sys.path if path and path != '/')
+from functools import lru_cache
+from inspect import Parameter, signature
+from types import CodeType
+from typing import (
+    Any,
+    Callable,
+    Coroutine,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Tuple,
+    Union,
 )
 
+# ident set by user or key of calculated one:
+# (label, code, filename, qualname, hash), code objects are equal by value
+# regardless of their files, so filename is a part of key
+T_Ident = Union[str, Tuple[str, CodeType, str, str, Hashable]]
+
+_sys_path_snapshot: List[str] = []
+_cached_sys_path: List[str] = []
+
 
 def get_coroutine_function_location(coro: Coroutine[Any, Any, Any]) -> str:
     """
     Get relative location for coroutine function.
     """
+    return get_code_location(
+        get_coroutine_code(coro), getattr(coro, '__qualname__')
+    )
+
+
+def get_coroutine_code(coro: Coroutine[Any, Any, Any]) -> CodeType:
+    """
+    Get code object of coroutine function.
+    """
     code = getattr(coro, 'cr_code', None)
     if not code:  # for generator base coroutine
         code = getattr(coro, 'gi_code')
 
+    return code
+
+
+def get_function_location(func: Callable[..., Any]) -> str:
+    """
+    Get relative location for function.
+    """
+    return get_code_location(
+        getattr(func, '__code__'), getattr(func, '__qualname__')
+    )
+
+
+def get_code_location(code: CodeType, qualname: str) -> str:
+    """
+    Get relative location for code object of function with ``qualname``.
+    """
+    _check_sys_path()
+    return _get_code_location(code, qualname)
+
+
+def render_ident(ident: T_Ident) -> str:
+    """
+    Human-readable ident for hooks and backends.
+    """
+    if isinstance(ident, str):
+        return ident
+
+    label, code, _, qualname, hsh = ident
+    return '{}(<{}:{}>)'.format(get_code_location(code, qualname), label, hsh)
+
+
+def get_call_ident(
+    func: Callable[..., Any],
+    args: Tuple[Any, ...],
+    hash_func: Callable[[Any], Hashable],
+) -> T_Ident:
+    """
+    Get ident of call of function with positional arguments.
+    """
+    code = getattr(func, '__code__', None)
+    try:
+        if code is None:
+            raise TypeError('function has no code')
+
+        hsh = hash_func(args)
+    except TypeError as e:
+        raise TypeError(
+            'Unable to auto calculate identity for call of {!r} ({}), you'
+            ' should set `ident` manual'.format(func, e)
+        )
+
+    return (
+        'args_hash',
+        code,
+        code.co_filename,
+        getattr(func, '__qualname__'),
+        hsh,
+    )
+
+
+class ArgumentsBinder:
+    """
+    Binder of arguments of calls to signature of function with defaults, so
+    the same values passed by position or by keyword (or omitted) are bound
+    the same way.
+
+    Calls with positional arguments only of function without ``*args``,
+    keyword-only arguments and ``**kwargs`` are bound without
+    ``inspect.Signature.bind()``, which is slow.
+    """
+
+    __slots__ = ('signature', 'names', 'defaults')
+
+    def __init__(self, func: Callable[..., Any]) -> None:
+        self.signature = signature(func)
+
+        parameters = self.signature.parameters.values()
+        if all(parameter.kind in _POSITIONAL for parameter in parameters):
+            self.names: Optional[Tuple[str, ...]] = tuple(
+                parameter.name for parameter in parameters
+            )
+            self.defaults = tuple(
+                parameter.default for parameter in parameters
+            )
+        else:
+            self.names = None
+            self.defaults = ()
+
+    def bind(
+        self, args: Tuple[Any, ...], kwargs: Dict[str, Any]
+    ) -> Tuple[Tuple[str, Any], ...]:
+        """
+        Names and values of all arguments of call.
+
+        Raises ``TypeError`` if arguments do not match the signature.
+        """
+        names = self.names
+        if not kwargs and names is not None and len(args) <= len(names):
+            omitted = self.defaults[len(args):]
+            if Parameter.empty not in omitted:
+                return tuple(zip(names, args + omitted))
+
+        bound = self.signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+
+        arguments = []
+        for name, value in bound.arguments.items():
+            kind = self.signature.parameters[name].kind
+            if kind is Parameter.VAR_KEYWORD:
+                value = tuple(sorted(value.items()))
+
+            arguments.append((name, value))
+
+        return tuple(arguments)
+
+
+_POSITIONAL = (Parameter.POSITIONAL_ONLY, Parameter.POSITIONAL_OR_KEYWORD)
+
+
+def hash_args(
+    hash_func: Callable[[Any], Hashable],
+    binder: ArgumentsBinder,
+    args: Tuple[Any, ...],
+    kwargs: Dict[str, Any],
+    self_ident: Optional[Callable[[Any], Hashable]] = None,
+) -> Hashable:
+    """
+    Hash arguments of call bound by ``binder``, the first one is replaced by
+    result of ``self_ident`` if it is set.
+
+    Raises ``TypeError`` if arguments do not match the signature.
+    """
+    arguments = binder.bind(args, kwargs)
+
+    if self_ident is not None and arguments:
+        name, value = arguments[0]
+        arguments = ((name, self_ident(value)),) + arguments[1:]
+
+    return hash_func(arguments)
+
+
+def _check_sys_path() -> None:
+    """
+    Reset cached locations if ``sys.path`` was changed.
+    """
+    global _sys_path_snapshot, _cached_sys_path
+
+    if sys.path == _sys_path_snapshot:
+        return
+
+    _sys_path_snapshot = list(sys.path)
+    _cached_sys_path = sorted(
+        set(path for path in sys.path if path and path != '/')
+    )
+    _get_code_location.cache_clear()
+
+
+@lru_cache(maxsize=4096)
+def _get_code_location(code: CodeType, qualname: str) -> str:
     filename = code.co_filename
     file_path = next(
         (
@@ -28,4 +213,4 @@ def get_coroutine_function_location(coro: Coroutine[Any, Any, Any]) -> str:
     else:
         module_path = '<unknown module>'
 
-    return '{}:{}'.format(module_path, getattr(coro, '__qualname__'))
+    return '{}:{}'.format(module_path, qualname)
@@ -0,0 +1,15 @@
+from async_reduce.backends.base import BaseBackend, Outcome
+from async_reduce.backends.memory import MemoryBackend, MemoryBroker
+from async_reduce.backends.tcp import TCPBackend, TCPBroker
+from async_reduce.backends.unix import Broker, UnixSocketBackend
+
+__all__ = (
+    'BaseBackend',
+    'Outcome',
+    'MemoryBackend',
+    'MemoryBroker',
+    'TCPBackend',
+    'TCPBroker',
+    'Broker',
+    'UnixSocketBackend',
+)
@@ -0,0 +1,179 @@
+import asyncio
+from collections import defaultdict, deque
+from typing import Any, Callable, Deque, Dict, NamedTuple, Optional
+
+
+class Outcome(NamedTuple):
+    """
+    Settled result of shared execution.
+    """
+
+    result: Any = None
+    exception: Optional[BaseException] = None
+
+    def unwrap(self) -> Any:
+        """
+        Return result or raise exception.
+        """
+        if self.exception is not None:
+            raise self.exception
+
+        return self.result
+
+
+class BaseBackend:
+    """
+    Interface of backend to share single execution of coroutine between
+    reducers of different processes or nodes.
+
+    Each reducer joins to execution of ``ident`` before running coroutine,
+    the only one of them becomes a leader which executes coroutine and
+    publishes the outcome, others get this outcome.
+    """
+
+    async def join(self, ident: str) -> Optional[Outcome]:
+        """
+        Join to execution of ``ident``.
+
+        Returns ``None`` if caller becomes leader and should execute the
+        coroutine and publish its outcome, otherwise waits and returns the
+        outcome of the leader.
+        """
+        raise NotImplementedError  # pragma: no cover
+
+    async def publish(self, ident: str, outcome: Outcome) -> None:
+        """
+        Publish outcome of execution by the leader.
+        """
+        raise NotImplementedError  # pragma: no cover
+
+    async def release(self, ident: str) -> None:
+        """
+        Give up leadership without outcome, so other joined reducer becomes
+        the leader.
+        """
+        raise NotImplementedError  # pragma: no cover
+
+
+class Election:
+    """
+    Leaders and queues of followers of participants (reducers of different
+    processes or nodes) for each ident.
+
+    :param lead: function to notify participant that it becomes the leader
+    :param notify: function to pass outcome of the leader to follower
+    :param lease: seconds for the leader to publish outcome, after that next
+        follower becomes the leader (by default leadership is not limited)
+    """
+
+    def __init__(
+        self,
+        lead: Callable[[Any, str], None],
+        notify: Callable[[Any, str, Any], None],
+        *,
+        lease: Optional[float] = None
+    ) -> None:
+        self._lead = lead
+        self._notify = notify
+        self._lease = lease
+        self._leaders: Dict[str, Any] = {}
+        self._leases: Dict[str, asyncio.TimerHandle] = {}
+        self._followers: Dict[str, Deque[Any]] = defaultdict(deque)
+
+    def join(self, ident: str, participant: Any) -> None:
+        if ident in self._leaders:
+            self._followers[ident].append(participant)
+            return
+
+        self._leaders[ident] = participant
+        if self._lease is not None:
+            self._leases[ident] = asyncio.get_running_loop().call_later(
+                self._lease, self.release, ident, participant
+            )
+
+        self._lead(participant, ident)
+
+    def publish(self, ident: str, participant: Any, outcome: Any) -> None:
+        if not self._resign(ident, participant):
+            return
+
+        for follower in self._followers.pop(ident, ()):
+            self._notify(follower, ident, outcome)
+
+    def release(self, ident: str, participant: Any) -> None:
+        if not self._resign(ident, participant):
+            return
+
+        followers = self._followers.get(ident)
+        if followers:
+            self.join(ident, followers.popleft())
+
+        if not followers:
+            self._followers.pop(ident, None)
+
+    def disconnect(self, participant: Any) -> None:
+        for ident, followers in list(self._followers.items()):
+            while participant in followers:
+                followers.remove(participant)
+
+            if not followers:
+                del self._followers[ident]
+
+        for ident, leader in list(self._leaders.items()):
+            if leader is participant:
+                self.release(ident, participant)
+
+    def _resign(self, ident: str, participant: Any) -> bool:
+        if self._leaders.get(ident) is not participant:
+            return False
+
+        del self._leaders[ident]
+
+        timer = self._leases.pop(ident, None)
+        if timer is not None:
+            timer.cancel()
+
+        return True
+
+
+class PendingJoins:
+    """
+    Joins of reducer waiting for leadership or outcome, they are resolved in
+    order of joining for each ident.
+    """
+
+    def __init__(self) -> None:
+        self._futures: Dict[str, Deque[asyncio.Future]] = defaultdict(deque)
+
+    def add(self, ident: str) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self._futures[ident].append(future)
+
+        return future
+
+    def resolve(self, ident: str, value: Any) -> bool:
+        """
+        Resolve the first join of ``ident`` with ``value``, returns
+        ``False`` if nobody waits for it anymore.
+        """
+        futures = self._futures.get(ident)
+        if not futures:
+            return False
+
+        future = futures.popleft()
+        if not futures:
+            del self._futures[ident]
+
+        if future.done():
+            return False
+
+        future.set_result(value)
+        return True
+
+    def fail(self, exception: BaseException) -> None:
+        futures, self._futures = self._futures, defaultdict(deque)
+
+        for queue in futures.values():
+            for future in queue:
+                if not future.done():
+                    future.set_exception(exception)
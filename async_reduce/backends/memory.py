@@ -0,0 +1,76 @@
+from typing import Optional
+
+from async_reduce.backends.base import (
+    BaseBackend,
+    Election,
+    Outcome,
+    PendingJoins,
+)
+
+
+class MemoryBroker(Election):
+    """
+    Broker to elect a leader for each ident among :class:`MemoryBackend`s of
+    the same event loop, e.g. to test distributed setup without external
+    services.
+
+    :param lease: seconds for the leader to publish outcome (by default
+        leadership is not limited)
+
+    Example:
+
+        broker = MemoryBroker()
+
+        node1 = AsyncReducer(backend=MemoryBackend(broker))
+        node2 = AsyncReducer(backend=MemoryBackend(broker))
+    """
+
+    def __init__(self, *, lease: Optional[float] = None) -> None:
+        super().__init__(self._lead, self._notify, lease=lease)
+
+    @staticmethod
+    def _lead(backend: 'MemoryBackend', ident: str) -> None:
+        backend._resolve(ident, None)
+
+    @staticmethod
+    def _notify(
+        backend: 'MemoryBackend', ident: str, outcome: Outcome
+    ) -> None:
+        backend._resolve(ident, outcome)
+
+
+class MemoryBackend(BaseBackend):
+    """
+    Backend to share executions via :class:`MemoryBroker`, outcomes are
+    passed as is.
+
+    :param broker: broker shared by backends
+    """
+
+    def __init__(self, broker: MemoryBroker) -> None:
+        self.broker = broker
+        self._pending = PendingJoins()
+
+    async def join(self, ident: str) -> Optional[Outcome]:
+        future = self._pending.add(ident)
+        self.broker.join(ident, self)
+
+        return await future
+
+    async def publish(self, ident: str, outcome: Outcome) -> None:
+        self.broker.publish(ident, self, outcome)
+
+    async def release(self, ident: str) -> None:
+        self.broker.release(ident, self)
+
+    async def close(self) -> None:
+        """
+        Disconnect from broker like lost connection.
+        """
+        self.broker.disconnect(self)
+        self._pending.fail(ConnectionError('Backend is closed'))
+
+    def _resolve(self, ident: str, outcome: Optional[Outcome]) -> None:
+        if not self._pending.resolve(ident, outcome) and outcome is None:
+            # nobody waits for leadership anymore
+            self.broker.release(ident, self)
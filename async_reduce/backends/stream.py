@@ -0,0 +1,247 @@
+import asyncio
+import hashlib
+import hmac
+import pickle
+import struct
+from typing import Optional, Set, Tuple
+
+from async_reduce.backends.base import (
+    BaseBackend,
+    Election,
+    Outcome,
+    PendingJoins,
+)
+
+OP_JOIN = 1
+OP_PUBLISH = 2
+OP_RELEASE = 3
+OP_LEAD = 4
+OP_OUTCOME = 5
+
+_HEADER = struct.Struct('!BII')
+_SIGNED_HEADER = struct.Struct('!BI')
+_SIGNATURE_SIZE = hashlib.sha256().digest_size
+
+
+def _pack(op: int, ident: str, blob: bytes = b'') -> bytes:
+    ident_bytes = ident.encode()
+    return _HEADER.pack(op, len(ident_bytes), len(blob)) + ident_bytes + blob
+
+
+async def _read(reader: asyncio.StreamReader) -> Tuple[int, str, bytes]:
+    op, ident_size, blob_size = _HEADER.unpack(
+        await reader.readexactly(_HEADER.size)
+    )
+    ident = (await reader.readexactly(ident_size)).decode()
+    blob = await reader.readexactly(blob_size) if blob_size else b''
+
+    return op, ident, blob
+
+
+class BaseBroker:
+    """
+    Base of brokers to elect a leader for each ident among reducers connected
+    via streams.
+
+    The broker only routes messages and never unpickles outcomes. If the
+    leader disconnects, releases its leadership or its lease is expired, the
+    next joined reducer becomes the leader.
+
+    :param lease: seconds for the leader to publish outcome (by default
+        leadership is not limited)
+    """
+
+    def __init__(self, *, lease: Optional[float] = None) -> None:
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._election = Election(self._lead, self._notify, lease=lease)
+        self._connections: Set[asyncio.StreamWriter] = set()
+
+    async def start(self) -> None:
+        self._server = await self._start_server()
+
+    async def close(self) -> None:
+        if self._server is None:
+            return
+
+        self._server.close()
+        for writer in self._connections:
+            writer.close()
+
+        await self._server.wait_closed()
+        self._server = None
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.close()
+
+    async def _start_server(self) -> asyncio.AbstractServer:
+        raise NotImplementedError  # pragma: no cover
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self._connections.add(writer)
+        try:
+            while True:
+                op, ident, blob = await _read(reader)
+
+                if op == OP_JOIN:
+                    self._election.join(ident, writer)
+                elif op == OP_PUBLISH:
+                    self._election.publish(ident, writer, blob)
+                elif op == OP_RELEASE:
+                    self._election.release(ident, writer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            self._election.disconnect(writer)
+            writer.close()
+
+    @staticmethod
+    def _lead(writer: asyncio.StreamWriter, ident: str) -> None:
+        writer.write(_pack(OP_LEAD, ident))
+
+    @staticmethod
+    def _notify(
+        writer: asyncio.StreamWriter, ident: str, blob: bytes
+    ) -> None:
+        writer.write(_pack(OP_OUTCOME, ident, blob))
+
+
+class StreamBackend(BaseBackend):
+    """
+    Base of backends connected to broker via stream.
+
+    Results and exceptions are shared via pickle, so they must be picklable.
+    With ``secret`` outcomes are signed together with their idents and
+    outcomes with wrong signature are rejected, otherwise all connected
+    processes must trust each other.
+
+    Connection is bound to event loop where it is established, use separate
+    backend for each event loop.
+
+    :param secret: key to sign outcomes, the same for all reducers
+    """
+
+    def __init__(self, *, secret: Optional[bytes] = None) -> None:
+        self._secret = secret
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._connecting: Optional[asyncio.Future] = None
+        self._pending = PendingJoins()
+
+    async def join(self, ident: str) -> Optional[Outcome]:
+        writer = await self._connect()
+
+        future = self._pending.add(ident)
+        writer.write(_pack(OP_JOIN, ident))
+
+        blob = await future
+        if blob is None:
+            return None
+
+        return self._loads(ident, blob)
+
+    async def publish(self, ident: str, outcome: Outcome) -> None:
+        writer = await self._connect()
+        writer.write(_pack(OP_PUBLISH, ident, self._dumps(ident, outcome)))
+
+    async def release(self, ident: str) -> None:
+        writer = await self._connect()
+        writer.write(_pack(OP_RELEASE, ident))
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    async def _open_connection(
+        self,
+    ) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        raise NotImplementedError  # pragma: no cover
+
+    def _dumps(self, ident: str, outcome: Outcome) -> bytes:
+        try:
+            data = pickle.dumps(outcome)
+        except Exception as e:
+            # share at least the fact of failure
+            data = pickle.dumps(
+                Outcome(
+                    exception=RuntimeError(
+                        'Unable to share outcome: {!r}'.format(e)
+                    )
+                )
+            )
+
+        if self._secret is None:
+            return data
+
+        return self._sign(ident, data) + data
+
+    def _loads(self, ident: str, blob: bytes) -> Outcome:
+        if self._secret is not None:
+            signature = blob[:_SIGNATURE_SIZE]
+            blob = blob[_SIGNATURE_SIZE:]
+            if not hmac.compare_digest(signature, self._sign(ident, blob)):
+                return Outcome(
+                    exception=RuntimeError(
+                        'Outcome of the leader has wrong signature'
+                    )
+                )
+
+        return pickle.loads(blob)
+
+    def _sign(self, ident: str, data: bytes) -> bytes:
+        """
+        Signature of outcome published for ``ident``, so it can not be
+        replayed for other ident.
+        """
+        assert self._secret is not None
+        ident_bytes = ident.encode()
+        signed = _SIGNED_HEADER.pack(OP_PUBLISH, len(ident_bytes))
+
+        return hmac.new(
+            self._secret, signed + ident_bytes + data, hashlib.sha256
+        ).digest()
+
+    async def _connect(self) -> asyncio.StreamWriter:
+        if self._writer is not None:
+            return self._writer
+
+        if self._connecting is None or self._connecting.done():
+            self._connecting = asyncio.ensure_future(self._open())
+
+        return await asyncio.shield(self._connecting)
+
+    async def _open(self) -> asyncio.StreamWriter:
+        reader, writer = await self._open_connection()
+
+        self._writer = writer
+        asyncio.ensure_future(self._listen(reader, writer))
+
+        return writer
+
+    async def _listen(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                op, ident, blob = await _read(reader)
+
+                if op == OP_OUTCOME:
+                    self._pending.resolve(ident, blob)
+                elif not self._pending.resolve(ident, None):
+                    # nobody waits for leadership anymore
+                    writer.write(_pack(OP_RELEASE, ident))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            if self._writer is writer:
+                self._writer = None
+
+            writer.close()
+
+            self._pending.fail(ConnectionError('Connection to broker is lost'))
@@ -0,0 +1,89 @@
+import argparse
+import asyncio
+from typing import Optional, Tuple
+
+from async_reduce.backends.stream import BaseBroker, StreamBackend
+
+
+class TCPBroker(BaseBroker):
+    """
+    Broker on TCP socket to elect a leader for each ident among reducers of
+    different nodes.
+
+    The broker has no authentication, so listen only on trusted network.
+
+    :param host: host to listen on
+    :param port: port to listen on (``0`` to choose free port)
+    :param lease: seconds for the leader to publish outcome (by default
+        leadership is not limited)
+
+    Example:
+
+        broker = TCPBroker('10.0.0.1', 7400, lease=30)
+        await broker.start()
+
+    or run it as separate process::
+
+        $ python -m async_reduce.backends.tcp 10.0.0.1 7400 --lease 30
+    """
+
+    def __init__(
+        self, host: str, port: int, *, lease: Optional[float] = None
+    ) -> None:
+        super().__init__(lease=lease)
+        self.host = host
+        self.port = port
+
+    async def _start_server(self) -> asyncio.AbstractServer:
+        server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = server.sockets[0].getsockname()[1]
+
+        return server
+
+
+class TCPBackend(StreamBackend):
+    """
+    Backend to share executions between nodes via :class:`TCPBroker`.
+
+    Outcomes are signed by ``secret``, so only reducers with the same secret
+    can share results with each other. Results and exceptions must be
+    picklable and idents must be the same on all nodes.
+
+    :param host: host of broker
+    :param port: port of broker
+    :param secret: key to sign outcomes, the same for all reducers
+    """
+
+    def __init__(self, host: str, port: int, *, secret: bytes) -> None:
+        super().__init__(secret=secret)
+        self.host = host
+        self.port = port
+
+    async def _open_connection(
+        self,
+    ) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        return await asyncio.open_connection(self.host, self.port)
+
+
+def main() -> None:  # pragma: no cover
+    parser = argparse.ArgumentParser(
+        prog='python -m async_reduce.backends.tcp',
+        description='Run broker on TCP socket.',
+    )
+    parser.add_argument('host', help='host to listen on')
+    parser.add_argument('port', type=int, help='port to listen on')
+    parser.add_argument(
+        '--lease', type=float, help='seconds for leader to publish outcome'
+    )
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(
+            TCPBroker(args.host, args.port, lease=args.lease).serve_forever()
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
@@ -0,0 +1,100 @@
+import argparse
+import asyncio
+import os
+from contextlib import suppress
+from typing import Optional, Tuple
+
+from async_reduce.backends.stream import BaseBroker, StreamBackend
+
+
+class Broker(BaseBroker):
+    """
+    Broker on unix domain socket to elect a leader for each ident among
+    reducers of processes on the same host.
+
+    :param path: path of unix domain socket, it is accessible only for owner
+    :param lease: seconds for the leader to publish outcome (by default
+        leadership is not limited)
+
+    Example:
+
+        broker = Broker('/run/my-app/reducer.sock')
+        await broker.start()
+        ...
+        await broker.close()
+
+    or run it as separate process::
+
+        $ python -m async_reduce.backends.unix /run/my-app/reducer.sock
+    """
+
+    def __init__(self, path: str, *, lease: Optional[float] = None) -> None:
+        super().__init__(lease=lease)
+        self.path = path
+
+    async def start(self) -> None:
+        with suppress(FileNotFoundError):
+            os.unlink(self.path)
+
+        await super().start()
+        os.chmod(self.path, 0o600)
+
+    async def close(self) -> None:
+        if self._server is None:
+            return
+
+        await super().close()
+
+        with suppress(FileNotFoundError):
+            os.unlink(self.path)
+
+    async def _start_server(self) -> asyncio.AbstractServer:
+        return await asyncio.start_unix_server(self._serve, path=self.path)
+
+
+class UnixSocketBackend(StreamBackend):
+    """
+    Backend to share executions between processes on the same host via
+    :class:`Broker` listening on unix domain socket ``path``.
+
+    Results and exceptions are shared via pickle, so they must be picklable
+    and processes must trust each other (or use the same ``secret``). Idents
+    must be the same in all processes, so prefer explicit ``ident`` or stable
+    identity of coroutines.
+
+    Connection is bound to event loop where it is established, use separate
+    backend for each event loop.
+
+    :param path: path of unix domain socket of broker
+    :param secret: key to sign outcomes, the same for all reducers
+    """
+
+    def __init__(self, path: str, *, secret: Optional[bytes] = None) -> None:
+        super().__init__(secret=secret)
+        self.path = path
+
+    async def _open_connection(
+        self,
+    ) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        return await asyncio.open_unix_connection(self.path)
+
+
+def main() -> None:  # pragma: no cover
+    parser = argparse.ArgumentParser(
+        prog='python -m async_reduce.backends.unix',
+        description='Run broker on unix domain socket.',
+    )
+    parser.add_argument('path', help='path of unix domain socket')
+    parser.add_argument(
+        '--lease', type=float, help='seconds for leader to publish outcome'
+    )
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(Broker(args.path, lease=args.lease).serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
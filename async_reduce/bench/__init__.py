@@ -0,0 +1,49 @@
+"""
+Benchmarks of ``async_reduce``, run them via::
+
+    $ python -m async_reduce.bench
+"""
+import asyncio
+import time
+import timeit
+from typing import Any, Awaitable, Callable, Dict, Iterator, Tuple
+
+T_Benchmark = Callable[[], Iterator[Tuple[str, float, str]]]
+
+BENCHMARKS: Dict[str, T_Benchmark] = {}
+
+
+def benchmark(func: T_Benchmark) -> T_Benchmark:
+    """
+    Register benchmark which yields ``(name, value, unit)`` of measurements.
+    """
+    BENCHMARKS[func.__name__] = func
+    return func
+
+
+def best_time(func: Callable[[], Awaitable[Any]], repeat: int = 5) -> float:
+    """
+    Get the best time of ``repeat`` runs of ``await func()`` in seconds.
+    """
+
+    async def run() -> float:
+        best = float('inf')
+
+        for _ in range(repeat):
+            start = time.perf_counter()
+            await func()
+            best = min(best, time.perf_counter() - start)
+
+        return best
+
+    return asyncio.run(run())
+
+
+def time_per_call(
+    func: Callable[[], Any], number: int = 10000, repeat: int = 5
+) -> float:
+    """
+    Get the best time of single ``func()`` call in microseconds.
+    """
+    best = min(timeit.repeat(func, number=number, repeat=repeat))
+    return best / number * 1e6
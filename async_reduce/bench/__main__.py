@@ -0,0 +1,112 @@
+import argparse
+import json
+import platform
+import sys
+from typing import Any, Dict, List, Optional
+
+from async_reduce.bench import BENCHMARKS
+from async_reduce.bench import (  # noqa: F401
+    executor,
+    hooks,
+    idents,
+    reduceable,
+    reducer,
+    waiters,
+)
+
+
+def _version() -> str:
+    try:
+        from importlib.metadata import version  # type: ignore
+    except ImportError:  # pragma: no cover - python 3.7
+        return 'unknown'
+
+    try:
+        return str(version('async_reduce'))
+    except Exception:
+        return 'unknown'
+
+
+def _load(path: Optional[str]) -> Dict[str, float]:
+    if not path:
+        return {}
+
+    with open(path) as f:
+        data = json.load(f)
+
+    return {
+        '{}: {}'.format(res['benchmark'], res['name']): res['value']
+        for res in data['results']
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog='python -m async_reduce.bench',
+        description='Benchmarks of async_reduce',
+    )
+    parser.add_argument(
+        'benchmarks',
+        nargs='*',
+        metavar='BENCHMARK',
+        help='names of benchmarks to run (all by default)',
+    )
+    parser.add_argument('--list', action='store_true', help='list benchmarks')
+    parser.add_argument('--json', metavar='FILE', help='save results to file')
+    parser.add_argument(
+        '--compare', metavar='FILE', help='compare with saved results'
+    )
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, func in BENCHMARKS.items():
+            doc = ' '.join((func.__doc__ or '').split())
+            print('{}: {}'.format(name, doc))
+        return
+
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error('unknown benchmarks: {}'.format(', '.join(unknown)))
+
+    previous = _load(args.compare)
+    results: List[Dict[str, Any]] = []
+
+    for name in args.benchmarks or BENCHMARKS:
+        for measurement, value, unit in BENCHMARKS[name]():
+            key = '{}: {}'.format(name, measurement)
+            line = '{} = {:.3f} {}'.format(key, value, unit)
+
+            if key in previous:
+                prev = previous[key]
+                change = (value - prev) / prev * 100 if prev else 0.0
+                line += ' (was {:.3f}, {:+.1f}%)'.format(prev, change)
+
+            print(line, flush=True)
+            results.append(
+                {
+                    'benchmark': name,
+                    'name': measurement,
+                    'value': value,
+                    'unit': unit,
+                }
+            )
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(
+                {
+                    'meta': {
+                        'version': _version(),
+                        'python': platform.python_version(),
+                        'implementation': platform.python_implementation(),
+                        'platform': platform.platform(),
+                    },
+                    'results': results,
+                },
+                f,
+                indent=2,
+            )
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
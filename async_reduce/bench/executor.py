@@ -0,0 +1,45 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Tuple
+
+from async_reduce import AsyncReducer
+from async_reduce.bench import benchmark, best_time
+
+CALLS = 100
+WORKERS = 4
+
+
+def query(arg: int) -> int:
+    time.sleep(0.01)
+    return arg
+
+
+@benchmark
+def executor() -> Iterator[Tuple[str, float, str]]:
+    """
+    Time of simultaneous blocking calls with few distinct arguments in
+    thread pool executor.
+    """
+    with ThreadPoolExecutor(WORKERS) as pool:
+        reducer = AsyncReducer(executor=pool)
+
+        async def plain() -> None:
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(
+                *[
+                    loop.run_in_executor(pool, query, i % WORKERS)
+                    for i in range(CALLS)
+                ]
+            )
+
+        async def reduced() -> None:
+            await asyncio.gather(
+                *[
+                    reducer.run_in_executor(query, i % WORKERS)
+                    for i in range(CALLS)
+                ]
+            )
+
+        for name, func in (('plain', plain), ('reduced', reduced)):
+            yield name, best_time(func, repeat=3) * 1e3, 'ms'
@@ -0,0 +1,54 @@
+import io
+from typing import Iterator, Tuple
+
+from async_reduce.bench import benchmark, time_per_call
+from async_reduce.hooks import (
+    DebugHooks,
+    StatisticsDetailHooks,
+    StatisticsOverallHooks,
+)
+from async_reduce.hooks.base import BaseHooks
+
+
+async def fetch() -> None:
+    pass
+
+
+def _events(hooks: BaseHooks) -> float:
+    coro = fetch()
+    ident = 'fetch'
+    error = RuntimeError()
+
+    def run() -> None:
+        hooks.on_apply_for(coro, ident)
+        hooks.on_executing_for(coro, ident)
+        hooks.on_reducing_for(coro, ident)
+        hooks.on_result_for(coro, ident, None)
+        hooks.on_exception_for(coro, ident, error)
+
+    try:
+        return time_per_call(run, number=2000) / 5
+    finally:
+        coro.close()
+
+
+@benchmark
+def hooks_dispatch() -> Iterator[Tuple[str, float, str]]:
+    """
+    Cost of single hook event.
+    """
+    for name, factory in (
+        ('BaseHooks', BaseHooks),
+        ('DebugHooks', lambda: DebugHooks(io.StringIO())),
+        ('StatisticsOverallHooks', StatisticsOverallHooks),
+        ('StatisticsDetailHooks', StatisticsDetailHooks),
+        (
+            'MultipleHooks',
+            lambda: (
+                DebugHooks(io.StringIO())
+                & StatisticsOverallHooks()
+                & StatisticsDetailHooks()
+            ),
+        ),
+    ):
+        yield name, _events(factory()), 'us/event'
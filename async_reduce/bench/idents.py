@@ -0,0 +1,52 @@
+from typing import Iterator, Tuple
+
+from async_reduce import AsyncReducer
+from async_reduce.aux import get_coroutine_function_location, render_ident
+from async_reduce.bench import benchmark, time_per_call
+from async_reduce.fingerprint import fingerprint
+
+
+async def fetch(user_id: int, fields: Tuple[str, ...], *, full: bool) -> None:
+    pass
+
+
+@benchmark
+def idents() -> Iterator[Tuple[str, float, str]]:
+    """
+    Cost of calculation of identity for coroutine.
+    """
+    coro = fetch(42, ('name', 'email'), full=True)
+
+    # reducers are created once, so only calculation of identity is measured
+    auto_ident = AsyncReducer()._auto_ident
+    auto_ident_fingerprint = AsyncReducer(fingerprint=fingerprint)._auto_ident
+
+    yield (
+        'get_coroutine_function_location',
+        time_per_call(lambda: get_coroutine_function_location(coro)),
+        'us/call',
+    )
+    yield ('auto_ident', time_per_call(lambda: auto_ident(coro)), 'us/call')
+    yield (
+        'auto_ident_render',
+        time_per_call(lambda: render_ident(auto_ident(coro))),
+        'us/call',
+    )
+    yield (
+        'auto_ident_fingerprint',
+        time_per_call(lambda: auto_ident_fingerprint(coro)),
+        'us/call',
+    )
+
+    args = (42, ('name', 'email'), True)
+    yield ('hash', time_per_call(lambda: hash(args)), 'us/call')
+    yield ('fingerprint', time_per_call(lambda: fingerprint(args)), 'us/call')
+
+    query = {'user_id': 42, 'fields': ['name', 'email'], 'filters': {}}
+    yield (
+        'fingerprint_dict',
+        time_per_call(lambda: fingerprint(query)),
+        'us/call',
+    )
+
+    coro.close()
@@ -0,0 +1,42 @@
+import asyncio
+from functools import partial
+from typing import Iterator, Tuple
+
+from async_reduce import AsyncReducer, async_reduceable
+from async_reduce.bench import benchmark, best_time
+
+FAN_IN = (1, 10, 100, 1000, 10000)
+
+
+async def fetch(arg: int) -> int:
+    await asyncio.sleep(0)
+    return arg
+
+
+@benchmark
+def reduceable_fan_in() -> Iterator[Tuple[str, float, str]]:
+    """
+    Overhead per call of decorated coroutine function for count of
+    simultaneous callers.
+    """
+    reducer = AsyncReducer()
+
+    async def fetch_via_coroutine(arg: int) -> int:
+        # previous behaviour: coroutine is created for each call
+        return await reducer(fetch(arg), factory=partial(fetch, arg))
+
+    fetch_via_key = async_reduceable(reducer)(fetch)
+
+    for fan_in in FAN_IN:
+        for name, func in (
+            ('coroutine', fetch_via_coroutine),
+            ('key', fetch_via_key),
+        ):
+            seconds = best_time(
+                lambda: asyncio.gather(*[func(1) for _ in range(fan_in)])
+            )
+            yield (
+                '{}[fan_in={}]'.format(name, fan_in),
+                seconds / fan_in * 1e6,
+                'us/call',
+            )
@@ -0,0 +1,315 @@
+import asyncio
+import random
+import time
+import tracemalloc
+from typing import Awaitable, Iterator, List, Tuple
+
+from async_reduce import AsyncReducer, RetryPolicy
+from async_reduce.bench import benchmark
+
+CALLS = 10000
+
+
+async def fetch(arg: int) -> int:
+    await asyncio.sleep(0)
+    return arg
+
+
+async def _call_overhead(reduced: bool) -> float:
+    reducer = AsyncReducer()
+    idents = [
+        'fetch' if reduced else 'fetch:{}'.format(i) for i in range(CALLS)
+    ]
+    coros = [fetch(i) for i in range(CALLS)]
+
+    start = time.perf_counter()
+    waiters = [
+        reducer(coro, ident=ident) for coro, ident in zip(coros, idents)
+    ]
+    seconds = time.perf_counter() - start
+
+    await asyncio.gather(*waiters)
+
+    return seconds
+
+
+@benchmark
+def call_overhead() -> Iterator[Tuple[str, float, str]]:
+    """
+    Cost of ``async_reduce(...)`` call (without calculation of identity) for
+    executed and reduced coroutines.
+    """
+    for name, reduced in (('executed', False), ('reduced', True)):
+        seconds = min(
+            asyncio.run(_call_overhead(reduced=reduced)) for _ in range(5)
+        )
+        yield name, seconds / CALLS * 1e6, 'us/call'
+
+
+async def _in_flight_memory(count: int) -> float:
+    reducer = AsyncReducer()
+    coros = [fetch(i) for i in range(count)]
+
+    tracemalloc.start()
+    waiters = [
+        reducer(coro, ident='fetch:{}'.format(i))
+        for i, coro in enumerate(coros)
+    ]
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    await asyncio.gather(*waiters)
+
+    return peak / count
+
+
+@benchmark
+def in_flight_memory() -> Iterator[Tuple[str, float, str]]:
+    """
+    Memory allocated by reducer per ident in flight (without coroutine).
+    """
+    yield 'per_ident', asyncio.run(_in_flight_memory(CALLS)), 'B'
+
+
+async def _auto_ident_memory(count: int) -> Tuple[float, float]:
+    reducer = AsyncReducer()
+    coros = [fetch(i) for i in range(count)]
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    waiters = [reducer(coro) for coro in coros]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    await asyncio.gather(*waiters)
+
+    stats = after.compare_to(before, 'filename')
+    return (
+        sum(stat.count_diff for stat in stats) / count,
+        sum(stat.size_diff for stat in stats) / count,
+    )
+
+
+@benchmark
+def auto_ident_memory() -> Iterator[Tuple[str, float, str]]:
+    """
+    Allocations retained by reducer per coroutine in flight with automatically
+    calculated identity (without coroutine).
+    """
+    blocks, size = asyncio.run(_auto_ident_memory(CALLS))
+
+    yield 'blocks', blocks, 'blocks/call'
+    yield 'size', size, 'B/call'
+
+
+async def _fan_out(reducer: AsyncReducer, keys: int) -> Tuple[float, int]:
+    active = peak = 0
+
+    async def backend(key: int) -> int:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return key
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        *[
+            reducer(backend(key), ident='backend:{}'.format(key))
+            for key in range(keys)
+        ]
+    )
+
+    return time.perf_counter() - start, peak
+
+
+@benchmark
+def fan_out() -> Iterator[Tuple[str, float, str]]:
+    """
+    Peak of simultaneous calls of backend and total time for cold start with
+    10000 distinct keys (of one function).
+    """
+    for name, reducer in (
+        ('unlimited', AsyncReducer()),
+        ('max_concurrency=100', AsyncReducer(max_concurrency=100)),
+        (
+            'max_concurrency_per_function=100',
+            AsyncReducer(max_concurrency_per_function=100),
+        ),
+    ):
+        seconds, peak = asyncio.run(_fan_out(reducer, 10000))
+
+        yield '{}:peak'.format(name), peak, 'calls'
+        yield '{}:time'.format(name), seconds * 1e3, 'ms'
+
+
+async def _throughput(
+    requests: int, keys: int, reducer: AsyncReducer
+) -> Tuple[float, List[float], int]:
+    rnd = random.Random(42)
+    latencies: List[float] = []
+    backend_calls = 0
+
+    async def backend(key: int) -> int:
+        nonlocal backend_calls
+        backend_calls += 1
+
+        # latency with median ~10ms and long tail
+        await asyncio.sleep(min(rnd.lognormvariate(-4.6, 0.5), 0.2))
+        return key
+
+    async def client(key: int, delay: float) -> None:
+        await asyncio.sleep(delay)
+
+        start = time.perf_counter()
+        await reducer(backend(key), ident='backend:{}'.format(key))
+        latencies.append(time.perf_counter() - start)
+
+    # hot keys are requested more often
+    clients: List[Awaitable[None]] = [
+        client(min(int(rnd.paretovariate(1)), keys), rnd.uniform(0, 1))
+        for _ in range(requests)
+    ]
+
+    start = time.perf_counter()
+    await asyncio.gather(*clients)
+    seconds = time.perf_counter() - start
+
+    return requests / seconds, sorted(latencies), backend_calls
+
+
+@benchmark
+def throughput() -> Iterator[Tuple[str, float, str]]:
+    """
+    Throughput and latency of clients randomly requesting simulated backend
+    with long tail latency during 1 second, and share of requests passed to
+    the backend.
+    """
+    requests = 5000
+
+    for name, reducer in (
+        ('ttl=None', AsyncReducer()),
+        ('ttl=0.1', AsyncReducer(ttl=0.1)),
+    ):
+        rps, latencies, backend_calls = asyncio.run(
+            _throughput(requests, keys=1000, reducer=reducer)
+        )
+
+        yield '{}:clients'.format(name), rps, 'req/s'
+        yield (
+            '{}:latency_p50'.format(name),
+            latencies[len(latencies) // 2] * 1e3,
+            'ms',
+        )
+        yield (
+            '{}:latency_p99'.format(name),
+            latencies[len(latencies) * 99 // 100] * 1e3,
+            'ms',
+        )
+        yield (
+            '{}:backend_calls'.format(name),
+            backend_calls / requests * 100,
+            '%',
+        )
+
+
+async def _hedging(
+    requests: int, reducer: AsyncReducer
+) -> Tuple[List[float], int]:
+    rnd = random.Random(42)
+    latencies: List[float] = []
+    backend_calls = 0
+
+    async def backend(key: int) -> int:
+        nonlocal backend_calls
+        backend_calls += 1
+
+        # every 20th call lands on slow replica
+        await asyncio.sleep(0.1 if rnd.random() < 0.05 else 0.005)
+        return key
+
+    async def client(key: int, delay: float) -> None:
+        await asyncio.sleep(delay)
+
+        start = time.perf_counter()
+        await reducer.apply(
+            lambda: backend(key), ident='backend:{}'.format(key)
+        )
+        latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(
+        *[client(key, rnd.uniform(0, 1)) for key in range(requests)]
+    )
+
+    return sorted(latencies), backend_calls
+
+
+@benchmark
+def hedging() -> Iterator[Tuple[str, float, str]]:
+    """
+    Latency of requests to simulated backend with slow replica during 1
+    second, and count of calls of the backend per request.
+    """
+    requests = 1000
+
+    for name, reducer in (
+        ('no_hedge', AsyncReducer()),
+        ('hedge_delay=0.02', AsyncReducer(hedge_delay=0.02)),
+        ('hedge_percentile=0.9', AsyncReducer(hedge_percentile=0.9)),
+    ):
+        latencies, backend_calls = asyncio.run(_hedging(requests, reducer))
+
+        yield (
+            '{}:latency_p50'.format(name),
+            latencies[len(latencies) // 2] * 1e3,
+            'ms',
+        )
+        yield (
+            '{}:latency_p99'.format(name),
+            latencies[int(len(latencies) * 0.99)] * 1e3,
+            'ms',
+        )
+        yield '{}:backend'.format(name), backend_calls / requests, 'calls/req'
+
+
+async def _retries(callers: int, coalesced: bool) -> int:
+    policy = RetryPolicy(max_attempts=5, backoff=0.01)
+    reducer = AsyncReducer(retry=policy if coalesced else None)
+    recovered = time.perf_counter() + 0.05
+    backend_calls = 0
+
+    async def backend() -> None:
+        nonlocal backend_calls
+        backend_calls += 1
+
+        await asyncio.sleep(0.001)
+        if time.perf_counter() < recovered:
+            raise ConnectionError
+
+    async def client() -> None:
+        if coalesced:
+            await reducer.apply(backend, ident='backend')
+            return
+
+        # each caller retries by itself
+        for attempt in range(1, policy.max_attempts + 1):
+            try:
+                await reducer.apply(backend, ident='backend')
+                return
+            except ConnectionError:
+                await asyncio.sleep(policy.delay(attempt))
+
+    await asyncio.gather(*[client() for _ in range(callers)])
+
+    return backend_calls
+
+
+@benchmark
+def retries() -> Iterator[Tuple[str, float, str]]:
+    """
+    Calls of backend by 1000 callers of the same key during 50ms outage of
+    the backend.
+    """
+    for name, coalesced in (('callers', False), ('coalesced', True)):
+        yield name, asyncio.run(_retries(1000, coalesced)), 'calls'
@@ -0,0 +1,49 @@
+import asyncio
+import time
+import tracemalloc
+from typing import Iterator, Tuple
+
+from async_reduce import AsyncReducer
+from async_reduce.bench import benchmark
+
+WAITERS = (1000, 10000, 100000)
+
+
+async def fetch() -> str:
+    await asyncio.sleep(0)
+    return 'result'
+
+
+async def _run(count: int, trace: bool) -> float:
+    """
+    Get seconds to resolve ``count`` waiters or peak of memory allocated by
+    them in bytes if ``trace``.
+    """
+    reducer = AsyncReducer()
+
+    if trace:
+        tracemalloc.start()
+
+    start = time.perf_counter()
+    waiters = [reducer.apply(fetch, ident='fetch') for _ in range(count)]
+
+    if trace:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    await asyncio.gather(*waiters)
+
+    return peak if trace else time.perf_counter() - start
+
+
+@benchmark
+def waiters() -> Iterator[Tuple[str, float, str]]:
+    """
+    Cost of waiters for single ident.
+    """
+    for count in WAITERS:
+        seconds = min(asyncio.run(_run(count, False)) for _ in range(3))
+        peak = asyncio.run(_run(count, True))
+
+        yield 'time[waiters={}]'.format(count), seconds / count * 1e6, 'us'
+        yield 'memory[waiters={}]'.format(count), peak / count, 'B'
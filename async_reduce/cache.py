@@ -0,0 +1,124 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+from async_reduce.flight import Flight
+
+
+class CacheEntry:
+    __slots__ = ('flight', 'expires_at', 'stale_until', 'hits', 'timer')
+
+    def __init__(
+        self, flight: Flight, expires_at: float, stale_until: float
+    ) -> None:
+        self.flight = flight
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+        self.hits = 0
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+    def discard(self) -> None:
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+
+class ResultCache:
+    """
+    Bounded storage for settled executions of aggregated coroutines.
+
+    Each entry is fresh until its expiration time and then may be stale for
+    a grace period; when the storage is full the least recently used entry is
+    evicted.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        if maxsize < 1:
+            raise ValueError('maxsize must be positive')
+
+        self.maxsize = maxsize
+        self._entries: 'OrderedDict[Hashable, CacheEntry]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, ident: Hashable) -> bool:
+        return self.get(ident) is not None
+
+    def get(self, ident: Hashable) -> Optional[Flight]:
+        """
+        Get settled execution for ``ident`` if it is not expired yet.
+        """
+        flight, stale = self.lookup(ident)
+        if stale:
+            return None
+
+        return flight
+
+    def peek(self, ident: Hashable) -> Optional[CacheEntry]:
+        """
+        Get fresh or stale entry for ``ident`` without counting of hit.
+        """
+        entry = self._entries.get(ident, None)
+        if entry is None or entry.stale_until <= time.monotonic():
+            return None
+
+        return entry
+
+    def lookup(self, ident: Hashable) -> Tuple[Optional[Flight], bool]:
+        """
+        Get settled execution for ``ident`` and flag that it is stale.
+
+        Each successful lookup is counted as hit of entry.
+        """
+        entry = self._entries.get(ident, None)
+        if entry is None:
+            return None, False
+
+        now = time.monotonic()
+        if entry.stale_until <= now:
+            del self._entries[ident]
+            entry.discard()
+            return None, False
+
+        self._entries.move_to_end(ident)
+        entry.hits += 1
+        return entry.flight, entry.expires_at <= now
+
+    def set(
+        self,
+        ident: Hashable,
+        flight: Flight,
+        ttl: float,
+        stale_ttl: float = 0,
+    ) -> CacheEntry:
+        """
+        Store settled execution for ``ident`` on ``ttl`` seconds and keep it
+        as stale for next ``stale_ttl`` seconds.
+        """
+        expires_at = time.monotonic() + ttl
+        entry = CacheEntry(flight, expires_at, expires_at + stale_ttl)
+
+        self.pop(ident)
+        self._entries[ident] = entry
+
+        while len(self._entries) > self.maxsize:
+            _, evicted = self._entries.popitem(last=False)
+            evicted.discard()
+
+        return entry
+
+    def pop(self, ident: Hashable) -> None:
+        """
+        Drop entry for ``ident`` if exists.
+        """
+        entry = self._entries.pop(ident, None)
+        if entry is not None:
+            entry.discard()
+
+    def clear(self) -> None:
+        for entry in self._entries.values():
+            entry.discard()
+
+        self._entries.clear()
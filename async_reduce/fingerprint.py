@@ -0,0 +1,270 @@
+import dataclasses
+import hashlib
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class Fingerprint:
+    """
+    Stable fingerprint of arguments which is the same in all processes (in
+    contrast to built-in ``hash()`` which depends on ``PYTHONHASHSEED``).
+
+    Arguments are encoded to canonical bytes and hashed by keyed BLAKE2b.
+    Supported types are ``None``, ``bool``, ``int``, ``float``, ``complex``,
+    ``str``, ``bytes``, ``tuple``, ``list``, ``dict``, ``set``,
+    ``frozenset``, ``Enum`` members, dataclasses, pydantic and attrs models
+    and types registered by :func:`register` (and subclasses of all of them),
+    otherwise ``TypeError`` is raised.
+
+    :param key: key of digest to make fingerprints unpredictable for others
+    :param digest_size: size of digest in bytes (up to 64)
+    :param max_depth: max nesting of containers
+    :param max_size: max count of objects in arguments
+    :param fallback_hash: use built-in ``hash()`` for other hashable objects,
+        fingerprints are not stable between processes then
+
+    Example:
+
+        from async_reduce.fingerprint import fingerprint
+
+        async_reduce = AsyncReducer(fingerprint=fingerprint)
+    """
+
+    def __init__(
+        self,
+        key: bytes = b'',
+        digest_size: int = 16,
+        *,
+        max_depth: int = 32,
+        max_size: int = 10000,
+        fallback_hash: bool = False
+    ) -> None:
+        self._key = key
+        self._digest_size = digest_size
+        self._max_depth = max_depth
+        self._max_size = max_size
+        self._fallback_hash = fallback_hash
+
+    def __call__(self, obj: Any) -> str:
+        encoder = _Encoder(
+            self._max_depth, self._max_size, self._fallback_hash
+        )
+        encoder.encode(obj, 0)
+
+        return hashlib.blake2b(
+            b''.join(encoder.parts),
+            key=self._key,
+            digest_size=self._digest_size,
+        ).hexdigest()
+
+
+def register(cls: type, converter: Callable[[Any], Any]) -> None:
+    """
+    Register function to convert objects of ``cls`` (and its subclasses) to
+    supported value for fingerprint.
+
+    Example:
+
+        register(Decimal, str)
+        register(MyModel, lambda obj: obj.id)
+    """
+    _CONVERTERS[cls] = converter
+
+
+_CONVERTERS: Dict[type, Callable[[Any], Any]] = {}
+
+
+class _Encoder:
+    __slots__ = ('parts', 'size', 'max_depth', 'max_size', 'fallback_hash')
+
+    def __init__(
+        self, max_depth: int, max_size: int, fallback_hash: bool
+    ) -> None:
+        self.parts: List[bytes] = []
+        self.size = 0
+        self.max_depth = max_depth
+        self.max_size = max_size
+        self.fallback_hash = fallback_hash
+
+    def encode(self, obj: Any, depth: int) -> None:
+        self.size += 1
+        if self.size > self.max_size:
+            raise TypeError(
+                'Unable to fingerprint object with more than {} items'.format(
+                    self.max_size
+                )
+            )
+
+        if depth > self.max_depth:
+            raise TypeError(
+                'Unable to fingerprint object nested deeper than {}'.format(
+                    self.max_depth
+                )
+            )
+
+        method = _METHODS.get(type(obj))
+        if method is None:
+            self.encode_other(obj, depth)
+        else:
+            method(self, obj, depth)
+
+    def encoded(self, obj: Any, depth: int) -> bytes:
+        parts, self.parts = self.parts, []
+        self.encode(obj, depth)
+        parts, self.parts = self.parts, parts
+
+        return b''.join(parts)
+
+    def encode_none(self, obj: None, depth: int) -> None:
+        self.parts.append(b'n')
+
+    def encode_bool(self, obj: bool, depth: int) -> None:
+        self.parts.append(b'T' if obj else b'F')
+
+    def encode_int(self, obj: int, depth: int) -> None:
+        self.parts.append(b'i%d;' % obj)
+
+    def encode_float(self, obj: float, depth: int) -> None:
+        self.parts.append(b'f%s;' % float.hex(obj).encode())
+
+    def encode_complex(self, obj: complex, depth: int) -> None:
+        self.parts.append(
+            b'c%s,%s;'
+            % (float.hex(obj.real).encode(), float.hex(obj.imag).encode())
+        )
+
+    def encode_str(self, obj: str, depth: int) -> None:
+        data = str.encode(obj, 'utf-8', 'surrogatepass')
+        self.parts.append(b's%d:' % len(data))
+        self.parts.append(data)
+
+    def encode_bytes(self, obj: bytes, depth: int) -> None:
+        self.parts.append(b'b%d:' % len(obj))
+        self.parts.append(bytes(obj))
+
+    def encode_tuple(self, obj: tuple, depth: int) -> None:
+        self.parts.append(b't%d:' % len(obj))
+        for item in obj:
+            self.encode(item, depth + 1)
+
+    def encode_list(self, obj: list, depth: int) -> None:
+        self.parts.append(b'l%d:' % len(obj))
+        for item in obj:
+            self.encode(item, depth + 1)
+
+    def encode_set(self, obj: frozenset, depth: int) -> None:
+        # order of items in set depends on their hashes, so sort encodings
+        items = sorted(self.encoded(item, depth + 1) for item in obj)
+
+        self.parts.append(b'z%d:' % len(items))
+        self.parts.extend(items)
+
+    def encode_dict(self, obj: dict, depth: int) -> None:
+        self.parts.append(b'd%d:' % len(obj))
+
+        if all(type(key) is str for key in obj):
+            # fast path: sort string keys without encoding them separately
+            for key in sorted(obj, key=_utf8):
+                self.encode(key, depth + 1)
+                self.encode(obj[key], depth + 1)
+            return
+
+        self.parts.extend(
+            sorted(
+                self.encoded(key, depth + 1) + self.encoded(value, depth + 1)
+                for key, value in obj.items()
+            )
+        )
+
+    def encode_other(self, obj: Any, depth: int) -> None:
+        cls: Any = type(obj)
+
+        if isinstance(obj, Enum):
+            self.parts.append(b'e')
+            self.encode_str(_qualname(cls) + '.' + obj.name, depth)
+            return
+
+        for base in cls.__mro__:
+            converter = _CONVERTERS.get(base)
+            if converter is not None:
+                self.encode_typed(cls, converter(obj), depth)
+                return
+
+        fields = _fields(cls)
+        if fields is not None:
+            values = tuple(getattr(obj, name) for name in fields)
+            self.encode_typed(cls, values, depth)
+            return
+
+        for base in cls.__mro__[1:]:
+            method = _METHODS.get(base)
+            if method is not None:
+                method(self, obj, depth)
+                return
+
+        if self.fallback_hash:
+            self.parts.append(b'h%d;' % hash(obj))
+            return
+
+        raise TypeError(
+            'Unable to fingerprint object of type {!r}'.format(
+                cls.__qualname__
+            )
+        )
+
+    def encode_typed(self, cls: type, value: Any, depth: int) -> None:
+        self.parts.append(b'o')
+        self.encode_str(_qualname(cls), depth)
+        self.encode(value, depth + 1)
+
+
+def _utf8(string: str) -> bytes:
+    return string.encode('utf-8', 'surrogatepass')
+
+
+def _qualname(cls: type) -> str:
+    return '{}:{}'.format(cls.__module__, cls.__qualname__)
+
+
+@lru_cache(maxsize=1024)
+def _fields(cls: type) -> Optional[Tuple[str, ...]]:
+    """
+    Names of fields of dataclasses, pydantic and attrs models.
+    """
+    if dataclasses.is_dataclass(cls):
+        return tuple(
+            field.name for field in dataclasses.fields(cls) if field.compare
+        )
+
+    # pydantic v2 and v1
+    fields = getattr(cls, 'model_fields', None)
+    if fields is None:
+        fields = getattr(cls, '__fields__', None)
+
+    if isinstance(fields, dict):
+        return tuple(fields)
+
+    attributes = getattr(cls, '__attrs_attrs__', None)
+    if attributes is not None:
+        return tuple(attribute.name for attribute in attributes)
+
+    return None
+
+
+_METHODS: Dict[type, Callable[[_Encoder, Any, int], None]] = {
+    type(None): _Encoder.encode_none,
+    bool: _Encoder.encode_bool,
+    int: _Encoder.encode_int,
+    float: _Encoder.encode_float,
+    complex: _Encoder.encode_complex,
+    str: _Encoder.encode_str,
+    bytes: _Encoder.encode_bytes,
+    tuple: _Encoder.encode_tuple,
+    list: _Encoder.encode_list,
+    set: _Encoder.encode_set,
+    frozenset: _Encoder.encode_set,
+    dict: _Encoder.encode_dict,
+}
+
+fingerprint = Fingerprint()
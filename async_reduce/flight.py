@@ -0,0 +1,76 @@
+import asyncio
+from contextlib import suppress
+from typing import Any, List, Optional
+
+
+class Flight:
+    """
+    Single execution of coroutine shared by its waiters.
+
+    Each waiter is a separate future, so cancelling of one waiter does not
+    affect others, and all waiters are resolved in one pass when the
+    execution is settled. Waiters of other event loops (e.g. in other
+    threads) are resolved in their loops via ``call_soon_threadsafe()``.
+
+    Flight is not synchronized itself, its owner must serialize adding of
+    waiters and settling of the execution between threads.
+    """
+
+    __slots__ = ('waiters', 'done', 'result', 'exception', 'task', 'waiting')
+
+    def __init__(self) -> None:
+        self.waiters: List[asyncio.Future] = []
+        self.done = False
+        self.result: Any = None
+        self.exception: Optional[BaseException] = None
+        # task of execution and count of its live waiters (if it is tracked)
+        self.task: Optional[asyncio.Task] = None
+        self.waiting = 0
+
+    def add_waiter(self) -> asyncio.Future:
+        """
+        Get new future (of current event loop) which will get result of
+        execution.
+        """
+        waiter: asyncio.Future = asyncio.Future()
+
+        if self.done:
+            self._settle(waiter)
+        else:
+            self.waiters.append(waiter)
+
+        return waiter
+
+    def set_result(self, result: Any) -> None:
+        self.done = True
+        self.result = result
+        self._settle_waiters()
+
+    def set_exception(self, exception: BaseException) -> None:
+        self.done = True
+        self.exception = exception
+        self._settle_waiters()
+
+    def _settle_waiters(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        for waiter in self.waiters:
+            waiter_loop = waiter.get_loop()
+
+            if waiter_loop is loop:
+                self._settle(waiter)
+            else:
+                # nobody waits in closed loop anymore
+                with suppress(RuntimeError):
+                    waiter_loop.call_soon_threadsafe(self._settle, waiter)
+
+        self.waiters = []
+
+    def _settle(self, waiter: asyncio.Future) -> None:
+        if waiter.done():
+            return
+
+        if self.exception is not None:
+            waiter.set_exception(self.exception)
+        else:
+            waiter.set_result(self.result)
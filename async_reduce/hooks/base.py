@@ -43,6 +43,66 @@ class BaseHooks:
         Calls when aggregated coroutine raises exception.
         """
 
+    def on_abandoned_for(
+        self, coro: Coroutine[Any, Any, Any], ident: str
+    ) -> None:
+        """
+        Calls when all waiters of aggregated coroutine are cancelled before
+        its completion, ``coro`` is coroutine of the last of them.
+        """
+
+    def on_throttled_for(
+        self, coro: Coroutine[Any, Any, Any], ident: str, delay: float
+    ) -> None:
+        """
+        Calls when start of aggregated coroutine is delayed for ``delay``
+        seconds by rate limits.
+        """
+
+    def on_rejected_for(
+        self,
+        coro: Coroutine[Any, Any, Any],
+        ident: str,
+        exception: Exception,
+    ) -> None:
+        """
+        Calls when coroutine is rejected by load limits, ``exception`` is
+        raised for its waiters.
+        """
+
+    def on_hedged_for(
+        self, coro: Coroutine[Any, Any, Any], ident: str, delay: float
+    ) -> None:
+        """
+        Calls when second attempt ``coro`` of aggregated coroutine is started
+        because the first one is executed longer than ``delay`` seconds.
+        """
+
+    def on_hedge_settled_for(
+        self,
+        coro: Coroutine[Any, Any, Any],
+        ident: str,
+        loser: Coroutine[Any, Any, Any],
+    ) -> None:
+        """
+        Calls when attempt ``coro`` of hedged aggregated coroutine wins with
+        successful result, other attempt ``loser`` is cancelled (if it is
+        still running).
+        """
+
+    def on_retry_for(
+        self,
+        coro: Coroutine[Any, Any, Any],
+        ident: str,
+        attempt: int,
+        exception: Exception,
+        delay: float,
+    ) -> None:
+        """
+        Calls when aggregated coroutine failed at ``attempt`` with
+        ``exception`` and it will be retried after ``delay`` seconds.
+        """
+
     def __and__(self, other: 'BaseHooks') -> 'MultipleHooks':
         if isinstance(other, MultipleHooks):
             return other & self
@@ -102,3 +162,50 @@ class MultipleHooks(BaseHooks):
     ) -> None:
         for hooks in self.hooks_list:
             hooks.on_exception_for(coro, ident, exception)
+
+    def on_abandoned_for(
+        self, coro: Coroutine[Any, Any, Any], ident: str
+    ) -> None:
+        for hooks in self.hooks_list:
+            hooks.on_abandoned_for(coro, ident)
+
+    def on_throttled_for(
+        self, coro: Coroutine[Any, Any, Any], ident: str, delay: float
+    ) -> None:
+        for hooks in self.hooks_list:
+            hooks.on_throttled_for(coro, ident, delay)
+
+    def on_rejected_for(
+        self,
+        coro: Coroutine[Any, Any, Any],
+        ident: str,
+        exception: Exception,
+    ) -> None:
+        for hooks in self.hooks_list:
+            hooks.on_rejected_for(coro, ident, exception)
+
+    def on_hedged_for(
+        self, coro: Coroutine[Any, Any, Any], ident: str, delay: float
+    ) -> None:
+        for hooks in self.hooks_list:
+            hooks.on_hedged_for(coro, ident, delay)
+
+    def on_hedge_settled_for(
+        self,
+        coro: Coroutine[Any, Any, Any],
+        ident: str,
+        loser: Coroutine[Any, Any, Any],
+    ) -> None:
+        for hooks in self.hooks_list:
+            hooks.on_hedge_settled_for(coro, ident, loser)
+
+    def on_retry_for(
+        self,
+        coro: Coroutine[Any, Any, Any],
+        ident: str,
+        attempt: int,
+        exception: Exception,
+        delay: float,
+    ) -> None:
+        for hooks in self.hooks_list:
+            hooks.on_retry_for(coro, ident, attempt, exception, delay)
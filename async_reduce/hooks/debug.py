@@ -47,3 +47,61 @@ class DebugHooks(BaseHooks):
             '[{}] get exception for {}: {}'.format(ident, coro, exception),
             file=self._steam,
         )
+
+    def on_abandoned_for(
+        self, coro: Coroutine[Any, Any, Any], ident: str
+    ) -> None:
+        print('[{}] abandoned by {}'.format(ident, coro), file=self._steam)
+
+    def on_throttled_for(
+        self, coro: Coroutine[Any, Any, Any], ident: str, delay: float
+    ) -> None:
+        print(
+            '[{}] throttled for {:.3f}s {}'.format(ident, delay, coro),
+            file=self._steam,
+        )
+
+    def on_rejected_for(
+        self,
+        coro: Coroutine[Any, Any, Any],
+        ident: str,
+        exception: Exception,
+    ) -> None:
+        print(
+            '[{}] rejected {}: {}'.format(ident, coro, exception),
+            file=self._steam,
+        )
+
+    def on_hedged_for(
+        self, coro: Coroutine[Any, Any, Any], ident: str, delay: float
+    ) -> None:
+        print(
+            '[{}] hedged after {:.3f}s by {}'.format(ident, delay, coro),
+            file=self._steam,
+        )
+
+    def on_hedge_settled_for(
+        self,
+        coro: Coroutine[Any, Any, Any],
+        ident: str,
+        loser: Coroutine[Any, Any, Any],
+    ) -> None:
+        print(
+            '[{}] hedge won by {}, lost by {}'.format(ident, coro, loser),
+            file=self._steam,
+        )
+
+    def on_retry_for(
+        self,
+        coro: Coroutine[Any, Any, Any],
+        ident: str,
+        attempt: int,
+        exception: Exception,
+        delay: float,
+    ) -> None:
+        print(
+            '[{}] retry after {:.3f}s of attempt {} for {}: {}'.format(
+                ident, delay, attempt, coro, exception
+            ),
+            file=self._steam,
+        )
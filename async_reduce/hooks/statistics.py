@@ -1,7 +1,11 @@
 from asyncio import CancelledError
+from functools import partial
 from typing import Any, Coroutine, Counter, Union
 
-from async_reduce.aux import get_coroutine_function_location
+from async_reduce.aux import (
+    get_coroutine_function_location,
+    get_function_location,
+)
 from async_reduce.hooks.base import BaseHooks
 
 
@@ -82,17 +86,17 @@ class StatisticsDetailHooks(BaseHooks):
         )
 
     def on_apply_for(self, coro: Coroutine[Any, Any, Any], ident: str) -> None:
-        self.total[get_coroutine_function_location(coro)] += 1
+        self.total[_location(coro)] += 1
 
     def on_executing_for(
         self, coro: Coroutine[Any, Any, Any], ident: str
     ) -> None:
-        self.executed[get_coroutine_function_location(coro)] += 1
+        self.executed[_location(coro)] += 1
 
     def on_reducing_for(
         self, coro: Coroutine[Any, Any, Any], ident: str
     ) -> None:
-        self.reduced[get_coroutine_function_location(coro)] += 1
+        self.reduced[_location(coro)] += 1
 
     def on_exception_for(
         self,
@@ -100,4 +104,12 @@ class StatisticsDetailHooks(BaseHooks):
         ident: str,
         exception: Union[Exception, CancelledError],
     ) -> None:
-        self.errors[get_coroutine_function_location(coro)] += 1
+        self.errors[_location(coro)] += 1
+
+
+def _location(coro: Coroutine[Any, Any, Any]) -> str:
+    # ``ThreadReducer`` triggers hooks for calls instead of coroutines
+    if isinstance(coro, partial):
+        return get_function_location(coro.func)
+
+    return get_coroutine_function_location(coro)
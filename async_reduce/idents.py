@@ -0,0 +1,46 @@
+"""
+Policies of identity of ``self`` for automatically calculated idents of
+methods, use them as ``self_ident`` of ``AsyncReducer`` and
+``@async_reduceable()``. Any function of instance can be used as a policy
+too, e.g. ``operator.attrgetter('base_url')``.
+"""
+import itertools
+import weakref
+from functools import partial
+from typing import Any, Dict, Tuple
+
+_tokens: Dict[int, Tuple[weakref.ref, int]] = {}
+_counter = itertools.count()
+
+
+def ignore_self(obj: Any) -> None:
+    """
+    Ignore instance, so calls of method of all instances with same arguments
+    are reduced.
+    """
+    return None
+
+
+def by_identity(obj: Any) -> int:
+    """
+    Token of instance which is unique during its life (unlike ``id()`` which
+    can be reused by other object after garbage collection), so only calls of
+    method of the same instance are reduced. Instance must support weak
+    references but may be unhashable.
+    """
+    key = id(obj)
+
+    entry = _tokens.get(key)
+    if entry is not None and entry[0]() is obj:
+        return entry[1]
+
+    token = next(_counter)
+    _tokens[key] = (weakref.ref(obj, partial(_forget, key)), token)
+
+    return token
+
+
+def _forget(key: int, ref: weakref.ref) -> None:
+    entry = _tokens.get(key)
+    if entry is not None and entry[0] is ref:
+        del _tokens[key]
@@ -0,0 +1,43 @@
+import threading
+from collections import deque
+from typing import Deque, Dict, Hashable, Optional
+
+
+class LatencyWindow:
+    """
+    Durations of the latest executions per key (e.g. function of coroutine)
+    to estimate their percentiles.
+
+    Window is thread-safe.
+
+    :param size: count of the latest durations kept for each key
+    :param min_samples: min count of durations to estimate percentile
+    """
+
+    def __init__(self, size: int = 100, min_samples: int = 10) -> None:
+        self.size = size
+        self.min_samples = min_samples
+        self._durations: Dict[Hashable, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, key: Hashable, duration: float) -> None:
+        with self._lock:
+            durations = self._durations.get(key)
+            if durations is None:
+                durations = self._durations[key] = deque(maxlen=self.size)
+
+            durations.append(duration)
+
+    def percentile(self, key: Hashable, q: float) -> Optional[float]:
+        """
+        Duration which is not exceeded by ``q`` part (between 0 and 1) of the
+        latest executions of ``key`` or ``None`` if they are not enough.
+        """
+        with self._lock:
+            durations = self._durations.get(key)
+            if durations is None or len(durations) < self.min_samples:
+                return None
+
+            ordered = sorted(durations)
+
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
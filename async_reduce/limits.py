@@ -0,0 +1,309 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, Counter, Dict, Hashable, List, Optional
+
+
+class Overloaded(Exception):
+    """
+    Coroutine is rejected by load limits of reducer.
+    """
+
+
+class _Pending:
+    __slots__ = ('priority', 'order', 'key', 'waiter', 'granted')
+
+    def __init__(
+        self,
+        priority: float,
+        order: int,
+        key: Hashable,
+        waiter: asyncio.Future,
+    ) -> None:
+        self.priority = priority
+        self.order = order
+        self.key = key
+        self.waiter = waiter
+        self.granted = False
+
+    def __lt__(self, other: '_Pending') -> bool:
+        return (self.priority, self.order) < (other.priority, other.order)
+
+
+class ConcurrencyLimiter:
+    """
+    Limit of simultaneous executions in total and per key (e.g. function of
+    coroutine) with queue of pending executions.
+
+    Pending executions are started in order of priority (lower value first)
+    and then in order of arrival. Pending execution of key with exhausted
+    limit does not block executions of other keys: pending executions are
+    queued per key and only heads of queues of keys with free place are
+    ready to start, so release touches only keys which can be started.
+
+    Limiter is thread-safe, executions may wait in different event loops.
+
+    :param limit: max count of simultaneous executions
+    :param per_key: max count of simultaneous executions of the same key
+    """
+
+    def __init__(
+        self, limit: Optional[int] = None, per_key: Optional[int] = None
+    ) -> None:
+        if any(value is not None and value < 1 for value in (limit, per_key)):
+            raise ValueError('limits must be positive')
+
+        self.limit = limit
+        self.per_key = per_key
+        self.active = 0
+        self._active_per_key: Counter[Hashable] = Counter()
+        self._queues: Dict[Hashable, List[_Pending]] = {}
+        self._ready: List[_Pending] = []
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+
+    async def acquire(
+        self,
+        key: Hashable,
+        priority: float = 0,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Wait until execution of ``key`` is allowed.
+
+        :param timeout: max time of waiting in queue, then
+            ``asyncio.TimeoutError`` is raised
+        """
+        with self._lock:
+            if self._allowed(key):
+                self._take(key)
+                return
+
+            pending = _Pending(
+                priority,
+                next(self._order),
+                key,
+                asyncio.get_running_loop().create_future(),
+            )
+            queue = self._queues.setdefault(key, [])
+            heapq.heappush(queue, pending)
+            if queue[0] is pending and self._has_room(key):
+                heapq.heappush(self._ready, pending)
+
+        try:
+            await asyncio.wait_for(pending.waiter, timeout)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            # not allowed pending execution is dropped from queue lazily
+            with self._lock:
+                if pending.granted:
+                    # execution was allowed meanwhile, pass it to next one
+                    self._release(key)
+            raise
+
+    def try_acquire(self, key: Hashable) -> bool:
+        """
+        Take place for execution of ``key`` without waiting, returns false if
+        the execution is not allowed right now.
+        """
+        with self._lock:
+            if not self._allowed(key):
+                return False
+
+            self._take(key)
+            return True
+
+    def release(self, key: Hashable) -> None:
+        """
+        Finish execution of ``key`` and start pending ones.
+        """
+        with self._lock:
+            self._release(key)
+
+    def _allowed(self, key: Hashable) -> bool:
+        return (
+            self.limit is None or self.active < self.limit
+        ) and self._has_room(key)
+
+    def _has_room(self, key: Hashable) -> bool:
+        return self.per_key is None or self._active_per_key[key] < self.per_key
+
+    def _take(self, key: Hashable) -> None:
+        self.active += 1
+        if self.per_key is not None:
+            self._active_per_key[key] += 1
+
+    def _release(self, key: Hashable) -> None:
+        self.active -= 1
+        if self.per_key is not None:
+            self._active_per_key[key] -= 1
+            if not self._active_per_key[key]:
+                del self._active_per_key[key]
+
+            # key has free place now, its head may be not ready
+            self._push_ready(key)
+
+        self._start_pending()
+
+    def _start_pending(self) -> None:
+        while self._ready and (self.limit is None or self.active < self.limit):
+            pending = heapq.heappop(self._ready)
+            key = pending.key
+            queue = self._queues.get(key)
+
+            # ready heap may keep outdated heads, they are dropped lazily
+            if not queue or queue[0] is not pending:
+                continue
+
+            if pending.waiter.cancelled() or not self._has_room(key):
+                self._push_ready(key)
+                continue
+
+            heapq.heappop(queue)
+            if _wake(pending.waiter):
+                self._take(key)
+                pending.granted = True
+
+            self._push_ready(key)
+
+    def _push_ready(self, key: Hashable) -> None:
+        """
+        Make the head of queue of ``key`` ready to start if the key has free
+        place, cancelled executions are dropped from the head.
+        """
+        queue = self._queues.get(key)
+        if queue is None:
+            return
+
+        while queue and queue[0].waiter.cancelled():
+            heapq.heappop(queue)
+
+        if not queue:
+            del self._queues[key]
+        elif self._has_room(key):
+            heapq.heappush(self._ready, queue[0])
+
+
+class _Bucket:
+    __slots__ = ('rate', 'burst', 'tokens', 'updated')
+
+    def __init__(self, rate: float, burst: int, now: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = now
+
+    def take(self, now: float) -> float:
+        """
+        Take token and return delay until it is available, tokens below zero
+        are reserved by waiting executions.
+        """
+        self.tokens = min(
+            self.burst, self.tokens + (now - self.updated) * self.rate
+        )
+        self.updated = now
+        self.tokens -= 1
+
+        return max(0.0, -self.tokens / self.rate)
+
+    def refund(self) -> None:
+        self.tokens = min(self.burst, self.tokens + 1)
+
+
+class RateLimiter:
+    """
+    Token bucket limit of rate of executions in total and per key (e.g.
+    function of coroutine).
+
+    Each execution takes a token from buckets, tokens are refilled with
+    ``rate`` per second up to ``burst``. Execution without available token
+    reserves the next one and waits for it, so waiting executions are started
+    in order of arrival.
+
+    Limiter is thread-safe.
+
+    :param rate: max count of executions per second
+    :param per_key: max count of executions of the same key per second
+    :param burst: max count of executions at once after idle time
+    :param clock: function returning current time in seconds
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        per_key: Optional[float] = None,
+        burst: int = 1,
+        *,
+        clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        if any(value is not None and value <= 0 for value in (rate, per_key)):
+            raise ValueError('rates must be positive')
+
+        if burst < 1:
+            raise ValueError('burst must be positive')
+
+        self.per_key = per_key
+        self.burst = burst
+        self.clock = clock
+        self._bucket = _Bucket(rate, burst, clock()) if rate else None
+        self._buckets: Dict[Hashable, _Bucket] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, key: Hashable) -> float:
+        """
+        Take tokens for execution of ``key`` and return delay in seconds
+        until the execution is allowed.
+        """
+        now = self.clock()
+        delay = 0.0
+
+        with self._lock:
+            if self._bucket is not None:
+                delay = self._bucket.take(now)
+
+            if self.per_key:
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    bucket = self._buckets[key] = _Bucket(
+                        self.per_key, self.burst, now
+                    )
+
+                delay = max(delay, bucket.take(now))
+
+        return delay
+
+    def refund(self, key: Hashable) -> None:
+        """
+        Return tokens of reserved execution of ``key`` which is cancelled.
+        """
+        with self._lock:
+            if self._bucket is not None:
+                self._bucket.refund()
+
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.refund()
+
+
+def _wake(waiter: asyncio.Future) -> bool:
+    """
+    Resolve waiter in its event loop, returns false if the loop is closed.
+    """
+    loop = waiter.get_loop()
+
+    if loop is asyncio.get_running_loop():
+        _set_granted(waiter)
+        return True
+
+    try:
+        loop.call_soon_threadsafe(_set_granted, waiter)
+    except RuntimeError:
+        return False
+
+    return True
+
+
+def _set_granted(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
@@ -0,0 +1,55 @@
+from functools import partial, wraps
+from typing import Any, Callable, Hashable, Optional, TypeVar
+
+from async_reduce.aux import ArgumentsBinder, hash_args
+from async_reduce.thread_reducer import ThreadReducer, thread_reduce
+
+T_Func = TypeVar('T_Func')
+
+
+def reduceable(
+    reducer: ThreadReducer = thread_reduce,
+    *,
+    key: Optional[Callable[..., Hashable]] = None,
+    self_ident: Optional[Callable[[Any], Hashable]] = None
+) -> Callable[[T_Func], T_Func]:
+    """
+    Decorator to apply ``thread_reduce(...)`` automatically for each call of
+    blocking function, a counterpart of ``@async_reduceable()``.
+
+    Arguments of calls must be hashable, otherwise use ``key`` (result of it
+    called with same arguments is hashed instead).
+
+    Example:
+
+        @reduceable()
+        def load_config(name):
+            pass
+
+        @reduceable(key=lambda request, user_id: user_id)
+        def load_user(request, user_id):
+            pass
+    """
+
+    def wrapper(fn):
+        code, qualname = fn.__code__, fn.__qualname__
+        filename = code.co_filename
+        binder = ArgumentsBinder(fn)
+
+        @wraps(fn)
+        def wrap(*args, **kwargs):
+            if key is not None:
+                hsh = reducer.hash(key(*args, **kwargs))
+            else:
+                hsh = hash_args(
+                    reducer.hash, binder, args, kwargs, self_ident
+                )
+
+            return reducer(
+                partial(fn, *args, **kwargs),
+                ident=('args_hash', code, filename, qualname, hsh),
+            )
+
+        return wrap
+
+    return wrapper
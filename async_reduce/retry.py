@@ -0,0 +1,67 @@
+import random
+from typing import Tuple, Type
+
+
+class RetryPolicy:
+    """
+    Policy of retries of failed coroutine, which are made by the reducer once
+    for all its waiters.
+
+    Delay before retry grows exponentially from ``backoff`` up to
+    ``max_backoff`` and its ``jitter`` part is random, so retries of
+    different coroutines are spread in time.
+
+    :param exceptions: types of exceptions to retry
+    :param max_attempts: max count of attempts including the first one
+    :param backoff: delay before the first retry in seconds
+    :param multiplier: multiplier of delay for each next retry
+    :param max_backoff: max delay before retry in seconds
+    :param jitter: random part of delay (between 0 and 1)
+
+    Example:
+
+        retry = RetryPolicy(exceptions=(ConnectionError,), max_attempts=3)
+        async_reduce = AsyncReducer(retry=retry)
+    """
+
+    def __init__(
+        self,
+        exceptions: Tuple[Type[BaseException], ...] = (Exception,),
+        max_attempts: int = 3,
+        *,
+        backoff: float = 0.1,
+        multiplier: float = 2,
+        max_backoff: float = 10,
+        jitter: float = 1
+    ) -> None:
+        if max_attempts < 1:
+            raise ValueError('max_attempts must be positive')
+
+        if not 0 <= jitter <= 1:
+            raise ValueError('jitter must be between 0 and 1')
+
+        self.exceptions = exceptions
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.multiplier = multiplier
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+
+    def retries(self, exception: BaseException, attempt: int) -> bool:
+        """
+        Whether to retry coroutine failed with ``exception`` at ``attempt``
+        (starting from 1).
+        """
+        return attempt < self.max_attempts and isinstance(
+            exception, self.exceptions
+        )
+
+    def delay(self, attempt: int) -> float:
+        """
+        Delay in seconds before retry of coroutine failed at ``attempt``.
+        """
+        delay = min(
+            self.backoff * self.multiplier ** (attempt - 1), self.max_backoff
+        )
+
+        return delay * (1 - self.jitter * random.random())
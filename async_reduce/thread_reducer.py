@@ -0,0 +1,116 @@
+import threading
+from concurrent.futures import Future
+from functools import partial
+from typing import Any, Callable, Dict, Optional, TypeVar, Union
+
+from async_reduce.aux import T_Ident, get_call_ident, render_ident
+from async_reduce.hooks.base import BaseHooks
+
+T_Result = TypeVar('T_Result')
+
+
+class ThreadReducer:
+    """
+    Reducer for similar simultaneous calls of blocking functions in threads,
+    a counterpart of :class:`AsyncReducer` for code without event loop.
+
+    The first thread executes the function and other threads calling it with
+    the same ident block until its result (or exception) is ready.
+
+    :param hooks: hooks to trigger on reducer events, they get the call
+        (``functools.partial`` object) instead of coroutine and are triggered
+        in threads of callers
+    :param fingerprint: function to hash arguments for automatically
+        calculated idents instead of built-in ``hash()``
+    """
+
+    def __init__(
+        self,
+        hooks: Optional[BaseHooks] = None,
+        *,
+        fingerprint: Optional[Callable[[Any], str]] = None
+    ) -> None:
+        self._running: Dict[T_Ident, Future] = {}
+        self._lock = threading.Lock()
+        self._hooks = hooks
+        self._fingerprint = fingerprint
+
+    def __call__(
+        self,
+        func: Callable[..., T_Result],
+        *args: Any,
+        ident: Optional[T_Ident] = None
+    ) -> T_Result:
+        """
+        Call ``func(*args)`` or wait for result of similar call which is
+        executed by other thread.
+
+        Use ``functools.partial()`` to pass keyword arguments.
+
+        :param func: blocking function
+        :param args: arguments of function
+        :param ident: identity of call (calculated automatically from the
+            function and its arguments by default)
+        """
+        if not ident:
+            ident = get_call_ident(func, args, self.hash)
+
+        # hooks get the call instead of coroutine
+        call: Any = partial(func, *args)
+
+        if self._hooks:
+            self._hooks.on_apply_for(call, render_ident(ident))
+
+        with self._lock:
+            future = self._running.get(ident)
+            executed = future is None
+            if future is None:
+                future = self._running[ident] = Future()
+
+        if not executed:
+            if self._hooks:
+                self._hooks.on_reducing_for(call, render_ident(ident))
+
+            return future.result()
+
+        return self._execute(ident, call, future)
+
+    def hash(self, obj: Any) -> Union[int, str]:
+        """
+        Hash of arguments for automatically calculated idents.
+        """
+        if self._fingerprint is None:
+            return hash(obj)
+
+        return self._fingerprint(obj)
+
+    def _execute(self, ident: T_Ident, call: Any, future: Future) -> Any:
+        if self._hooks:
+            self._hooks.on_executing_for(call, render_ident(ident))
+
+        try:
+            result = call()
+        except BaseException as e:
+            self._done(ident)
+            future.set_exception(e)
+
+            if self._hooks and isinstance(e, Exception):
+                self._hooks.on_exception_for(call, render_ident(ident), e)
+
+            raise
+
+        self._done(ident)
+        future.set_result(result)
+
+        if self._hooks:
+            self._hooks.on_result_for(call, render_ident(ident), result)
+
+        return result
+
+    def _done(self, ident: T_Ident) -> None:
+        # next calls are executed again, current waiters get settled future
+        with self._lock:
+            del self._running[ident]
+
+
+thread_reduce = ThreadReducer()
@@ -0,0 +1,31 @@
+import asyncio
+
+from async_reduce import AsyncBatchReducer
+
+
+async def fetch_pages(urls):
+    print('- fetch pages: ', urls)
+    await asyncio.sleep(1)
+    return {url: 'content of {}'.format(url) for url in urls}
+
+
+pages_loader = AsyncBatchReducer(fetch_pages, max_batch_size=5)
+
+
+async def amain():
+    print('-- Simultaneous run with differences')
+    coros = [
+        pages_loader('/page/{}'.format(i % 7)) for i in range(10)
+    ]
+    results = await asyncio.gather(*coros)
+
+    print('Results:')
+    print('\n'.join(map(str, results)))
+
+
+def main():
+    asyncio.run(amain())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+
+class Backend:
+    """
+    Simulated backend which records its calls.
+
+    Attempt of :meth:`fetch` is executed by its item of ``plan`` (``delay,
+    outcome``), where outcome is exception to raise or result to return
+    instead of the argument. Attempts without plan sleep ``delay`` seconds
+    and return the argument.
+    """
+
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.plan = []
+        self.calls = []
+        self.cancelled = []
+        self.threads = []
+        self.active = 0
+        self.max_active = 0
+
+    async def fetch(self, arg):
+        attempt = len(self.calls)
+        self.calls.append(arg)
+
+        delay, outcome = self.delay, None
+        if attempt < len(self.plan):
+            delay, outcome = self.plan[attempt]
+
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(attempt)
+            raise
+        finally:
+            self.active -= 1
+
+        if isinstance(outcome, BaseException):
+            raise outcome
+
+        return arg if outcome is None else outcome
+
+    async def other(self, arg):
+        return await self.fetch(arg)
+
+    def blocking(self, arg, *, error=None):
+        self.calls.append(arg)
+        self.threads.append(threading.get_ident())
+        time.sleep(0.05)
+
+        if error is not None:
+            raise error
+
+        return arg
+
+
+@pytest.fixture
+def backend():
+    return Backend()
@@ -0,0 +1,201 @@
+import asyncio
+
+import pytest
+
+from async_reduce import AsyncBatchReducer
+from async_reduce.hooks import StatisticsDetailHooks, StatisticsOverallHooks
+from async_reduce.hooks.base import BaseHooks
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_batch():
+    calls = []
+
+    async def fetch(keys):
+        calls.append(keys)
+        return ['result {}'.format(key) for key in keys]
+
+    stats = StatisticsOverallHooks()
+    loader = AsyncBatchReducer(fetch, hooks=stats)
+
+    results = await asyncio.gather(loader(1), loader(2), loader(1), loader(3))
+
+    assert results == ['result 1', 'result 2', 'result 1', 'result 3']
+    assert calls == [[1, 2, 3]]
+    assert str(stats) == 'Stats(total=4, executed=3, reduced=1, errors=0)'
+
+    assert await loader(1) == 'result 1'
+    assert calls == [[1, 2, 3], [1]]
+
+
+async def test_batch_mapping():
+    async def fetch(keys):
+        return {key: key * 2 for key in keys if key != 3}
+
+    loader = AsyncBatchReducer(fetch)
+
+    results = await asyncio.gather(
+        loader(1), loader(2), loader(3), return_exceptions=True
+    )
+
+    assert results[:2] == [2, 4]
+    assert isinstance(results[2], KeyError)
+
+
+async def test_batch_wrong_length():
+    async def fetch(keys):
+        return [1]
+
+    loader = AsyncBatchReducer(fetch)
+
+    results = await asyncio.gather(
+        loader(1), loader(2), return_exceptions=True
+    )
+
+    for res in results:
+        assert isinstance(res, ValueError)
+        assert str(res) == 'Batch function returned 1 results for 2 keys'
+
+
+@pytest.mark.parametrize(
+    'results', [None, (key for key in [1, 2])], ids=['none', 'generator']
+)
+async def test_batch_wrong_type(results):
+    async def fetch(keys):
+        return results
+
+    loader = AsyncBatchReducer(fetch)
+
+    results = await asyncio.gather(
+        loader(1), loader(2), return_exceptions=True
+    )
+
+    for res in results:
+        assert isinstance(res, TypeError)
+        assert str(res).startswith('Batch function returned')
+
+    assert loader._running == {}
+
+
+@pytest.mark.parametrize('max_batch_size', [None, 2])
+async def test_batch_call_failed(max_batch_size):
+    async def fetch(keys, extra):
+        pass
+
+    loader = AsyncBatchReducer(fetch, max_batch_size=max_batch_size)
+
+    for _ in range(2):
+        results = await asyncio.wait_for(
+            asyncio.gather(loader(1), loader(2), return_exceptions=True), 1
+        )
+
+        for res in results:
+            assert isinstance(res, TypeError)
+            assert 'extra' in str(res)
+
+        assert loader._running == {}
+
+
+async def test_batch_settle_failed():
+    class FailingHooks(BaseHooks):
+        def on_result_for(self, coro, ident, result):
+            raise RuntimeError('hook error')
+
+    async def fetch(keys):
+        return keys
+
+    loader = AsyncBatchReducer(fetch, hooks=FailingHooks())
+
+    results = await asyncio.wait_for(
+        asyncio.gather(loader(1), loader(2), return_exceptions=True), 1
+    )
+
+    # the first waiter got result before the hook failed
+    assert results[0] == 1
+    assert isinstance(results[1], RuntimeError)
+    assert loader._running == {}
+
+
+async def test_batch_exception():
+    async def fetch(keys):
+        raise RuntimeError('test error')
+
+    stats = StatisticsOverallHooks()
+    loader = AsyncBatchReducer(fetch, hooks=stats)
+
+    results = await asyncio.gather(
+        loader(1), loader(2), return_exceptions=True
+    )
+
+    assert all(isinstance(res, RuntimeError) for res in results)
+    assert stats.errors == 2
+
+
+async def test_max_batch_size():
+    calls = []
+
+    async def fetch(keys):
+        calls.append(keys)
+        return keys
+
+    loader = AsyncBatchReducer(fetch, max_batch_size=2)
+
+    results = await asyncio.gather(*[loader(key) for key in range(5)])
+
+    assert results == [0, 1, 2, 3, 4]
+    assert calls == [[0, 1], [2, 3], [4]]
+
+    results = await asyncio.gather(loader(5), loader(6), loader(5))
+
+    assert results == [5, 6, 5]
+    assert calls[3:] == [[5, 6]]
+
+    with pytest.raises(ValueError):
+        AsyncBatchReducer(fetch, max_batch_size=0)
+
+
+async def test_window():
+    calls = []
+
+    async def fetch(keys):
+        calls.append(keys)
+        return keys
+
+    loader = AsyncBatchReducer(fetch, window=0.05)
+
+    async def load(key, delay):
+        await asyncio.sleep(delay)
+        return await loader(key)
+
+    results = await asyncio.gather(load(1, 0), load(2, 0.01), load(3, 0.1))
+
+    assert results == [1, 2, 3]
+    assert calls == [[1, 2], [3]]
+
+
+async def test_dispatch():
+    async def fetch(keys):
+        fetch.calls += 1
+        await asyncio.sleep(0.01)
+        return keys
+
+    fetch.calls = 0
+
+    stats = StatisticsDetailHooks()
+    loader = AsyncBatchReducer(fetch, window=10, hooks=stats)
+
+    waiters = [loader(1), loader(2)]
+    loader.dispatch()
+    loader.dispatch()
+
+    # keys in flight are reduced to dispatched batch
+    waiters.append(loader(1))
+
+    assert await asyncio.gather(*waiters) == [1, 2, 1]
+    assert fetch.calls == 1
+
+    loc = 'tests.test_async_batch_reducer:test_dispatch.<locals>.fetch'
+    assert stats.total == {loc: 3}
+    assert stats.executed == {loc: 2}
+    assert stats.reduced == {loc: 1}
@@ -1,9 +1,11 @@
 import asyncio
+from functools import partial
 
 import pytest
 
 from async_reduce import async_reduceable
 from async_reduce.async_reducer import AsyncReducer
+from async_reduce.hooks import StatisticsDetailHooks
 
 pytestmark = pytest.mark.asyncio
 
@@ -47,3 +49,148 @@ async def test_decorator_with_arg():
 
     assert mock.await_count == 1
     assert all(r == 'result arg kw' for r in results)
+
+
+async def test_decorator_creates_coroutine_only_for_execution():
+    async def coro_function(arg):
+        await asyncio.sleep(0)
+        return arg
+
+    @async_reduceable()
+    def foo(arg, *, kw):
+        foo.created_count += 1
+        return coro_function(arg)
+
+    foo.created_count = 0
+
+    coros = [foo('arg', kw='kw') for _ in range(10)]
+    coros.append(foo('other', kw='kw'))
+    results = await asyncio.gather(*coros)
+
+    assert foo.created_count == 2
+    assert results == ['arg'] * 10 + ['other']
+
+
+async def test_decorator_with_key():
+    @async_reduceable(key=lambda arg, kw: arg)
+    async def foo(arg, kw):
+        foo.await_count += 1
+
+        return 'result {}'.format(arg)
+
+    foo.await_count = 0
+
+    coros = [foo('arg', 1), foo('arg', kw=2), foo('other', 3)]
+    results = await asyncio.gather(*coros)
+
+    assert foo.await_count == 2
+    assert results == ['result arg', 'result arg', 'result other']
+
+
+async def test_decorator_bound_arguments():
+    @async_reduceable()
+    async def foo(a, b=2, *args, **kwargs):
+        foo.await_count += 1
+        await asyncio.sleep(0)
+
+        return a + b
+
+    foo.await_count = 0
+
+    results = await asyncio.gather(
+        foo(1), foo(a=1), foo(1, 2), foo(1, b=2), foo(b=2, a=1)
+    )
+
+    # the same values passed by position, by keyword or by default
+    assert foo.await_count == 1
+    assert results == [3] * 5
+
+    results = await asyncio.gather(
+        foo(1, 2, 3), foo(1, 2, x=1, y=2), foo(1, 2, y=2, x=1)
+    )
+
+    assert foo.await_count == 3
+    assert results == [3] * 3
+
+
+async def test_decorator_invalid_arguments():
+    @async_reduceable()
+    async def foo(a):
+        pass
+
+    with pytest.raises(TypeError, match='argument'):
+        await foo(1, 2)
+
+    with pytest.raises(TypeError, match='argument'):
+        await foo()
+
+
+async def test_decorator_without_code():
+    async def foo(arg, other):
+        foo.await_count += 1
+        await asyncio.sleep(0)
+
+        return arg + other
+
+    foo.await_count = 0
+
+    bar = async_reduceable()(partial(foo, 1))
+
+    results = await asyncio.gather(bar(2), bar(2), bar(3))
+
+    assert foo.await_count == 2
+    assert results == [3, 3, 4]
+
+
+async def test_decorator_unhashable_arguments():
+    @async_reduceable()
+    async def foo(arg):
+        pass
+
+    with pytest.raises(TypeError) as e:
+        await foo({})
+
+    assert str(e.value) == (
+        'Unable to auto calculate identity for coroutine because'
+        ' using unhashable arguments, you should set `ident` manual like:'
+        '\n\tawait async_reduce(foo(...), ident="YOU-IDENT-FOR-THAT")'
+    )
+
+
+async def test_decorator_with_hooks():
+    stats = StatisticsDetailHooks()
+
+    @async_reduceable(AsyncReducer(hooks=stats))
+    async def foo(arg):
+        return arg
+
+    results = await asyncio.gather(foo(1), foo(1), foo(2))
+
+    assert results == [1, 1, 2]
+
+    loc = (
+        'tests.test_async_reduceable'
+        ':test_decorator_with_hooks.<locals>.foo'
+    )
+    assert stats.total == {loc: 3}
+    assert stats.executed == {loc: 2}
+    assert stats.reduced == {loc: 1}
+
+
+async def test_decorator_unhashable_arguments_custom_ident():
+    class MyAsyncReducer(AsyncReducer):
+        @staticmethod
+        def _auto_ident(coro):
+            return 'my-ident'
+
+    @async_reduceable(MyAsyncReducer())
+    async def foo(arg):
+        foo.await_count += 1
+        return arg
+
+    foo.await_count = 0
+
+    results = await asyncio.gather(foo({}), foo({}))
+
+    assert results == [{}, {}]
+    assert foo.await_count == 1
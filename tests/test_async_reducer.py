@@ -1,9 +1,10 @@
 import asyncio
+import importlib.util
 from contextlib import suppress
 
 import pytest
 
-from async_reduce import async_reduce
+from async_reduce import AsyncReducer, async_reduce
 
 pytestmark = pytest.mark.asyncio
 
@@ -142,3 +143,90 @@ async def test_all_waiters_cancelled(caplog):
         assert 'invalid state' not in caplog.text
     else:
         assert False
+
+
+async def test_coroutine_of_call():
+    async def foo(arg):
+        await asyncio.sleep(0)
+        return arg
+
+    reducer = AsyncReducer()
+
+    coro = reducer(foo(1))
+    assert asyncio.iscoroutine(coro)
+
+    # execution is started at once, call returns coroutine of waiting
+    tasks = [asyncio.create_task(coro), asyncio.create_task(reducer(foo(1)))]
+    assert len(reducer._running) == 1
+
+    assert await asyncio.gather(*tasks) == [1, 1]
+
+
+async def test_future_of_call():
+    async def foo(arg):
+        await asyncio.sleep(0)
+        return arg
+
+    reducer = AsyncReducer()
+
+    futures = [reducer.future(foo(1)) for _ in range(2)]
+    assert all(isinstance(future, asyncio.Future) for future in futures)
+
+    futures[0].cancel()
+    assert await futures[1] == 1
+
+
+MODULE_SOURCE = """
+import time
+
+from async_reduce import async_reduceable, reduceable
+
+NAME = {!r}
+
+
+async def fetch(x):
+    return (NAME, x)
+
+
+@async_reduceable()
+async def reduced(x):
+    return (NAME, x)
+
+
+@reduceable()
+def blocking(x):
+    time.sleep(0.05)
+    return (NAME, x)
+"""
+
+
+def load_module(path, name):
+    path.mkdir()
+    filename = path / 'm.py'
+    filename.write_text(MODULE_SOURCE.format(name))
+
+    spec = importlib.util.spec_from_file_location(name + '.m', filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    return module
+
+
+async def test_same_functions_of_different_modules(tmp_path):
+    # code objects of functions are equal, they differ by files only
+    a, b = [load_module(tmp_path / name, name) for name in 'ab']
+    assert a.fetch.__code__ == b.fetch.__code__
+
+    reducer = AsyncReducer()
+    results = await asyncio.gather(reducer(a.fetch(1)), reducer(b.fetch(1)))
+    assert results == [('a', 1), ('b', 1)]
+
+    results = await asyncio.gather(a.reduced(1), b.reduced(1))
+    assert results == [('a', 1), ('b', 1)]
+
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(
+        loop.run_in_executor(None, a.blocking, 1),
+        loop.run_in_executor(None, b.blocking, 1),
+    )
+    assert results == [('a', 1), ('b', 1)]
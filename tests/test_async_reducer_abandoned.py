@@ -0,0 +1,93 @@
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from async_reduce import AsyncReducer
+from async_reduce.flight import Flight
+from async_reduce.hooks.base import BaseHooks
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_cancel_abandoned(backend):
+    hooks = Mock(BaseHooks)
+    reducer = AsyncReducer(hooks, abandoned='cancel')
+
+    waiters = [reducer.future(backend.fetch(1)) for _ in range(3)]
+    await asyncio.sleep(0)
+
+    for waiter in waiters:
+        waiter.cancel()
+    await asyncio.sleep(0.01)
+
+    assert backend.calls == [1]
+    assert backend.cancelled == [0]
+    assert hooks.on_abandoned_for.call_count == 1
+    assert reducer._running == {}
+
+    # next similar coroutine is executed again
+    assert await reducer(backend.fetch(1)) == 1
+    assert backend.calls == [1, 1]
+
+
+async def test_cancel_abandoned_replaced(backend):
+    reducer = AsyncReducer(abandoned='cancel')
+
+    waiter = reducer.future(backend.fetch(1))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    await asyncio.sleep(0)
+
+    # new execution starts before cancelled one is finished
+    assert await reducer(backend.fetch(1)) == 1
+    assert backend.cancelled == [0]
+    assert reducer._running == {}
+
+
+@pytest.mark.parametrize('abandoned', ['cancel', 'keep'])
+async def test_not_abandoned(backend, abandoned):
+    hooks = Mock(BaseHooks)
+    reducer = AsyncReducer(hooks, abandoned=abandoned)
+
+    waiters = [reducer.future(backend.fetch(1)) for _ in range(3)]
+    await asyncio.sleep(0)
+    waiters[0].cancel()
+
+    assert await asyncio.gather(*waiters[1:]) == [1, 1]
+    assert backend.cancelled == []
+    assert hooks.on_abandoned_for.call_count == 0
+
+
+async def test_keep_abandoned(backend):
+    hooks = Mock(BaseHooks)
+    reducer = AsyncReducer(hooks, ttl=10, abandoned='keep')
+
+    waiter = reducer.future(backend.fetch(1))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    await asyncio.sleep(0.1)
+
+    assert backend.cancelled == []
+    assert hooks.on_abandoned_for.call_count == 1
+
+    # result of abandoned execution is kept
+    assert await reducer(backend.fetch(1)) == 1
+    assert backend.calls == [1]
+
+
+async def test_abandoned_before_start():
+    reducer = AsyncReducer(abandoned='cancel')
+    reducer._running['foo'] = flight = Flight()
+    flight.waiting = 1
+
+    waiter = asyncio.get_running_loop().create_future()
+    waiter.cancel()
+    reducer._leave('foo', flight, None, waiter)
+
+    assert reducer._running == {}
+
+
+async def test_abandoned_invalid():
+    with pytest.raises(ValueError):
+        AsyncReducer(abandoned='drop')
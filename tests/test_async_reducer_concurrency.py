@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from async_reduce import AsyncReducer
+from async_reduce.backends import MemoryBackend, MemoryBroker
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_max_concurrency(backend):
+    reducer = AsyncReducer(max_concurrency=2)
+
+    results = await asyncio.gather(
+        *[reducer(backend.fetch(i % 5)) for i in range(20)]
+    )
+
+    assert results == [i % 5 for i in range(20)]
+    assert sorted(backend.calls) == list(range(5))
+    assert backend.max_active == 2
+
+
+async def test_max_concurrency_priority(backend):
+    reducer = AsyncReducer(max_concurrency=1)
+
+    await asyncio.gather(
+        reducer(backend.fetch(0)),
+        reducer(backend.fetch(1), priority=2),
+        reducer(backend.fetch(2), priority=1),
+        # duplicate attaches to queued execution with its priority
+        reducer(backend.fetch(1), priority=0),
+    )
+
+    assert backend.calls == [0, 2, 1]
+
+
+async def test_max_concurrency_per_function(backend):
+    reducer = AsyncReducer(max_concurrency_per_function=1)
+
+    await asyncio.gather(
+        *[
+            reducer(func(i))
+            for i in range(3)
+            for func in (backend.fetch, backend.other)
+        ]
+    )
+
+    assert backend.max_active == 2
+
+
+async def test_max_concurrency_abandoned(backend):
+    reducer = AsyncReducer(max_concurrency=1, abandoned='cancel')
+
+    running = reducer.future(backend.fetch(0))
+    queued = reducer.future(backend.fetch(1))
+    await asyncio.sleep(0)
+
+    queued.cancel()
+    assert await running == 0
+    await asyncio.sleep(0)
+
+    assert backend.calls == [0]
+    assert reducer._limiter.active == 0
+
+
+async def test_max_concurrency_backend(backend):
+    broker = MemoryBroker()
+    nodes = [
+        AsyncReducer(backend=MemoryBackend(broker), max_concurrency=1)
+        for _ in '12'
+    ]
+
+    results = await asyncio.gather(
+        *[
+            node(backend.fetch(i), ident=str(i))
+            for node in nodes
+            for i in range(3)
+        ]
+    )
+
+    assert results == [0, 1, 2] * 2
+    assert sorted(backend.calls) == [0, 1, 2]
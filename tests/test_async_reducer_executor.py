@@ -0,0 +1,244 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from io import StringIO
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from unittest.mock import Mock
+
+import pytest
+
+from async_reduce import (
+    AsyncReducer,
+    async_reduceable_in_executor,
+)
+from async_reduce.async_reducer import _ExecutorCall
+from async_reduce.hooks import DebugHooks, StatisticsDetailHooks
+from async_reduce.hooks.base import BaseHooks
+
+pytestmark = pytest.mark.asyncio
+
+
+def get_pid(arg):
+    time.sleep(0.05)
+    return os.getpid()
+
+
+# workers are started only on the first call
+processes = ProcessPoolExecutor(
+    2, mp_context=multiprocessing.get_context('spawn')
+)
+
+
+@async_reduceable_in_executor(executor=processes)
+def decorated_get_pid(arg):
+    return get_pid(arg)
+
+
+# original function is kept in module
+wrapped_get_pid = async_reduceable_in_executor(executor=processes)(get_pid)
+
+
+def fail():
+    time.sleep(0.05)
+    raise RuntimeError('test error')
+
+
+@pytest.mark.parametrize('count', [1, 2, 10])
+async def test_run_in_executor(backend, count):
+    reducer = AsyncReducer()
+
+    results = await asyncio.gather(
+        *[reducer.run_in_executor(backend.blocking, 'a') for _ in range(count)]
+    )
+
+    assert results == ['a'] * count
+    assert len(backend.calls) == 1
+    assert backend.threads[0] != threading.get_ident()
+
+    await reducer.run_in_executor(backend.blocking, 'b')
+    assert len(backend.calls) == 2
+
+
+async def test_run_in_executor_different_args(backend):
+    reducer = AsyncReducer()
+
+    results = await asyncio.gather(
+        reducer.run_in_executor(backend.blocking, 'a'),
+        reducer.run_in_executor(backend.blocking, 'b'),
+        reducer.run_in_executor(partial(backend.blocking, 'a'), ident='a'),
+        reducer.run_in_executor(partial(backend.blocking, 'b'), ident='a'),
+    )
+
+    assert results == ['a', 'b', 'a', 'a']
+    assert len(backend.calls) == 3
+
+
+async def test_run_in_executor_of_reducer(backend):
+    with ThreadPoolExecutor(1, thread_name_prefix='reducer') as executor:
+        reducer = AsyncReducer(executor=executor)
+
+        await reducer.run_in_executor(backend.blocking, 'a')
+
+        with ThreadPoolExecutor(1, thread_name_prefix='call') as other:
+            await reducer.run_in_executor(
+                backend.blocking, 'b', executor=other
+            )
+
+    assert backend.calls == ['a', 'b']
+    assert backend.threads[0] != backend.threads[1]
+
+
+async def test_run_in_executor_exception():
+    reducer = AsyncReducer()
+
+    results = await asyncio.gather(
+        reducer.run_in_executor(fail),
+        reducer.run_in_executor(fail),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert results[0] is results[1]
+
+
+async def test_run_in_executor_processes():
+    reducer = AsyncReducer()
+    context = multiprocessing.get_context('spawn')
+
+    with ProcessPoolExecutor(2, mp_context=context) as executor:
+        pids = await asyncio.gather(
+            *[
+                reducer.run_in_executor(get_pid, 1, executor=executor)
+                for _ in range(4)
+            ]
+        )
+
+    assert len(set(pids)) == 1
+    assert pids[0] != os.getpid()
+
+
+async def test_run_in_executor_hooks(backend):
+    hooks = Mock(BaseHooks)
+    reducer = AsyncReducer(hooks=hooks)
+
+    await asyncio.gather(
+        reducer.run_in_executor(backend.blocking, 'a'),
+        reducer.run_in_executor(backend.blocking, 'a'),
+    )
+
+    assert hooks.on_executing_for.call_count == 1
+    assert hooks.on_reducing_for.call_count == 1
+    assert hooks.on_result_for.call_count == 1
+
+    ident = hooks.on_result_for.call_args[0][1]
+    assert ident.startswith('tests.conftest:Backend.blocking(')
+
+
+async def test_run_in_executor_statistics(backend):
+    stats = StatisticsDetailHooks()
+    reducer = AsyncReducer(hooks=stats, max_concurrency_per_function=1)
+
+    await asyncio.gather(
+        reducer.run_in_executor(backend.blocking, 'a'),
+        reducer.run_in_executor(backend.blocking, 'a'),
+        reducer.run_in_executor(get_pid, 'a'),
+        reducer.run_in_executor(partial(backend.blocking, 'b'), ident='b'),
+        reducer.run_in_executor(len, 'c', ident='c'),
+    )
+
+    # hooks and limits see the called functions
+    assert stats.executed == {
+        'tests.conftest:Backend.blocking': 2,
+        'tests.test_async_reducer_executor:get_pid': 1,
+        'async_reduce.async_reducer:_execute': 1,
+    }
+    assert stats.reduced == {'tests.conftest:Backend.blocking': 1}
+
+
+async def test_run_in_executor_debug_hooks(backend):
+    stream = StringIO()
+    reducer = AsyncReducer(hooks=DebugHooks(stream))
+
+    await reducer.run_in_executor(backend.blocking, 'a', ident='a')
+
+    assert stream.getvalue().startswith(
+        "[a] apply async_reduce() for <executor call functools.partial("
+        "<bound method Backend.blocking"
+    )
+
+
+async def test_executor_call_protocol(backend):
+    call = _ExecutorCall(partial(backend.blocking, 'a'), None)
+
+    with pytest.raises(AttributeError):
+        call.unknown
+
+    future = call.send(None)
+    await asyncio.wait([future])
+
+    with pytest.raises(StopIteration) as e:
+        call.send(None)
+
+    assert e.value.value == 'a'
+
+    call = _ExecutorCall(partial(backend.blocking, 'b'), None)
+    with pytest.raises(RuntimeError):
+        call.throw(RuntimeError())
+
+
+@pytest.mark.parametrize(
+    'func, args, match',
+    [
+        (len, ('a',), 'has no code'),
+        (get_pid, ([],), 'unhashable'),
+    ],
+)
+async def test_run_in_executor_unable_ident(func, args, match):
+    reducer = AsyncReducer()
+
+    with pytest.raises(TypeError, match=match):
+        reducer.run_in_executor(func, *args)
+
+
+async def test_decorator(backend):
+    @async_reduceable_in_executor()
+    def foo(arg, *, kwarg=None):
+        return backend.blocking((arg, kwarg))
+
+    results = await asyncio.gather(
+        foo(1), foo(1), foo(1, kwarg=2), foo(1, kwarg=2)
+    )
+
+    assert results == [(1, None), (1, None), (1, 2), (1, 2)]
+    assert len(backend.calls) == 2
+
+
+async def test_decorator_processes():
+    with processes:
+        for func in (decorated_get_pid, wrapped_get_pid):
+            pids = await asyncio.gather(*[func(1) for _ in range(4)])
+
+            assert len(set(pids)) == 1
+            assert pids[0] != os.getpid()
+
+
+async def test_decorator_key_and_executor(backend):
+    with ThreadPoolExecutor(1, thread_name_prefix='foo') as executor:
+
+        @async_reduceable_in_executor(
+            executor=executor, key=lambda request, arg: arg
+        )
+        def foo(request, arg):
+            assert threading.current_thread().name.startswith('foo')
+            return backend.blocking(arg)
+
+        results = await asyncio.gather(foo([1], 'a'), foo([2], 'a'))
+
+    assert results == ['a', 'a']
+    assert len(backend.calls) == 1
+
+    with pytest.raises(TypeError):
+        await async_reduceable_in_executor()(backend.blocking)([])
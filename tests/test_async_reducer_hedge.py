@@ -0,0 +1,192 @@
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from async_reduce import AsyncReducer
+from async_reduce.hooks.base import BaseHooks
+
+pytestmark = pytest.mark.asyncio
+
+
+def reduced(reducer, backend, arg):
+    return reducer(backend.fetch(arg), factory=lambda: backend.fetch(arg))
+
+
+async def test_hedge_delay(backend):
+    hooks = Mock(BaseHooks)
+    reducer = AsyncReducer(hooks, hedge_delay=0.01)
+    backend.plan = [(1, None), (0, 'hedge')]
+
+    results = await asyncio.gather(
+        reduced(reducer, backend, 'a'), reduced(reducer, backend, 'a')
+    )
+
+    assert results == ['hedge', 'hedge']
+    assert backend.calls == ['a', 'a']
+    assert backend.cancelled == [0]
+    assert hooks.on_hedged_for.call_count == 1
+    assert hooks.on_hedged_for.call_args[0][2] == 0.01
+    assert hooks.on_result_for.call_count == 1
+
+    # the second attempt wins, the first one is cancelled
+    hedge = hooks.on_hedged_for.call_args[0][0]
+    winner, ident, loser = hooks.on_hedge_settled_for.call_args[0]
+    assert winner is hedge
+    assert loser is not hedge and loser.cr_frame is None
+    assert ident == hooks.on_hedged_for.call_args[0][1]
+
+
+async def test_hedge_first_won(backend):
+    hooks = Mock(BaseHooks)
+    reducer = AsyncReducer(hooks, hedge_delay=0.01)
+    backend.plan = [(0.02, 'first'), (1, 'hedge')]
+
+    assert await reduced(reducer, backend, 'a') == 'first'
+    await asyncio.sleep(0)
+
+    assert backend.cancelled == [1]
+    hedge = hooks.on_hedged_for.call_args[0][0]
+    winner, _, loser = hooks.on_hedge_settled_for.call_args[0]
+    assert winner is not hedge
+    assert loser is hedge
+
+
+async def test_hedge_not_needed(backend):
+    reducer = AsyncReducer(hedge_delay=0.01)
+    backend.delay = 0
+
+    assert await reduced(reducer, backend, 'a') == 'a'
+    # coroutine without factory is not hedged
+    backend.plan = [(0, None), (0.02, None)]
+    assert await reducer(backend.fetch('b')) == 'b'
+
+    assert backend.calls == ['a', 'b']
+
+
+async def test_hedge_first_failed(backend):
+    reducer = AsyncReducer(hedge_delay=0.01)
+    backend.plan = [(0.02, RuntimeError(0)), (0.04, 'hedge')]
+
+    # failed attempt does not win
+    assert await reduced(reducer, backend, 'a') == 'hedge'
+    assert backend.cancelled == []
+
+
+async def test_hedge_both_failed(backend):
+    hooks = Mock(BaseHooks)
+    reducer = AsyncReducer(hooks, hedge_delay=0.01)
+    backend.plan = [(0.03, RuntimeError(0)), (0, RuntimeError(1))]
+
+    with pytest.raises(RuntimeError, match='0'):
+        await reduced(reducer, backend, 'a')
+
+    # no winner
+    assert not hooks.on_hedge_settled_for.called
+
+
+async def test_hedge_failed_fast(backend):
+    reducer = AsyncReducer(hedge_delay=0.01)
+    backend.plan = [(0, RuntimeError(0))]
+
+    with pytest.raises(RuntimeError, match='0'):
+        await reduced(reducer, backend, 'a')
+
+    assert backend.calls == ['a']
+
+
+async def test_hedge_percentile(backend):
+    hooks = Mock(BaseHooks)
+    reducer = AsyncReducer(hooks, hedge_percentile=0.9)
+    backend.delay = 0
+
+    for i in range(10):
+        await reduced(reducer, backend, i)
+
+    assert not hooks.on_hedged_for.called
+
+    backend.plan = [(0, None)] * 10 + [(1, None), (0, 'hedge')]
+    assert await reduced(reducer, backend, 'slow') == 'hedge'
+
+    assert hooks.on_hedged_for.call_count == 1
+    assert hooks.on_hedged_for.call_args[0][2] < 0.01
+
+
+async def test_hedge_percentile_delay(backend):
+    hooks = Mock(BaseHooks)
+    reducer = AsyncReducer(hooks, hedge_delay=0.01, hedge_percentile=0.9)
+    backend.plan = [(1, None), (0, 'hedge')]
+
+    # delay is used until durations are enough
+    assert await reduced(reducer, backend, 'a') == 'hedge'
+    assert hooks.on_hedged_for.call_args[0][2] == 0.01
+
+
+async def test_hedge_rate_limit(backend):
+    reducer = AsyncReducer(hedge_delay=0.01, rate_limit=1)
+    backend.delay = 0.02
+
+    # hedge is not started without token
+    assert await reduced(reducer, backend, 'a') == 'a'
+    assert backend.calls == ['a']
+
+
+async def test_hedge_max_concurrency(backend):
+    reducer = AsyncReducer(hedge_delay=0.01, max_concurrency=2)
+    backend.delay = 0.03
+
+    results = await asyncio.gather(
+        *[
+            reducer.apply(lambda arg=arg: backend.fetch(arg), ident=str(arg))
+            for arg in range(6)
+        ]
+    )
+
+    # hedge is not started without free place
+    assert results == list(range(6))
+    assert backend.max_active == 2
+    assert reducer._limiter.active == 0
+
+
+async def test_hedge_max_concurrency_free(backend):
+    hooks = Mock(BaseHooks)
+    reducer = AsyncReducer(hooks, hedge_delay=0.01, max_concurrency=2)
+    backend.plan = [(1, None), (0, 'hedge')]
+
+    assert await reduced(reducer, backend, 'a') == 'hedge'
+    await asyncio.sleep(0)
+
+    # place of hedge is released with cancelled loser
+    assert hooks.on_hedged_for.call_count == 1
+    assert backend.cancelled == [0]
+    assert reducer._limiter.active == 0
+
+
+async def test_hedge_factory_failed(backend):
+    reducer = AsyncReducer(hedge_delay=0.01, max_concurrency=2)
+    backend.delay = 1
+    factories = iter([lambda: backend.fetch('a'), None])
+
+    with pytest.raises(TypeError):
+        await reducer.apply(lambda: next(factories)(), ident='a')
+
+    await asyncio.sleep(0)
+
+    assert backend.cancelled == [0]
+    assert reducer._limiter.active == 0
+
+
+async def test_hedge_leader_timeout(backend):
+    reducer = AsyncReducer(hedge_delay=0.01, leader_timeout=0.03)
+    backend.delay = 1
+
+    with pytest.raises(asyncio.TimeoutError):
+        await reduced(reducer, backend, 'a')
+
+    await asyncio.sleep(0)
+    assert sorted(backend.cancelled) == [0, 1]
+
+
+async def test_hedge_percentile_invalid():
+    with pytest.raises(ValueError):
+        AsyncReducer(hedge_percentile=1)
@@ -0,0 +1,129 @@
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from async_reduce import AsyncReducer, Overloaded
+from async_reduce.hooks.base import BaseHooks
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_max_in_flight(backend):
+    hooks = Mock(BaseHooks)
+    reducer = AsyncReducer(hooks, max_in_flight=2)
+
+    waiters = [reducer.future(backend.fetch(i)) for i in range(2)]
+
+    with pytest.raises(Overloaded, match='Too many coroutines in flight'):
+        reducer(backend.fetch(2))
+
+    assert hooks.on_rejected_for.call_count == 1
+
+    # similar coroutine is not a new one
+    waiters.append(reducer.future(backend.fetch(1)))
+
+    assert await asyncio.gather(*waiters) == [0, 1, 1]
+    assert await reducer(backend.fetch(2)) == 2
+    assert backend.calls == [0, 1, 2]
+
+
+async def test_max_in_flight_apply(backend):
+    reducer = AsyncReducer(max_in_flight=1)
+
+    waiter = reducer.apply(lambda: backend.fetch(0), ident='0')
+
+    with pytest.raises(Overloaded):
+        reducer.apply(lambda: backend.fetch(1), ident='1')
+
+    assert await waiter == 0
+    assert backend.calls == [0]
+
+
+async def test_max_in_flight_stale(backend):
+    reducer = AsyncReducer(ttl=0.01, stale_ttl=1, max_in_flight=1)
+    backend.plan = [(0, None)]
+
+    assert await reducer(backend.fetch(0)) == 0
+    await asyncio.sleep(0.02)
+
+    waiter = reducer.future(backend.fetch(1))
+    # stale result is returned without refresh
+    assert await reducer(backend.fetch(0)) == 0
+    assert await waiter == 1
+    assert backend.calls == [0, 1]
+
+
+async def test_max_waiters(backend):
+    reducer = AsyncReducer(max_waiters=2)
+
+    waiters = [reducer.future(backend.fetch(0)) for _ in range(2)]
+
+    with pytest.raises(Overloaded, match='Too many waiters of coroutine'):
+        reducer(backend.fetch(0))
+
+    # cancelled waiter frees its place
+    waiters[0].cancel()
+    await asyncio.sleep(0)
+    waiters.append(reducer.future(backend.fetch(0)))
+
+    assert await asyncio.gather(*waiters[1:]) == [0, 0]
+    assert backend.calls == [0]
+
+
+async def test_max_queued_age(backend):
+    hooks = Mock(BaseHooks)
+    reducer = AsyncReducer(
+        hooks,
+        max_concurrency=1,
+        max_queued_age=0.005,
+        negative_ttl=1,
+    )
+
+    results = await asyncio.gather(
+        reducer(backend.fetch(0)),
+        reducer(backend.fetch(1)),
+        reducer(backend.fetch(1)),
+        return_exceptions=True,
+    )
+
+    assert results[0] == 0
+    assert all(isinstance(result, Overloaded) for result in results[1:])
+    assert hooks.on_rejected_for.call_count == 1
+    assert backend.calls == [0]
+
+    # rejection is not kept as exception
+    assert await reducer(backend.fetch(1)) == 1
+
+
+async def test_max_queued_age_rate_limit(backend):
+    reducer = AsyncReducer(rate_limit=1, max_queued_age=0.5)
+
+    results = await asyncio.gather(
+        reducer(backend.fetch(0)),
+        reducer(backend.fetch(1)),
+        return_exceptions=True,
+    )
+
+    # rejected at once without waiting for its turn
+    assert results[0] == 0
+    assert isinstance(results[1], Overloaded)
+    assert backend.calls == [0]
+
+
+async def test_max_queued_age_allowed(backend):
+    reducer = AsyncReducer(
+        max_concurrency=1, rate_limit=1000, max_queued_age=1
+    )
+
+    results = await asyncio.gather(
+        *[reducer(backend.fetch(i)) for i in range(3)]
+    )
+
+    assert results == [0, 1, 2]
+
+
+@pytest.mark.parametrize('kwargs', [{'max_in_flight': 0}, {'max_waiters': 0}])
+async def test_invalid(kwargs):
+    with pytest.raises(ValueError):
+        AsyncReducer(**kwargs)
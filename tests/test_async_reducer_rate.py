@@ -0,0 +1,106 @@
+import asyncio
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from async_reduce import AsyncReducer
+from async_reduce.hooks.base import BaseHooks
+
+pytestmark = pytest.mark.asyncio
+
+
+def freeze(reducer):
+    """
+    Stop clock of rate limiter of reducer, so delays do not depend on time of
+    execution of test.
+    """
+    now = time.monotonic()
+    reducer._rate_limiter.clock = lambda: now
+
+
+def delays(hooks):
+    return [call[0][2] for call in hooks.on_throttled_for.call_args_list]
+
+
+async def test_rate_limit(backend):
+    hooks = Mock(BaseHooks)
+    reducer = AsyncReducer(hooks, rate_limit=50)
+    freeze(reducer)
+
+    results = await asyncio.gather(
+        *[reducer(backend.fetch(i % 3)) for i in range(30)]
+    )
+
+    assert results == [i % 3 for i in range(30)]
+    # only unique executions take tokens
+    assert len(backend.calls) == 3
+    assert reducer._rate_limiter._bucket.tokens == -2
+    assert delays(hooks) == [0.02, 0.04]
+
+
+async def test_rate_limit_burst(backend):
+    hooks = Mock(BaseHooks)
+    reducer = AsyncReducer(hooks, rate_limit=10, rate_limit_burst=3)
+    freeze(reducer)
+
+    await asyncio.gather(*[reducer(backend.fetch(i)) for i in range(3)])
+
+    assert reducer._rate_limiter._bucket.tokens == 0
+    assert delays(hooks) == []
+
+
+async def test_rate_limit_per_function(backend):
+    hooks = Mock(BaseHooks)
+    reducer = AsyncReducer(hooks, rate_limit_per_function=10)
+    freeze(reducer)
+
+    await asyncio.gather(
+        reducer(backend.fetch(0)), reducer(backend.other(0))
+    )
+
+    assert delays(hooks) == []
+
+    await asyncio.gather(
+        reducer(backend.fetch(1)), reducer(backend.fetch(2))
+    )
+
+    assert len(backend.calls) == 4
+    # the first token of ``fetch`` is taken already
+    assert delays(hooks) == [0.1, 0.2]
+    assert sorted(
+        bucket.tokens for bucket in reducer._rate_limiter._buckets.values()
+    ) == [-2, 0]
+
+
+async def test_rate_limit_hooks(backend):
+    hooks = Mock(BaseHooks)
+    reducer = AsyncReducer(hooks, rate_limit=100)
+    freeze(reducer)
+
+    await asyncio.gather(
+        reducer(backend.fetch(0), ident='a'),
+        reducer(backend.fetch(1), ident='b'),
+    )
+
+    assert hooks.on_throttled_for.call_count == 1
+    _, ident, delay = hooks.on_throttled_for.call_args[0]
+    assert ident == 'b'
+    assert delay == 0.01
+
+
+async def test_rate_limit_cancel(backend):
+    reducer = AsyncReducer(rate_limit=1, abandoned='cancel')
+    freeze(reducer)
+
+    await reducer(backend.fetch(0))
+    throttled = reducer.future(backend.fetch(1))
+    await asyncio.sleep(0)
+
+    throttled.cancel()
+    await asyncio.sleep(0.01)
+
+    assert len(backend.calls) == 1
+    assert reducer._running == {}
+    # token of cancelled execution is returned
+    assert reducer._rate_limiter._bucket.tokens == 0
@@ -0,0 +1,126 @@
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from async_reduce import (
+    AsyncReducer,
+    Overloaded,
+    RetryPolicy,
+    async_reduceable,
+)
+from async_reduce.backends import MemoryBackend, MemoryBroker
+from async_reduce.hooks.base import BaseHooks
+
+pytestmark = pytest.mark.asyncio
+
+RETRY = RetryPolicy((ConnectionError,), max_attempts=3, backoff=0.001)
+
+
+def fail(backend, failures):
+    """
+    The first ``failures`` attempts of backend raise ``ConnectionError``.
+    """
+    backend.plan = [(0, ConnectionError(i + 1)) for i in range(failures)]
+
+
+def reduced(reducer, backend, arg, **kwargs):
+    return reducer(
+        backend.fetch(arg), factory=lambda: backend.fetch(arg), **kwargs
+    )
+
+
+async def test_retry(backend):
+    hooks = Mock(BaseHooks)
+    reducer = AsyncReducer(hooks, retry=RETRY)
+    fail(backend, 2)
+
+    results = await asyncio.gather(
+        *[reduced(reducer, backend, 'a') for _ in range(5)]
+    )
+
+    assert results == ['a'] * 5
+    # single sequence of retries for all waiters
+    assert backend.calls == ['a'] * 3
+    assert hooks.on_retry_for.call_count == 2
+
+    _, ident, attempt, exception, delay = hooks.on_retry_for.call_args[0]
+    assert attempt == 2
+    assert isinstance(exception, ConnectionError)
+    assert 0 <= delay <= 0.002
+    assert not hooks.on_exception_for.called
+
+
+async def test_retry_exhausted(backend):
+    reducer = AsyncReducer(retry=RETRY)
+    fail(backend, 5)
+
+    results = await asyncio.gather(
+        *[reduced(reducer, backend, 'a') for _ in range(2)],
+        return_exceptions=True,
+    )
+
+    assert [str(result) for result in results] == ['3', '3']
+    assert len(backend.calls) == 3
+
+
+async def test_retry_filtered(backend):
+    reducer = AsyncReducer(retry=RetryPolicy((ValueError,)))
+    fail(backend, 1)
+
+    with pytest.raises(ConnectionError):
+        await reduced(reducer, backend, 'a')
+
+    assert len(backend.calls) == 1
+
+
+async def test_retry_without_factory(backend):
+    reducer = AsyncReducer(retry=RETRY)
+    fail(backend, 1)
+
+    with pytest.raises(ConnectionError):
+        await reducer(backend.fetch('a'))
+
+
+async def test_retry_per_call(backend):
+    reducer = AsyncReducer()
+    fail(backend, 1)
+
+    assert await reduced(reducer, backend, 'a', retry=RETRY) == 'a'
+
+    backend.calls = []
+    assert await reducer.apply(
+        lambda: backend.fetch('b'), ident='b', retry=RETRY
+    )
+    assert backend.calls == ['b', 'b']
+
+
+async def test_retry_overloaded(backend):
+    reducer = AsyncReducer(
+        rate_limit=1, max_queued_age=0.1, retry=RetryPolicy(backoff=0)
+    )
+    fail(backend, 1)
+
+    # retry is shed by rate limit and it is not retried again
+    with pytest.raises(Overloaded):
+        await reduced(reducer, backend, 'a')
+
+    assert backend.calls == ['a']
+
+
+async def test_retry_backend(backend):
+    reducer = AsyncReducer(backend=MemoryBackend(MemoryBroker()), retry=RETRY)
+    fail(backend, 1)
+
+    assert await reduced(reducer, backend, 'a', ident='a') == 'a'
+    assert backend.calls == ['a', 'a']
+
+
+async def test_decorator_retry(backend):
+    @async_reduceable(retry=RETRY)
+    async def decorated(arg):
+        return await backend.fetch(arg)
+
+    fail(backend, 1)
+    assert await asyncio.gather(decorated('a'), decorated('a')) == ['a', 'a']
+    assert backend.calls == ['a', 'a']
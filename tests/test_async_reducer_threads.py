@@ -0,0 +1,95 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from async_reduce import AsyncReducer
+
+THREADS = 4
+
+
+def run_in_threads(reducer, coro_function, ident='foo'):
+    barrier = threading.Barrier(THREADS)
+
+    async def worker():
+        barrier.wait()
+        return await reducer(coro_function(), ident=ident)
+
+    with ThreadPoolExecutor(THREADS) as executor:
+        futures = [
+            executor.submit(asyncio.run, worker()) for _ in range(THREADS)
+        ]
+
+    return [future.exception() or future.result() for future in futures]
+
+
+def test_result_between_loops():
+    reducer = AsyncReducer()
+    loops = []
+
+    async def foo():
+        loops.append(asyncio.get_running_loop())
+        await asyncio.sleep(0.05)
+        return 'result'
+
+    assert run_in_threads(reducer, foo) == ['result'] * THREADS
+    assert len(loops) == 1
+    assert reducer._running == {}
+
+
+def test_exception_between_loops():
+    reducer = AsyncReducer()
+    calls = []
+
+    async def foo():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        raise RuntimeError('test error')
+
+    results = run_in_threads(reducer, foo)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert calls == [1]
+
+
+def test_kept_result_between_loops():
+    reducer = AsyncReducer(ttl=10)
+    calls = []
+
+    async def foo():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return 'result'
+
+    assert run_in_threads(reducer, foo) == ['result'] * THREADS
+    assert run_in_threads(reducer, foo) == ['result'] * THREADS
+    assert calls == [1]
+
+
+@pytest.mark.parametrize('count', [1, 100])
+def test_many_idents_between_loops(count):
+    reducer = AsyncReducer()
+    calls = []
+
+    async def foo(ident):
+        calls.append(ident)
+        await asyncio.sleep(0.01)
+        return ident
+
+    async def worker():
+        return await asyncio.gather(
+            *[
+                reducer(foo(i), ident='foo:{}'.format(i))
+                for i in range(count)
+            ]
+        )
+
+    with ThreadPoolExecutor(THREADS) as executor:
+        futures = [
+            executor.submit(asyncio.run, worker()) for _ in range(THREADS)
+        ]
+
+    assert all(future.result() == list(range(count)) for future in futures)
+    assert sorted(set(calls)) == list(range(count))
+    assert reducer._running == {}
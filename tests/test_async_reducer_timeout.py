@@ -0,0 +1,122 @@
+import asyncio
+from functools import partial
+from unittest.mock import Mock
+
+import pytest
+
+from async_reduce import AsyncReducer
+from async_reduce.async_reducer import _expire
+from async_reduce.backends import MemoryBackend, MemoryBroker
+from async_reduce.hooks.base import BaseHooks
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_timeout(backend):
+    reducer = AsyncReducer()
+    backend.delay = 0.05
+
+    results = await asyncio.gather(
+        reducer(backend.fetch(1), timeout=0.01),
+        reducer(backend.fetch(1)),
+        reducer(backend.fetch(1), timeout=1),
+        return_exceptions=True,
+    )
+
+    assert isinstance(results[0], asyncio.TimeoutError)
+    assert results[1:] == [1, 1]
+    assert backend.calls == [1]
+
+
+async def test_timeout_kept_result(backend):
+    reducer = AsyncReducer(ttl=10)
+
+    assert await reducer(backend.fetch(1)) == 1
+    assert await reducer(backend.fetch(1), timeout=0) == 1
+
+    assert await reducer.apply(
+        partial(backend.fetch, 2), ident='fetch:2', timeout=1
+    ) == 2
+
+
+async def test_timeout_abandoned(backend):
+    reducer = AsyncReducer(abandoned='cancel')
+    backend.delay = 1
+
+    with pytest.raises(asyncio.TimeoutError):
+        await reducer(backend.fetch(1), timeout=0.01)
+
+    await asyncio.sleep(0)
+    assert reducer._running == {}
+
+
+async def test_expire_done_waiter():
+    waiter = asyncio.get_running_loop().create_future()
+    waiter.set_result(1)
+
+    _expire(waiter)
+
+    assert waiter.result() == 1
+
+
+async def test_leader_timeout(backend):
+    hooks = Mock(BaseHooks)
+    reducer = AsyncReducer(hooks, leader_timeout=0.01)
+    backend.plan = [(0.05, None), (0, None)]
+
+    results = await asyncio.gather(
+        reducer(backend.fetch(1)),
+        reducer(backend.fetch(1)),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(r, asyncio.TimeoutError) for r in results)
+    assert backend.calls == [1]
+    assert hooks.on_exception_for.call_count == 1
+
+    # fast coroutine is not affected
+    assert await reducer(backend.fetch(2)) == 2
+
+
+async def test_leader_restarts(backend):
+    reducer = AsyncReducer(leader_timeout=0.03, leader_restarts=2)
+    backend.plan = [(1, None), (1, None)]
+
+    results = await asyncio.gather(
+        reducer.apply(partial(backend.fetch, 1), ident='fetch'),
+        reducer.apply(partial(backend.fetch, 1), ident='fetch'),
+    )
+
+    assert results == [1, 1]
+    assert backend.calls == [1, 1, 1]
+
+
+async def test_leader_restarts_exceeded(backend):
+    reducer = AsyncReducer(leader_timeout=0.01, leader_restarts=1)
+    backend.delay = 1
+
+    with pytest.raises(asyncio.TimeoutError):
+        await reducer.apply(partial(backend.fetch, 1), ident='fetch')
+    assert backend.calls == [1, 1]
+
+    # coroutine without factory is not restarted
+    with pytest.raises(asyncio.TimeoutError):
+        await reducer(backend.fetch(2))
+    assert backend.calls == [1, 1, 2]
+
+
+async def test_leader_timeout_backend(backend):
+    broker = MemoryBroker()
+    nodes = [
+        AsyncReducer(backend=MemoryBackend(broker), leader_timeout=0.01)
+        for _ in '12'
+    ]
+
+    backend.delay = 1
+    results = await asyncio.gather(
+        *[node(backend.fetch(1), ident='fetch') for node in nodes],
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(r, asyncio.TimeoutError) for r in results)
+    assert backend.calls == [1]
@@ -0,0 +1,341 @@
+import asyncio
+
+import pytest
+
+from async_reduce import AsyncReducer, async_reduceable
+from async_reduce.cache import ResultCache
+from async_reduce.hooks import StatisticsOverallHooks
+
+pytestmark = pytest.mark.asyncio
+
+
+class MyTestError(Exception):
+    pass
+
+
+async def test_result_reused_within_ttl():
+    async def foo(arg):
+        foo.await_count += 1
+        return arg
+
+    foo.await_count = 0
+
+    stats = StatisticsOverallHooks()
+    async_reduce = AsyncReducer(hooks=stats, ttl=10)
+
+    assert await async_reduce(foo(1)) == 1
+    assert await async_reduce(foo(1)) == 1
+    assert await async_reduce(foo(2)) == 2
+
+    assert foo.await_count == 2
+    assert str(stats) == 'Stats(total=3, executed=2, reduced=1, errors=0)'
+
+
+async def test_result_expired():
+    async def foo():
+        foo.await_count += 1
+        return foo.await_count
+
+    foo.await_count = 0
+
+    async_reduce = AsyncReducer(ttl=0.05)
+
+    assert await async_reduce(foo()) == 1
+    assert await async_reduce(foo()) == 1
+
+    await asyncio.sleep(0.1)
+
+    assert await async_reduce(foo()) == 2
+
+
+@pytest.mark.parametrize('reducer_ttl, call_ttl', [(None, 10), (10, 0)])
+async def test_call_ttl_overrides_reducer_ttl(reducer_ttl, call_ttl):
+    async def foo():
+        foo.await_count += 1
+        return foo.await_count
+
+    foo.await_count = 0
+
+    async_reduce = AsyncReducer(ttl=reducer_ttl)
+
+    await async_reduce(foo(), ttl=call_ttl)
+    await async_reduce(foo(), ttl=call_ttl)
+
+    assert foo.await_count == (1 if call_ttl else 2)
+
+
+async def test_exception_not_kept():
+    async def foo():
+        foo.await_count += 1
+        raise RuntimeError('test error')
+
+    foo.await_count = 0
+
+    async_reduce = AsyncReducer(ttl=10)
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            await async_reduce(foo())
+
+    assert foo.await_count == 2
+
+
+async def test_cache_size():
+    async def foo(arg):
+        foo.await_count += 1
+        return arg
+
+    foo.await_count = 0
+
+    async_reduce = AsyncReducer(ttl=10, cache_size=2)
+
+    for arg in (1, 2, 1, 3, 1, 2):
+        await async_reduce(foo(arg))
+
+    # 2 has been evicted by 3 as the least recently used
+    assert foo.await_count == 4
+
+
+@pytest.mark.parametrize('calls, refreshed', [(1, False), (2, True)])
+async def test_refresh_ahead(calls, refreshed):
+    stats = StatisticsOverallHooks()
+    async_reduce = AsyncReducer(
+        hooks=stats, ttl=0.1, refresh_ahead=0.5, refresh_ahead_hits=1
+    )
+
+    @async_reduceable(async_reduce)
+    async def foo():
+        foo.await_count += 1
+        return foo.await_count
+
+    foo.await_count = 0
+
+    for _ in range(calls):
+        assert await foo() == 1
+
+    await asyncio.sleep(0.07)
+
+    assert foo.await_count == (2 if refreshed else 1)
+    assert stats.executed == foo.await_count
+
+
+async def test_refresh_ahead_without_room():
+    async_reduce = AsyncReducer(
+        ttl=0.1, refresh_ahead=0.5, refresh_ahead_hits=1, max_in_flight=1
+    )
+    event = asyncio.Event()
+
+    @async_reduceable(async_reduce)
+    async def foo():
+        foo.await_count += 1
+        return foo.await_count
+
+    foo.await_count = 0
+
+    for _ in range(2):
+        assert await foo() == 1
+
+    # the only place in flight is taken by other coroutine
+    waiter = async_reduce(event.wait())
+
+    await asyncio.sleep(0.07)
+
+    assert foo.await_count == 1
+    assert len(async_reduce._running) == 1
+
+    event.set()
+    await waiter
+
+
+async def test_refresh_ahead_bad_value():
+    for value in (0, 1, 2):
+        with pytest.raises(ValueError):
+            AsyncReducer(refresh_ahead=value)
+
+
+async def test_result_cache():
+    cache = ResultCache(maxsize=1)
+    future = asyncio.Future()
+
+    assert 'a' not in cache
+
+    cache.set('a', future, 10)
+    assert 'a' in cache
+    assert cache.get('a') is future
+
+    cache.set('b', future, 0)
+    assert len(cache) == 1
+    assert 'a' not in cache
+    assert 'b' not in cache
+    assert len(cache) == 0
+
+    cache.set('s', future, 0, 10)
+    assert 's' not in cache
+    assert cache.lookup('s') == (future, True)
+
+    cache.set('c', future, 10)
+    cache.pop('c')
+    cache.pop('c')
+    assert len(cache) == 0
+
+    cache.set('d', future, 10)
+    cache.clear()
+    assert len(cache) == 0
+
+    loop = asyncio.get_running_loop()
+    handlers = []
+    for ident in ('e', 'f', 'f', 'g'):
+        entry = cache.set(ident, future, 10)
+        entry.timer = loop.call_later(10, print)
+        handlers.append(entry.timer)
+    cache.clear()
+    entry = cache.set('h', future, 0)
+    entry.timer = loop.call_later(10, print)
+    handlers.append(entry.timer)
+    assert 'h' not in cache
+
+    assert all(handler.cancelled() for handler in handlers)
+
+    with pytest.raises(ValueError):
+        ResultCache(maxsize=0)
+
+
+async def test_stale_while_revalidate():
+    async def foo():
+        foo.await_count += 1
+        await asyncio.sleep(0.01)
+        return foo.await_count
+
+    foo.await_count = 0
+
+    stats = StatisticsOverallHooks()
+    async_reduce = AsyncReducer(hooks=stats, ttl=0.05, stale_ttl=10)
+
+    assert await async_reduce(foo()) == 1
+
+    await asyncio.sleep(0.1)
+
+    # stale result is returned immediately while single refresh is running
+    results = await asyncio.gather(*[async_reduce(foo()) for _ in range(5)])
+    assert results == [1] * 5
+    assert foo.await_count == 2
+
+    await asyncio.sleep(0.02)
+
+    assert await async_reduce(foo()) == 2
+    assert foo.await_count == 2
+    assert str(stats) == 'Stats(total=7, executed=2, reduced=5, errors=0)'
+
+
+async def test_stale_refresh_failed():
+    async def foo():
+        foo.await_count += 1
+        if foo.await_count > 1:
+            raise RuntimeError('test error')
+        return foo.await_count
+
+    foo.await_count = 0
+
+    async_reduce = AsyncReducer(ttl=0.05, stale_ttl=10)
+
+    assert await async_reduce(foo()) == 1
+
+    await asyncio.sleep(0.1)
+
+    # stale result is kept when refresh failed
+    for _ in range(2):
+        assert await async_reduce(foo()) == 1
+        await asyncio.sleep(0)
+
+    assert foo.await_count == 3
+
+
+async def test_stale_expired():
+    async def foo():
+        foo.await_count += 1
+        return foo.await_count
+
+    foo.await_count = 0
+
+    async_reduce = AsyncReducer(ttl=0.05, stale_ttl=0.05)
+
+    assert await async_reduce(foo()) == 1
+
+    await asyncio.sleep(0.15)
+
+    assert await async_reduce(foo()) == 2
+
+
+@pytest.mark.parametrize(
+    'error, kept',
+    [
+        (MyTestError, True),
+        (RuntimeError, False),
+        (asyncio.CancelledError, False),
+    ],
+)
+async def test_negative_ttl(error, kept):
+    async def foo():
+        foo.await_count += 1
+        raise error('test error')
+
+    foo.await_count = 0
+
+    stats = StatisticsOverallHooks()
+    async_reduce = AsyncReducer(
+        hooks=stats,
+        negative_ttl=10,
+        negative_exceptions=(MyTestError, asyncio.CancelledError),
+    )
+
+    for _ in range(3):
+        results = await asyncio.gather(
+            async_reduce(foo()), return_exceptions=True
+        )
+        assert isinstance(results[0], error)
+
+    assert foo.await_count == (1 if kept else 3)
+    assert stats.reduced == (2 if kept else 0)
+
+
+async def test_negative_ttl_expired():
+    async def foo():
+        foo.await_count += 1
+        raise MyTestError('test error')
+
+    foo.await_count = 0
+
+    async_reduce = AsyncReducer(negative_ttl=0.05)
+
+    for _ in range(2):
+        with pytest.raises(MyTestError):
+            await async_reduce(foo())
+
+    await asyncio.sleep(0.1)
+
+    with pytest.raises(MyTestError):
+        await async_reduce(foo())
+
+    assert foo.await_count == 2
+
+
+async def test_negative_ttl_keeps_stale_result():
+    async def foo():
+        foo.await_count += 1
+        if foo.await_count > 1:
+            raise MyTestError('test error')
+        return foo.await_count
+
+    foo.await_count = 0
+
+    async_reduce = AsyncReducer(ttl=0.05, stale_ttl=10, negative_ttl=10)
+
+    assert await async_reduce(foo()) == 1
+
+    await asyncio.sleep(0.1)
+
+    for _ in range(2):
+        assert await async_reduce(foo()) == 1
+        await asyncio.sleep(0)
+
+    assert foo.await_count == 3
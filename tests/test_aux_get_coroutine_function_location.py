@@ -64,3 +64,49 @@ async def test_unmatched_with_sys_path(monkeypatch, value):
     assert result == '<unknown module>:coro_function'
 
     coro.close()
+
+
+async def test_function():
+    from async_reduce.aux import get_function_location
+
+    result = get_function_location(coro_function)
+    assert result == (
+        'tests.test_aux_get_coroutine_function_location:coro_function'
+    )
+
+
+async def test_cached():
+    from async_reduce import aux
+
+    coro = coro_function()
+    location = aux.get_coroutine_function_location(coro)
+    coro.close()
+
+    hits = aux._get_code_location.cache_info().hits
+
+    coro = coro_function()
+    assert aux.get_coroutine_function_location(coro) == location
+    coro.close()
+
+    assert aux._get_code_location.cache_info().hits == hits + 1
+
+
+async def test_sys_path_changed(monkeypatch):
+    from async_reduce import aux
+
+    coro = coro_function()
+    assert aux.get_coroutine_function_location(coro) == (
+        'tests.test_aux_get_coroutine_function_location:coro_function'
+    )
+
+    monkeypatch.setattr('sys.path', ['/other/'])
+    assert aux.get_coroutine_function_location(coro) == (
+        '<unknown module>:coro_function'
+    )
+
+    monkeypatch.undo()
+    assert aux.get_coroutine_function_location(coro) == (
+        'tests.test_aux_get_coroutine_function_location:coro_function'
+    )
+
+    coro.close()
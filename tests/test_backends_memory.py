@@ -0,0 +1,184 @@
+import asyncio
+
+import pytest
+
+from async_reduce import AsyncReducer
+from async_reduce.backends import (
+    BaseBackend,
+    MemoryBackend,
+    MemoryBroker,
+    Outcome,
+)
+from async_reduce.backends.base import PendingJoins
+from async_reduce.hooks import StatisticsOverallHooks
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_shared():
+    calls = []
+
+    async def foo():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return 'result'
+
+    broker = MemoryBroker()
+    stats = StatisticsOverallHooks()
+    nodes = [AsyncReducer(stats, backend=MemoryBackend(broker)) for _ in '123']
+
+    results = await asyncio.gather(
+        *[node(foo(), ident='foo') for node in nodes]
+    )
+
+    assert results == ['result'] * 3
+    assert calls == [1]
+    assert str(stats) == 'Stats(total=3, executed=1, reduced=2, errors=0)'
+
+
+async def test_shared_exception():
+    async def foo():
+        await asyncio.sleep(0.01)
+        raise ValueError('test error')
+
+    broker = MemoryBroker()
+    stats = StatisticsOverallHooks()
+    nodes = [AsyncReducer(stats, backend=MemoryBackend(broker)) for _ in '12']
+
+    results = await asyncio.gather(
+        *[node(foo(), ident='foo') for node in nodes], return_exceptions=True
+    )
+
+    assert all(isinstance(res, ValueError) for res in results)
+    assert str(stats) == 'Stats(total=2, executed=0, reduced=1, errors=1)'
+
+
+async def test_lease():
+    async def foo(result, delay):
+        await asyncio.sleep(delay)
+        return result
+
+    broker = MemoryBroker(lease=0.05)
+    nodes = [AsyncReducer(backend=MemoryBackend(broker)) for _ in '12']
+
+    leader = nodes[0](foo('leader', 0.2), ident='foo')
+    await asyncio.sleep(0.01)
+    follower = nodes[1](foo('follower', 0), ident='foo')
+
+    # follower becomes the leader after expiration of lease
+    assert await follower == 'follower'
+    assert await leader == 'leader'
+
+    # late outcome of expired leader is ignored
+    await asyncio.sleep(0.01)
+    assert broker._leaders == {}
+    assert broker._leases == {}
+
+
+async def test_leader_cancelled():
+    async def cancelled():
+        await asyncio.sleep(0.01)
+        raise asyncio.CancelledError()
+
+    async def foo():
+        return 'result'
+
+    broker = MemoryBroker()
+    nodes = [AsyncReducer(backend=MemoryBackend(broker)) for _ in '12']
+
+    leader = nodes[0](cancelled(), ident='foo')
+    follower = nodes[1](foo(), ident='foo')
+
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+    assert await follower == 'result'
+
+
+async def test_closed():
+    async def foo(result):
+        await asyncio.sleep(0.01)
+        return result
+
+    broker = MemoryBroker()
+    backends = [MemoryBackend(broker) for _ in '12']
+    nodes = [AsyncReducer(backend=backend) for backend in backends]
+
+    leader = nodes[0](foo('leader'), ident='foo')
+    await asyncio.sleep(0)
+    follower = nodes[1](foo('follower'), ident='foo')
+    await asyncio.sleep(0)
+
+    await backends[0].close()
+
+    assert await leader == 'leader'
+    assert await follower == 'follower'
+
+    # closed follower executes coroutine locally
+    leader = nodes[0](foo('leader'), ident='bar')
+    await asyncio.sleep(0)
+    follower = nodes[1](foo('follower'), ident='bar')
+    await asyncio.sleep(0)
+
+    await backends[1].close()
+
+    assert await leader == 'leader'
+    assert await follower == 'follower'
+
+
+async def test_lead_without_waiter():
+    broker = MemoryBroker()
+    backends = [MemoryBackend(broker) for _ in '12']
+
+    assert await backends[0].join('foo') is None
+
+    follower = asyncio.ensure_future(backends[1].join('foo'))
+    await asyncio.sleep(0)
+    follower.cancel()
+    await asyncio.sleep(0)
+
+    # leadership is passed to the follower which does not wait anymore, so
+    # it is released back
+    await backends[0].release('foo')
+    assert broker._leaders == {}
+
+    assert await backends[0].join('foo') is None
+    await backends[0].publish('foo', Outcome(result='result'))
+
+
+async def test_broken_backend():
+    class BrokenBackend(BaseBackend):
+        async def join(self, ident):
+            raise RuntimeError('broken')
+
+    async def foo():
+        return 'result'
+
+    reducer = AsyncReducer(backend=BrokenBackend())
+
+    with pytest.raises(RuntimeError, match='broken'):
+        await reducer(foo(), ident='foo')
+
+
+async def test_pending_joins():
+    pending = PendingJoins()
+
+    assert pending.resolve('foo', None) is False
+
+    future = pending.add('foo')
+    assert pending.resolve('foo', 'outcome') is True
+    assert await future == 'outcome'
+
+
+async def test_unavailable_backend():
+    class UnavailableBackend(BaseBackend):
+        async def join(self, ident):
+            raise ConnectionError()
+
+    async def cancelled():
+        raise asyncio.CancelledError()
+
+    reducer = AsyncReducer(backend=UnavailableBackend())
+
+    with pytest.raises(asyncio.CancelledError):
+        await reducer(cancelled(), ident='foo')
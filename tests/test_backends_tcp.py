@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from async_reduce import AsyncReducer
+from async_reduce.backends import Outcome, TCPBackend, TCPBroker
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest_asyncio.fixture
+async def broker():
+    broker = TCPBroker('127.0.0.1', 0, lease=10)
+    await broker.start()
+    yield broker
+    await broker.close()
+
+
+async def test_shared(broker):
+    calls = []
+
+    async def foo():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return 'result'
+
+    backends = [
+        TCPBackend(broker.host, broker.port, secret=b'secret') for _ in '12'
+    ]
+    nodes = [AsyncReducer(backend=backend) for backend in backends]
+
+    results = await asyncio.gather(
+        *[node(foo(), ident='foo') for node in nodes]
+    )
+
+    assert results == ['result', 'result']
+    assert calls == [1]
+
+    for backend in backends:
+        await backend.close()
+
+    await broker.close()
+
+
+async def test_wrong_secret(broker):
+    async def foo():
+        await asyncio.sleep(0.05)
+        return 'result'
+
+    backends = [
+        TCPBackend(broker.host, broker.port, secret=secret)
+        for secret in (b'secret', b'wrong')
+    ]
+    nodes = [AsyncReducer(backend=backend) for backend in backends]
+
+    results = await asyncio.gather(
+        *[node(foo(), ident='foo') for node in nodes], return_exceptions=True
+    )
+
+    assert results[0] == 'result'
+    assert isinstance(results[1], RuntimeError)
+    assert str(results[1]) == 'Outcome of the leader has wrong signature'
+
+    for backend in backends:
+        await backend.close()
+
+
+async def test_signature_of_ident():
+    backend = TCPBackend('127.0.0.1', 0, secret=b'secret')
+    blob = backend._dumps('foo', Outcome(result='result'))
+
+    assert backend._loads('foo', blob).result == 'result'
+
+    # outcome of one ident is not accepted for other one
+    outcome = backend._loads('bar', blob)
+    assert isinstance(outcome.exception, RuntimeError)
+    assert str(outcome.exception) == (
+        'Outcome of the leader has wrong signature'
+    )
@@ -0,0 +1,331 @@
+import asyncio
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+import pytest_asyncio
+
+from async_reduce import AsyncReducer
+from async_reduce.backends import Broker, Outcome, UnixSocketBackend
+from async_reduce.backends.stream import _pack
+from async_reduce.hooks import StatisticsOverallHooks
+
+pytestmark = [
+    pytest.mark.asyncio,
+    pytest.mark.skipif(
+        sys.platform == 'win32', reason='unix sockets are not available'
+    ),
+]
+
+
+@pytest.fixture
+def path():
+    directory = tempfile.mkdtemp()
+    yield os.path.join(directory, 'broker.sock')
+    shutil.rmtree(directory)
+
+
+@pytest_asyncio.fixture
+async def broker(path):
+    broker = Broker(path)
+    await broker.start()
+    yield broker
+    await broker.close()
+
+
+@pytest_asyncio.fixture
+async def backends(broker):
+    backends = [UnixSocketBackend(broker.path) for _ in range(2)]
+    yield backends
+    for backend in backends:
+        await backend.close()
+
+
+async def test_shared(backends):
+    calls = []
+
+    async def foo():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return 'result'
+
+    stats = StatisticsOverallHooks()
+    reducers = [AsyncReducer(stats, backend=backend) for backend in backends]
+
+    results = await asyncio.gather(
+        *[reducer(foo(), ident='foo') for reducer in reducers]
+    )
+
+    assert results == ['result', 'result']
+    assert calls == [1]
+    assert str(stats) == 'Stats(total=2, executed=1, reduced=1, errors=0)'
+
+
+async def test_shared_exception(backends):
+    async def foo():
+        await asyncio.sleep(0.05)
+        raise ValueError('test error')
+
+    reducers = [AsyncReducer(backend=backend) for backend in backends]
+
+    results = await asyncio.gather(
+        *[reducer(foo(), ident='foo') for reducer in reducers],
+        return_exceptions=True,
+    )
+
+    for res in results:
+        assert isinstance(res, ValueError)
+        assert str(res) == 'test error'
+
+
+async def test_shared_unpicklable(backends):
+    async def foo():
+        await asyncio.sleep(0.05)
+        return lambda: None
+
+    reducers = [AsyncReducer(backend=backend) for backend in backends]
+
+    results = await asyncio.gather(
+        *[reducer(foo(), ident='foo') for reducer in reducers],
+        return_exceptions=True,
+    )
+
+    assert callable(results[0])
+    assert isinstance(results[1], RuntimeError)
+    assert str(results[1]).startswith('Unable to share outcome:')
+
+
+async def test_leader_cancelled(backends):
+    async def cancelled():
+        await asyncio.sleep(0.1)
+        raise asyncio.CancelledError()
+
+    async def foo():
+        return 'result'
+
+    leader = AsyncReducer(backend=backends[0])(cancelled(), ident='foo')
+    await asyncio.sleep(0.05)
+
+    follower = AsyncReducer(backend=backends[1])(foo(), ident='foo')
+
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+    # leadership is released to the follower
+    assert await follower == 'result'
+
+
+async def test_leader_disconnected(backends):
+    calls = []
+
+    async def foo(delay):
+        calls.append(delay)
+        await asyncio.sleep(delay)
+        return delay
+
+    reducer = AsyncReducer(backend=backends[0])
+    leader = reducer(foo(0.3), ident='foo')
+    await asyncio.sleep(0.05)
+
+    follower = AsyncReducer(backend=backends[1])(foo(0.01), ident='foo')
+    await asyncio.sleep(0.05)
+
+    await backends[0].close()
+
+    assert await follower == 0.01
+    assert calls == [0.3, 0.01]
+
+    # leader still gets its own result
+    assert await leader == 0.3
+
+
+async def test_broker_unavailable(path):
+    async def foo():
+        return 'result'
+
+    backend = UnixSocketBackend(path)
+    reducer = AsyncReducer(backend=backend)
+
+    assert await reducer(foo(), ident='foo') == 'result'
+
+
+async def test_broker_closed(broker, backends):
+    async def foo():
+        await asyncio.sleep(0.1)
+        return 'result'
+
+    leader = AsyncReducer(backend=backends[0])(foo(), ident='foo')
+    await asyncio.sleep(0.05)
+
+    follower = AsyncReducer(backend=backends[1])(foo(), ident='foo')
+    await asyncio.sleep(0.01)
+
+    await broker.close()
+
+    # both are finished locally
+    assert await asyncio.gather(leader, follower) == ['result', 'result']
+
+    # closed broker is closed silently
+    await broker.close()
+    await backends[0].close()
+
+
+async def test_broker_stale_socket(path):
+    open(path, 'w').close()
+
+    broker = Broker(path)
+    task = asyncio.ensure_future(broker.serve_forever())
+    await asyncio.sleep(0.05)
+
+    backend = UnixSocketBackend(path)
+    assert await backend.join('foo') is None
+    await backend.close()
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert not os.path.exists(path)
+
+
+async def test_broker_unknown_message(broker, backends):
+    reader, writer = await asyncio.open_unix_connection(broker.path)
+    writer.write(_pack(255, 'foo'))
+    writer.close()
+    await writer.wait_closed()
+
+    assert await backends[0].join('foo') is None
+
+
+async def test_followers_queue(broker, path):
+    backends = [UnixSocketBackend(path) for _ in range(4)]
+
+    assert await backends[0].join('foo') is None
+
+    followers = [
+        asyncio.ensure_future(backend.join('foo')) for backend in backends[1:]
+    ]
+    cancelled = asyncio.ensure_future(backends[1].join('foo'))
+    await asyncio.sleep(0.05)
+    cancelled.cancel()
+
+    # disconnected follower is removed from queue
+    await backends[1].close()
+    with pytest.raises(ConnectionError):
+        await followers[0]
+
+    await backends[0].release('foo')
+    assert await followers[1] is None
+
+    await backends[2].publish('foo', Outcome(result='result'))
+    outcome = await followers[2]
+    assert outcome.unwrap() == 'result'
+
+    assert await backends[2].join('bar') is None
+    follower = asyncio.ensure_future(backends[3].join('bar'))
+    await asyncio.sleep(0.05)
+    await backends[3].close()
+    with pytest.raises(ConnectionError):
+        await follower
+
+    for backend in backends:
+        await backend.close()
+
+
+async def test_same_backend(backends):
+    backend = backends[0]
+
+    # joins are sent once connection is established
+    leader = asyncio.ensure_future(backend.join('foo'))
+    follower = asyncio.ensure_future(backend.join('foo'))
+    assert await leader is None
+
+    cancelled = asyncio.ensure_future(backend.join('foo'))
+    await asyncio.sleep(0.05)
+    cancelled.cancel()
+
+    await backend.publish('foo', Outcome(result='result'))
+    outcome = await follower
+    assert outcome.unwrap() == 'result'
+
+    # outcome for cancelled follower is ignored
+    await asyncio.sleep(0.05)
+    assert await backend.join('foo') is None
+
+
+async def test_lead_without_waiter(backends):
+    assert await backends[0].join('foo') is None
+
+    follower = asyncio.ensure_future(backends[1].join('foo'))
+    await asyncio.sleep(0.05)
+    follower.cancel()
+
+    # leadership is passed to the follower which does not wait anymore
+    await backends[0].release('foo')
+    await asyncio.sleep(0.05)
+
+    # so it is released back
+    assert await backends[0].join('foo') is None
+
+
+async def test_publish_not_leader(backends):
+    assert await backends[0].join('foo') is None
+
+    follower = asyncio.ensure_future(backends[1].join('foo'))
+    await asyncio.sleep(0.05)
+
+    # ignored messages from not leader
+    await backends[1].publish('foo', Outcome(result='wrong'))
+    await backends[1].release('foo')
+    await asyncio.sleep(0.05)
+    assert not follower.done()
+
+    await backends[0].publish('foo', Outcome(result='result'))
+    outcome = await follower
+    assert outcome.unwrap() == 'result'
+
+
+def _worker(path, barrier, output):
+    async def foo():
+        with open(output, 'a') as f:
+            f.write('{}\n'.format(os.getpid()))
+        await asyncio.sleep(0.2)
+        return 'result'
+
+    async def amain():
+        backend = UnixSocketBackend(path)
+        await backend.join('warmup')
+        await backend.release('warmup')
+
+        barrier.wait()
+        reducer = AsyncReducer(backend=backend)
+        result = await reducer(foo(), ident='foo')
+        await backend.close()
+        return result
+
+    assert asyncio.run(amain()) == 'result'
+
+
+async def test_processes(broker, path):
+    output = os.path.join(os.path.dirname(path), 'output')
+    open(output, 'w').close()
+
+    ctx = multiprocessing.get_context('spawn')
+    barrier = ctx.Barrier(3)
+    processes = [
+        ctx.Process(target=_worker, args=(path, barrier, output))
+        for _ in range(3)
+    ]
+    for process in processes:
+        process.start()
+
+    loop = asyncio.get_running_loop()
+    for process in processes:
+        await loop.run_in_executor(None, process.join, 30)
+        assert process.exitcode == 0
+
+    with open(output) as f:
+        assert len(f.read().split()) == 1
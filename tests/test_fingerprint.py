@@ -0,0 +1,275 @@
+import asyncio
+import collections
+import dataclasses
+import enum
+import os
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from async_reduce import AsyncReducer, async_reduceable
+from async_reduce.aux import render_ident
+from async_reduce.fingerprint import Fingerprint, fingerprint, register
+
+pytestmark = pytest.mark.asyncio
+
+
+class Color(enum.Enum):
+    RED = 1
+    GREEN = 2
+
+
+@dataclasses.dataclass
+class Point:
+    x: int
+    y: int
+    label: str = dataclasses.field(default='', compare=False)
+
+
+@dataclasses.dataclass
+class Size:
+    width: int
+    height: int
+
+
+class PydanticModel:
+    model_fields = {'id': None, 'tags': None}
+
+    def __init__(self, id, tags):
+        self.id = id
+        self.tags = tags
+
+
+class AttrsModel:
+    __attrs_attrs__ = (SimpleNamespace(name='id'),)
+
+    def __init__(self, id):
+        self.id = id
+
+
+VALUES = [
+    None,
+    True,
+    False,
+    0,
+    1,
+    -1,
+    2 ** 100,
+    0.0,
+    1.0,
+    float('inf'),
+    1j,
+    '',
+    '1',
+    'foo',
+    b'',
+    b'1',
+    (),
+    (1,),
+    (1, 2),
+    ((1,), 2),
+    (1, (2,)),
+    ('a', 'b'),
+    ('ab',),
+    frozenset(),
+    frozenset([1, 2]),
+    Color.RED,
+    Color.GREEN,
+    [],
+    [1, 2],
+    {},
+    {1: 2},
+    {2: 1},
+    {'a': [1, {'b': (2,)}]},
+    Point(1, 2),
+    Point(2, 1),
+    Size(1, 2),
+]
+
+
+async def test_fingerprint_distinct():
+    fingerprints = [fingerprint(value) for value in VALUES]
+
+    assert len(set(fingerprints)) == len(VALUES)
+    assert all(len(fp) == 32 for fp in fingerprints)
+
+
+async def test_fingerprint_set_order():
+    values = ['foo{}'.format(i) for i in range(100)]
+
+    assert fingerprint(frozenset(values)) == fingerprint(
+        frozenset(reversed(values))
+    )
+
+
+async def test_fingerprint_key():
+    keyed = Fingerprint(key=b'secret', digest_size=8)
+
+    assert keyed('foo') != fingerprint('foo')
+    assert len(keyed('foo')) == 16
+
+
+@pytest.mark.parametrize('value', [object(), [object()], {1: lambda: 2}])
+async def test_fingerprint_unsupported(value):
+    with pytest.raises(TypeError, match='Unable to fingerprint object'):
+        fingerprint(value)
+
+
+async def test_fingerprint_containers():
+    assert fingerprint({'a': 1, 'b': 2}) == fingerprint({'b': 2, 'a': 1})
+    assert fingerprint({1, 2, 3}) == fingerprint(frozenset([3, 2, 1]))
+    assert fingerprint([1, 2]) != fingerprint((1, 2))
+
+    # fields which are not compared are ignored
+    assert fingerprint(Point(1, 2, 'a')) == fingerprint(Point(1, 2, 'b'))
+
+
+async def test_fingerprint_models():
+    assert fingerprint(PydanticModel(1, ['a'])) == fingerprint(
+        PydanticModel(1, ['a'])
+    )
+    assert fingerprint(PydanticModel(1, ['a'])) != fingerprint(
+        PydanticModel(1, ['b'])
+    )
+    assert fingerprint(AttrsModel(1)) != fingerprint(AttrsModel(2))
+    assert fingerprint(AttrsModel(1)) != fingerprint(PydanticModel(1, None))
+
+
+async def test_fingerprint_subclasses():
+    Pair = collections.namedtuple('Pair', 'a b')
+
+    class Name(str):
+        pass
+
+    class Level(enum.IntEnum):
+        LOW = 1
+
+    assert fingerprint(Pair(1, 2)) == fingerprint((1, 2))
+    assert fingerprint(Name('foo')) == fingerprint('foo')
+    assert fingerprint(collections.OrderedDict(a=1)) == fingerprint({'a': 1})
+    assert fingerprint(Level.LOW) != fingerprint(1)
+
+
+async def test_fingerprint_register():
+    class Money:
+        def __init__(self, amount):
+            self.amount = amount
+
+    class Dollars(Money):
+        pass
+
+    with pytest.raises(TypeError):
+        fingerprint(Money(1))
+
+    register(Money, lambda obj: obj.amount)
+
+    assert fingerprint(Money(1)) == fingerprint(Money(1))
+    assert fingerprint(Money(1)) != fingerprint(Money(2))
+    assert fingerprint(Money(1)) != fingerprint(1)
+    assert fingerprint(Dollars(1)) != fingerprint(Money(1))
+
+
+async def test_fingerprint_limits():
+    nested = []
+    for _ in range(10):
+        nested = [nested]
+
+    limited = Fingerprint(max_depth=5, max_size=100)
+
+    with pytest.raises(TypeError, match='nested deeper than 5'):
+        limited(nested)
+
+    with pytest.raises(TypeError, match='more than 100 items'):
+        limited(list(range(100)))
+
+    recursive = []
+    recursive.append(recursive)
+
+    with pytest.raises(TypeError, match='nested deeper than 32'):
+        fingerprint(recursive)
+
+
+async def test_fingerprint_fallback_hash():
+    obj = object()
+    structural = Fingerprint(fallback_hash=True)
+
+    assert structural({'a': obj}) == structural({'a': obj})
+    assert structural({'a': obj}) != structural({'a': object()})
+
+    with pytest.raises(TypeError):
+        structural({'a': bytearray()})
+
+
+async def test_fingerprint_between_processes():
+    code = (
+        'from async_reduce.fingerprint import fingerprint;'
+        'print(fingerprint((1, "foo", frozenset(["a", "b", "c"]))))'
+    )
+
+    results = set()
+    for seed in ('1', '2'):
+        env = dict(os.environ, PYTHONHASHSEED=seed)
+        output = subprocess.check_output([sys.executable, '-c', code], env=env)
+        results.add(output.strip().decode())
+
+    assert results == {fingerprint((1, 'foo', frozenset(['a', 'b', 'c'])))}
+
+
+async def fetch(arg):
+    fetch.await_count += 1
+    await asyncio.sleep(0)
+    return arg
+
+
+async def test_reducer_fingerprint():
+    fetch.await_count = 0
+    reducer = AsyncReducer(fingerprint=fingerprint)
+
+    results = await asyncio.gather(reducer(fetch('a')), reducer(fetch('a')))
+
+    assert results == ['a', 'a']
+    assert fetch.await_count == 1
+
+    coro = fetch('a')
+    assert render_ident(reducer._auto_ident(coro)) == (
+        'tests.test_fingerprint:fetch(<state_hash:{}>)'.format(
+            fingerprint((('arg', 'a'),))
+        )
+    )
+    coro.close()
+
+    # unhashable arguments are supported
+    results = await asyncio.gather(
+        reducer(fetch({'a': [1]})), reducer(fetch({'a': [1]}))
+    )
+    assert results == [{'a': [1]}, {'a': [1]}]
+    assert fetch.await_count == 2
+
+    coro = fetch(object())
+    with pytest.raises(TypeError, match='Unable to auto calculate identity'):
+        reducer(coro)
+    coro.close()
+
+
+async def test_decorator_fingerprint():
+    reducer = AsyncReducer(fingerprint=fingerprint)
+
+    @async_reduceable(reducer)
+    async def foo(arg, *, kwarg):
+        foo.await_count += 1
+        await asyncio.sleep(0)
+        return arg, kwarg
+
+    foo.await_count = 0
+
+    results = await asyncio.gather(foo(1, kwarg=2), foo(1, kwarg=2))
+
+    assert results == [(1, 2), (1, 2)]
+    assert foo.await_count == 1
+
+    results = await asyncio.gather(foo([1], kwarg={}), foo([1], kwarg={}))
+
+    assert results == [([1], {}), ([1], {})]
+    assert foo.await_count == 2
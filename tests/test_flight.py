@@ -0,0 +1,89 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from async_reduce.flight import Flight
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.mark.parametrize('count', [1, 2, 100])
+async def test_result(count):
+    flight = Flight()
+    waiters = [flight.add_waiter() for _ in range(count)]
+    waiters[0].cancel()
+
+    flight.set_result('result')
+
+    assert waiters[0].cancelled()
+    assert all(waiter.result() == 'result' for waiter in waiters[1:])
+    assert flight.waiters == []
+
+    assert await flight.add_waiter() == 'result'
+
+
+@pytest.mark.parametrize('count', [1, 2, 100])
+async def test_exception(count):
+    flight = Flight()
+    waiters = [flight.add_waiter() for _ in range(count)]
+    waiters[0].cancel()
+
+    error = RuntimeError('test error')
+    flight.set_exception(error)
+
+    assert waiters[0].cancelled()
+    assert all(waiter.exception() is error for waiter in waiters[1:])
+    assert flight.waiters == []
+
+    with pytest.raises(RuntimeError):
+        await flight.add_waiter()
+
+
+async def test_cancelled_waiter_does_not_affect_others():
+    flight = Flight()
+    waiter_1 = flight.add_waiter()
+    waiter_2 = flight.add_waiter()
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(waiter_1, 0.01)
+
+    flight.set_result('result')
+
+    assert waiter_1.cancelled()
+    assert await waiter_2 == 'result'
+
+
+async def test_waiter_of_other_loop():
+    flight = Flight()
+    added = threading.Event()
+
+    async def wait():
+        waiter = flight.add_waiter()
+        added.set()
+        return await waiter
+
+    with ThreadPoolExecutor(1) as executor:
+        future = executor.submit(asyncio.run, wait())
+        await asyncio.get_running_loop().run_in_executor(None, added.wait)
+
+        flight.set_result('result')
+
+    assert future.result() == 'result'
+
+
+async def test_waiter_of_closed_loop():
+    flight = Flight()
+
+    async def add_waiter():
+        return flight.add_waiter()
+
+    waiter = await asyncio.get_running_loop().run_in_executor(
+        None, asyncio.run, add_waiter()
+    )
+
+    flight.set_result('result')
+
+    assert not waiter.done()
+    assert flight.waiters == []
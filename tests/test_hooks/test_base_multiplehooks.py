@@ -82,6 +82,37 @@ class CounterHooks(BaseHooks):
     ) -> None:
         self.calls_counter['on_exception_for'] += 1
 
+    def on_abandoned_for(self, coro: Coroutine, ident: str) -> None:
+        self.calls_counter['on_abandoned_for'] += 1
+
+    def on_throttled_for(
+        self, coro: Coroutine, ident: str, delay: float
+    ) -> None:
+        self.calls_counter['on_throttled_for'] += 1
+
+    def on_rejected_for(
+        self, coro: Coroutine, ident: str, exception: Exception
+    ) -> None:
+        self.calls_counter['on_rejected_for'] += 1
+
+    def on_hedged_for(self, coro: Coroutine, ident: str, delay: float) -> None:
+        self.calls_counter['on_hedged_for'] += 1
+
+    def on_hedge_settled_for(
+        self, coro: Coroutine, ident: str, loser: Coroutine
+    ) -> None:
+        self.calls_counter['on_hedge_settled_for'] += 1
+
+    def on_retry_for(
+        self,
+        coro: Coroutine,
+        ident: str,
+        attempt: int,
+        exception: Exception,
+        delay: float,
+    ) -> None:
+        self.calls_counter['on_retry_for'] += 1
+
 
 @pytest.mark.parametrize('count', [0, 1, 2, 255])
 def test_multiple_hooks(count):
@@ -101,6 +132,12 @@ def test_multiple_hooks(count):
     hooks.on_reducing_for(coro, 'ident')
     hooks.on_result_for(coro, 'ident', None)
     hooks.on_exception_for(coro, 'ident', RuntimeError('test'))
+    hooks.on_abandoned_for(coro, 'ident')
+    hooks.on_throttled_for(coro, 'ident', 0.1)
+    hooks.on_rejected_for(coro, 'ident', RuntimeError('test'))
+    hooks.on_hedged_for(coro, 'ident', 0.1)
+    hooks.on_hedge_settled_for(coro, 'ident', coro)
+    hooks.on_retry_for(coro, 'ident', 1, RuntimeError('test'), 0.1)
 
     coro.close()
 
@@ -110,3 +147,9 @@ def test_multiple_hooks(count):
         assert hook.calls_counter['on_reducing_for'] == 1
         assert hook.calls_counter['on_result_for'] == 1
         assert hook.calls_counter['on_exception_for'] == 1
+        assert hook.calls_counter['on_abandoned_for'] == 1
+        assert hook.calls_counter['on_throttled_for'] == 1
+        assert hook.calls_counter['on_rejected_for'] == 1
+        assert hook.calls_counter['on_hedged_for'] == 1
+        assert hook.calls_counter['on_hedge_settled_for'] == 1
+        assert hook.calls_counter['on_retry_for'] == 1
@@ -5,7 +5,7 @@ import re
 
 import pytest
 
-from async_reduce import AsyncReducer
+from async_reduce import AsyncReducer, Overloaded, RetryPolicy
 from async_reduce.hooks import DebugHooks
 
 pytestmark = pytest.mark.asyncio
@@ -183,3 +183,145 @@ async def test_debug_hooks_stream(stream):
     ]
 
     await asyncio.gather(*coros)
+
+
+async def test_debug_hooks_abandoned():
+    stream = StringIO()
+
+    async def foo():
+        await asyncio.sleep(1)
+
+    async_reduce = AsyncReducer(hooks=DebugHooks(stream), abandoned='cancel')
+
+    waiter = async_reduce.future(foo(), ident='foo')
+    await asyncio.sleep(0)
+    waiter.cancel()
+    await asyncio.sleep(0.01)
+
+    lines = stream.getvalue().splitlines()
+    assert (
+        re.fullmatch(
+            r'\[foo\] abandoned by <coroutine object {} at 0x\w+>'.format(
+                foo.__qualname__
+            ),
+            lines[2],
+        )
+        is not None
+    ), lines[2]
+
+
+async def test_debug_hooks_throttled():
+    stream = StringIO()
+
+    async def foo(arg):
+        return arg
+
+    async_reduce = AsyncReducer(hooks=DebugHooks(stream), rate_limit=100)
+
+    await asyncio.gather(async_reduce(foo(1)), async_reduce(foo(2)))
+
+    lines = stream.getvalue().splitlines()
+    assert any(
+        re.match(
+            r'\[.+\] throttled for 0\.0\d\ds <coroutine object {} at 0x\w+>'
+            ''.format(foo.__qualname__),
+            line,
+        )
+        for line in lines
+    ), lines
+
+
+async def test_debug_hooks_rejected():
+    stream = StringIO()
+
+    async def foo(arg):
+        return arg
+
+    async_reduce = AsyncReducer(hooks=DebugHooks(stream), max_in_flight=1)
+
+    waiter = async_reduce.future(foo(1), ident='foo')
+    with pytest.raises(Overloaded):
+        async_reduce(foo(2), ident='bar')
+    await waiter
+
+    lines = stream.getvalue().splitlines()
+    assert (
+        re.match(
+            r'\[bar\] rejected <coroutine object {} at 0x\w+>: Too many'
+            ''.format(foo.__qualname__),
+            lines[3],
+        )
+        is not None
+    ), lines
+
+
+async def test_debug_hooks_hedged():
+    stream = StringIO()
+
+    async def foo(delay):
+        await asyncio.sleep(delay)
+
+    async_reduce = AsyncReducer(hooks=DebugHooks(stream), hedge_delay=0.01)
+
+    delays = iter([1, 0])
+    await async_reduce.apply(lambda: foo(next(delays)), ident='foo')
+
+    lines = stream.getvalue().splitlines()
+    assert (
+        re.match(
+            r'\[foo\] hedged after 0\.010s by <coroutine object {} at 0x\w+>'
+            ''.format(foo.__qualname__),
+            lines[2],
+        )
+        is not None
+    ), lines
+
+
+async def test_debug_hooks_hedge_settled():
+    stream = StringIO()
+
+    async def foo(delay):
+        await asyncio.sleep(delay)
+
+    async_reduce = AsyncReducer(hooks=DebugHooks(stream), hedge_delay=0.01)
+
+    delays = iter([1, 0])
+    await async_reduce.apply(lambda: foo(next(delays)), ident='foo')
+
+    lines = stream.getvalue().splitlines()
+    assert (
+        re.match(
+            r'\[foo\] hedge won by <coroutine object {0} at 0x\w+>, '
+            r'lost by <coroutine object {0} at 0x\w+>'
+            ''.format(foo.__qualname__),
+            lines[3],
+        )
+        is not None
+    ), lines
+
+
+async def test_debug_hooks_retry():
+    stream = StringIO()
+    attempts = []
+
+    async def foo():
+        attempts.append(None)
+        if len(attempts) == 1:
+            raise ConnectionError('down')
+
+    async_reduce = AsyncReducer(
+        hooks=DebugHooks(stream),
+        retry=RetryPolicy(backoff=0.001, jitter=0),
+    )
+
+    await async_reduce.apply(foo, ident='foo')
+
+    lines = stream.getvalue().splitlines()
+    assert (
+        re.match(
+            r'\[foo\] retry after 0\.001s of attempt 1 for <coroutine object'
+            r' {} at 0x\w+>: down'.format(foo.__qualname__),
+            lines[2],
+        )
+        is not None
+    ), lines
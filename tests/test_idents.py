@@ -0,0 +1,148 @@
+import asyncio
+import gc
+import weakref
+from operator import attrgetter
+
+import pytest
+
+from async_reduce import AsyncReducer, async_reduceable
+from async_reduce.fingerprint import fingerprint
+from async_reduce.idents import _forget, by_identity, ignore_self
+
+pytestmark = pytest.mark.asyncio
+
+
+class Client:
+    """
+    Stateful and unhashable like ORM models.
+    """
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.calls = 0
+
+    def __eq__(self, other):
+        return self is other
+
+    __hash__ = None
+
+    async def fetch(self, path):
+        self.calls += 1
+        await asyncio.sleep(0)
+        return self.base_url + path
+
+
+class Slotted:
+    __slots__ = ()
+
+
+async def test_by_identity():
+    first, second = Client('a'), Client('a')
+
+    assert by_identity(first) == by_identity(first)
+    assert by_identity(first) != by_identity(second)
+
+    token = by_identity(first)
+    del first
+    gc.collect()
+
+    # token is not reused by new object even with the same id
+    assert all(by_identity(Client('a')) != token for _ in range(10))
+
+    with pytest.raises(TypeError):
+        by_identity(Slotted())
+
+    # entry of other object with reused id is kept
+    client = Client('a')
+    token = by_identity(client)
+    _forget(id(client), weakref.ref(Client('b')))
+    assert by_identity(client) == token
+
+
+@pytest.mark.parametrize(
+    'self_ident, calls',
+    [
+        (ignore_self, [0, 1]),
+        (by_identity, [1, 1]),
+        (attrgetter('base_url'), [0, 1]),
+    ],
+)
+async def test_reducer_self_ident(self_ident, calls):
+    reducer = AsyncReducer(self_ident=self_ident)
+    clients = [Client('http://a'), Client('http://a')]
+
+    results = await asyncio.gather(
+        *[reducer(client.fetch('/x')) for client in clients for _ in '12']
+    )
+
+    assert results == ['http://a/x'] * 4
+    assert sorted(client.calls for client in clients) == calls
+
+
+async def test_reducer_self_ident_fingerprint():
+    reducer = AsyncReducer(fingerprint=fingerprint, self_ident=ignore_self)
+    clients = [Client('http://a'), Client('http://b')]
+
+    results = await asyncio.gather(
+        *[reducer(client.fetch('/x')) for client in clients]
+    )
+
+    # all instances are reduced to the first one
+    assert results == ['http://a/x', 'http://a/x']
+
+    # without self policy instance is not supported by fingerprint
+    coro = clients[0].fetch('/x')
+    with pytest.raises(TypeError, match='Unable to auto calculate identity'):
+        AsyncReducer(fingerprint=fingerprint)(coro)
+    coro.close()
+
+
+@pytest.mark.parametrize(
+    'self_ident, calls',
+    [
+        (ignore_self, [0, 1]),
+        (by_identity, [1, 1]),
+        (attrgetter('base_url'), [0, 1]),
+    ],
+)
+async def test_decorator_self_ident(self_ident, calls):
+    class ReducedClient(Client):
+        @async_reduceable(self_ident=self_ident)
+        async def fetch(self, path):
+            return await super().fetch(path)
+
+    clients = [ReducedClient('http://a'), ReducedClient('http://a')]
+
+    results = await asyncio.gather(
+        *[client.fetch('/x') for client in clients for _ in '12']
+    )
+
+    assert results == ['http://a/x'] * 4
+    assert sorted(client.calls for client in clients) == calls
+
+
+async def test_decorator_reducer_self_ident():
+    reducer = AsyncReducer(self_ident=ignore_self)
+
+    class ReducedClient(Client):
+        @async_reduceable(reducer)
+        async def fetch(self, path):
+            return await super().fetch(path)
+
+    @async_reduceable(reducer)
+    async def fetch(client, path):
+        return await client.fetch(path)
+
+    clients = [ReducedClient('http://a'), ReducedClient('http://a')]
+
+    # policy of reducer is applied to methods
+    results = await asyncio.gather(
+        *[client.fetch('/x') for client in clients]
+    )
+
+    assert results == ['http://a/x'] * 2
+    assert sorted(client.calls for client in clients) == [0, 1]
+
+    # but not to the first argument of other functions
+    with pytest.raises(TypeError, match='unhashable'):
+        await fetch(Client('http://a'), '/x')
@@ -0,0 +1,26 @@
+from async_reduce.latency import LatencyWindow
+
+
+def test_percentile():
+    window = LatencyWindow(size=10, min_samples=5)
+
+    assert window.percentile('a', 0.5) is None
+
+    for duration in range(1, 5):
+        window.add('a', duration)
+    assert window.percentile('a', 0.5) is None
+
+    window.add('a', 5)
+    assert window.percentile('a', 0.5) == 3
+    assert window.percentile('a', 0.99) == 5
+    assert window.percentile('b', 0.5) is None
+
+
+def test_window():
+    window = LatencyWindow(size=10, min_samples=5)
+
+    for duration in range(100):
+        window.add('a', duration)
+
+    # only the latest durations are kept
+    assert window.percentile('a', 0) == 90
@@ -0,0 +1,310 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from async_reduce.limits import (
+    ConcurrencyLimiter,
+    RateLimiter,
+    _Bucket,
+    _Pending,
+    _set_granted,
+)
+
+pytestmark = pytest.mark.asyncio
+
+
+async def run(limiter, key, log, priority=0, delay=0.01):
+    await limiter.acquire(key, priority)
+    try:
+        log.append(key)
+        await asyncio.sleep(delay)
+    finally:
+        limiter.release(key)
+
+
+async def test_limit():
+    limiter = ConcurrencyLimiter(2)
+    log = []
+
+    tasks = [asyncio.create_task(run(limiter, i, log)) for i in range(5)]
+    await asyncio.sleep(0)
+
+    assert log == [0, 1]
+    assert limiter.active == 2
+
+    await asyncio.gather(*tasks)
+
+    assert log == [0, 1, 2, 3, 4]
+    assert limiter.active == 0
+
+
+async def test_priority():
+    limiter = ConcurrencyLimiter(1)
+    log = []
+
+    tasks = [
+        asyncio.create_task(run(limiter, key, log, priority))
+        for key, priority in [('a', 0), ('b', 5), ('c', 1), ('d', 1)]
+    ]
+    await asyncio.gather(*tasks)
+
+    assert log == ['a', 'c', 'd', 'b']
+
+
+async def test_per_key():
+    limiter = ConcurrencyLimiter(per_key=1)
+    log = []
+
+    tasks = [
+        asyncio.create_task(run(limiter, key, log)) for key in 'aab'
+    ]
+    await asyncio.sleep(0)
+
+    # pending execution of key does not block other keys
+    assert log == ['a', 'b']
+
+    await asyncio.gather(*tasks)
+
+    assert log == ['a', 'b', 'a']
+    assert limiter._active_per_key == {}
+
+
+async def test_per_key_many():
+    limiter = ConcurrencyLimiter(per_key=2)
+    log = []
+
+    await asyncio.gather(
+        *[run(limiter, 'a', log, delay=delay) for delay in (0, 0.01, 0)]
+    )
+
+    assert log == ['a', 'a', 'a']
+    assert limiter._active_per_key == {}
+
+
+async def test_per_key_queue():
+    limiter = ConcurrencyLimiter(per_key=10)
+    log = []
+
+    async def run_priority(priority):
+        await limiter.acquire('a', priority)
+        log.append(priority)
+        await asyncio.sleep(0)
+        limiter.release('a')
+
+    tasks = [
+        asyncio.create_task(run_priority(priority))
+        for priority in [2] * 1000 + [1, 0]
+    ]
+    await asyncio.sleep(0)
+
+    # pending executions of key without free place are not ready to start
+    assert len(log) == 10
+    assert len(limiter._queues['a']) == 992
+    assert limiter._ready == []
+
+    tasks[20].cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    # pending executions of key are started in order of priority
+    assert log[10:12] == [0, 1]
+    assert len(log) == 1001
+    assert limiter.active == 0
+    assert limiter._queues == {}
+    assert limiter._ready == []
+
+
+async def test_limit_and_per_key():
+    limiter = ConcurrencyLimiter(2, per_key=1)
+    log = []
+
+    tasks = [
+        asyncio.create_task(run(limiter, key, log, delay=delay))
+        for key, delay in [('a', 0.02), ('a', 0.01), ('b', 0.01), ('c', 0)]
+    ]
+    await asyncio.sleep(0)
+    assert log == ['a', 'b']
+
+    await asyncio.gather(*tasks)
+    assert log == ['a', 'b', 'c', 'a']
+
+
+async def test_cancel_pending():
+    limiter = ConcurrencyLimiter(1)
+    log = []
+
+    tasks = [asyncio.create_task(run(limiter, i, log)) for i in range(3)]
+    await asyncio.sleep(0)
+
+    tasks[1].cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert log == [0, 2]
+    assert limiter.active == 0
+
+
+async def test_cancel_granted():
+    limiter = ConcurrencyLimiter(1)
+    log = []
+
+    await limiter.acquire('a')
+    task = asyncio.create_task(run(limiter, 'b', log))
+    await asyncio.sleep(0)
+
+    # execution is allowed to cancelled task before it is woken up
+    limiter.release('a')
+    task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert log == []
+    assert limiter.active == 0
+
+
+async def test_other_loop():
+    limiter = ConcurrencyLimiter(1)
+    log = []
+    started = threading.Event()
+
+    async def run_in_thread():
+        started.set()
+        await run(limiter, 'thread', log)
+
+    await limiter.acquire('main')
+
+    with ThreadPoolExecutor(1) as executor:
+        future = executor.submit(asyncio.run, run_in_thread())
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, started.wait)
+        await asyncio.sleep(0.01)
+
+        assert log == []
+        limiter.release('main')
+
+    future.result()
+    assert log == ['thread']
+
+
+async def test_closed_loop():
+    limiter = ConcurrencyLimiter(1)
+    closed = asyncio.new_event_loop()
+    closed.close()
+
+    await limiter.acquire('a')
+    pending = _Pending(0, 0, 'b', closed.create_future())
+    limiter._queues['b'] = [pending]
+    limiter._ready.append(pending)
+    limiter.release('a')
+
+    assert limiter.active == 0
+    assert limiter._queues == {}
+    assert limiter._ready == []
+
+
+async def test_set_granted_done():
+    waiter = asyncio.get_running_loop().create_future()
+    waiter.cancel()
+
+    _set_granted(waiter)
+
+    assert waiter.cancelled()
+
+
+@pytest.mark.parametrize('kwargs', [{'limit': 0}, {'per_key': 0}])
+async def test_invalid(kwargs):
+    with pytest.raises(ValueError):
+        ConcurrencyLimiter(**kwargs)
+
+
+async def test_bucket():
+    bucket = _Bucket(rate=10, burst=2, now=0)
+
+    assert [bucket.take(0) for _ in range(4)] == [0, 0, 0.1, 0.2]
+
+    # reserved tokens are refilled first
+    assert bucket.take(0.25) == pytest.approx(0.05)
+
+    # idle time is not accumulated over burst
+    assert [bucket.take(10) for _ in range(3)] == [0, 0, 0.1]
+
+    bucket.refund()
+    assert bucket.take(10) == pytest.approx(0.1)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+async def test_rate():
+    clock = Clock()
+    limiter = RateLimiter(100, clock=clock)
+
+    assert [limiter.reserve(key) for key in 'abc'] == [0, 0.01, 0.02]
+
+    # reserved tokens are refilled first
+    clock.now = 0.025
+    assert limiter.reserve('d') == pytest.approx(0.005)
+
+    clock.now = 1
+    assert limiter.reserve('e') == 0
+
+
+async def test_rate_per_key():
+    limiter = RateLimiter(per_key=100, burst=2, clock=Clock())
+
+    # other key has own bucket
+    assert [limiter.reserve(key) for key in 'aaab'] == [0, 0, 0.01, 0]
+
+
+async def test_rate_and_per_key():
+    limiter = RateLimiter(1000, per_key=10, clock=Clock())
+
+    # the longest delay of buckets is used
+    assert [limiter.reserve(key) for key in 'aab'] == [0, 0.1, 0.002]
+
+
+async def test_rate_refund():
+    limiter = RateLimiter(10, per_key=10, clock=Clock())
+
+    limiter.reserve('a')
+    assert limiter.reserve('a') > 0
+
+    limiter.refund('a')
+    limiter.refund('a')
+    limiter.refund('b')
+
+    assert limiter.reserve('a') == 0
+
+    limiter = RateLimiter(per_key=10, clock=Clock())
+    limiter.reserve('a')
+    limiter.refund('a')
+
+    assert limiter.reserve('a') == 0
+
+
+@pytest.mark.parametrize(
+    'kwargs', [{'rate': 0}, {'per_key': -1}, {'rate': 1, 'burst': 0}]
+)
+async def test_rate_invalid(kwargs):
+    with pytest.raises(ValueError):
+        RateLimiter(**kwargs)
+
+
+async def test_acquire_timeout():
+    limiter = ConcurrencyLimiter(1)
+
+    await limiter.acquire('a')
+    with pytest.raises(asyncio.TimeoutError):
+        await limiter.acquire('b', timeout=0.001)
+
+    limiter.release('a')
+
+    assert limiter.active == 0
+    assert limiter._queues == {}
+    assert limiter._ready == []
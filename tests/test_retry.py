@@ -0,0 +1,40 @@
+from unittest.mock import patch
+
+import pytest
+
+from async_reduce import RetryPolicy
+
+
+def test_retries():
+    policy = RetryPolicy((ConnectionError,), max_attempts=3)
+
+    assert policy.retries(ConnectionError(), 1)
+    assert policy.retries(ConnectionResetError(), 2)
+    assert not policy.retries(ConnectionError(), 3)
+    assert not policy.retries(ValueError(), 1)
+
+
+def test_delay():
+    policy = RetryPolicy(backoff=0.1, max_backoff=0.5, jitter=0)
+
+    assert [policy.delay(attempt) for attempt in range(1, 6)] == [
+        pytest.approx(delay) for delay in (0.1, 0.2, 0.4, 0.5, 0.5)
+    ]
+
+
+def test_delay_jitter():
+    policy = RetryPolicy(backoff=1, jitter=0.5)
+
+    with patch('random.random', return_value=1):
+        assert policy.delay(1) == 0.5
+
+    with patch('random.random', return_value=0):
+        assert policy.delay(1) == 1
+
+
+@pytest.mark.parametrize(
+    'kwargs', [{'max_attempts': 0}, {'jitter': -0.1}, {'jitter': 1.5}]
+)
+def test_invalid(kwargs):
+    with pytest.raises(ValueError):
+        RetryPolicy(**kwargs)
@@ -0,0 +1,154 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from unittest.mock import Mock
+
+import pytest
+
+from async_reduce import ThreadReducer, reduceable
+from async_reduce.fingerprint import fingerprint
+from async_reduce.hooks import StatisticsDetailHooks
+from async_reduce.hooks.base import BaseHooks
+from async_reduce.idents import ignore_self
+
+THREADS = 4
+
+
+def run_in_threads(func, count=THREADS):
+    barrier = threading.Barrier(count)
+
+    def worker():
+        barrier.wait()
+        return func()
+
+    with ThreadPoolExecutor(count) as executor:
+        futures = [executor.submit(worker) for _ in range(count)]
+
+    return [future.exception() or future.result() for future in futures]
+
+
+def test_reduce(backend):
+    reducer = ThreadReducer()
+
+    results = run_in_threads(lambda: reducer(backend.blocking, 'a'))
+
+    assert results == ['a'] * THREADS
+    assert backend.calls == ['a']
+    assert reducer._running == {}
+
+    # settled calls are not kept
+    assert reducer(backend.blocking, 'a') == 'a'
+    assert backend.calls == ['a', 'a']
+
+
+def test_reduce_different_idents(backend):
+    reducer = ThreadReducer()
+    args = iter(['a', 'b', 'a', 'b'])
+
+    def call():
+        arg = next(args)
+        return reducer(partial(backend.blocking, arg), ident='blocking:' + arg)
+
+    assert sorted(run_in_threads(call)) == ['a', 'a', 'b', 'b']
+    assert sorted(backend.calls) == ['a', 'b']
+
+
+@pytest.mark.parametrize('error', [RuntimeError('test'), SystemExit(1)])
+def test_reduce_exception(backend, error):
+    hooks = Mock(BaseHooks)
+    reducer = ThreadReducer(hooks)
+
+    results = run_in_threads(
+        lambda: reducer(
+            partial(backend.blocking, 'a', error=error), ident='blocking'
+        )
+    )
+
+    assert all(result is error for result in results)
+    assert backend.calls == ['a']
+    assert reducer._running == {}
+    assert hooks.on_exception_for.call_count == int(
+        isinstance(error, Exception)
+    )
+    assert hooks.on_result_for.call_count == 0
+
+
+def test_hooks(backend):
+    hooks = Mock(BaseHooks)
+    statistics = StatisticsDetailHooks()
+    reducer = ThreadReducer(statistics & hooks)
+
+    run_in_threads(lambda: reducer(backend.blocking, 'a'))
+
+    assert hooks.on_apply_for.call_count == THREADS
+    assert hooks.on_executing_for.call_count == 1
+    assert hooks.on_reducing_for.call_count == THREADS - 1
+    assert hooks.on_result_for.call_count == 1
+
+    call, ident = hooks.on_executing_for.call_args[0]
+    assert call() == 'a'
+    assert ident.startswith('tests.conftest:Backend.blocking(<args_hash:')
+
+    location = 'tests.conftest:Backend.blocking'
+    assert statistics.total[location] == THREADS
+    assert statistics.executed[location] == 1
+
+
+def test_fingerprint(backend):
+    reducer = ThreadReducer(fingerprint=fingerprint)
+
+    results = run_in_threads(lambda: reducer(backend.blocking, ['a']))
+
+    assert results == [['a']] * THREADS
+    assert backend.calls == [['a']]
+
+    with pytest.raises(TypeError, match='Unable to auto calculate identity'):
+        ThreadReducer()(backend.blocking, ['a'])
+
+
+def test_decorator(backend):
+    reducer = ThreadReducer()
+
+    @reduceable(reducer)
+    def foo(arg, *, kwarg=None):
+        return backend.blocking((arg, kwarg))
+
+    @reduceable(reducer, key=lambda request, arg: arg)
+    def bar(request, arg):
+        return backend.blocking(arg)
+
+    assert run_in_threads(lambda: foo(1, kwarg=2)) == [(1, 2)] * THREADS
+    assert run_in_threads(lambda: bar([], 3)) == [3] * THREADS
+    assert backend.calls == [(1, 2), 3]
+
+
+def test_decorator_bound_arguments(backend):
+    reducer = ThreadReducer()
+
+    @reduceable(reducer)
+    def foo(arg, kwarg=None):
+        return backend.blocking((arg, kwarg))
+
+    calls = iter(
+        [
+            lambda: foo(1),
+            lambda: foo(arg=1),
+            lambda: foo(1, None),
+            lambda: foo(1, kwarg=None),
+        ]
+    )
+
+    assert run_in_threads(lambda: next(calls)()) == [(1, None)] * THREADS
+    assert backend.calls == [(1, None)]
+
+
+def test_decorator_self_ident(backend):
+    class Client:
+        __hash__ = None
+
+        @reduceable(self_ident=ignore_self)
+        def fetch(self, path):
+            return backend.blocking(path)
+
+    assert run_in_threads(lambda: Client().fetch('/x')) == ['/x'] * THREADS
+    assert backend.calls == ['/x']